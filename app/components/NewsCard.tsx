@@ -5,6 +5,7 @@ import Image from 'next/image'
 
 interface NewsCardProps {
   article: {
+    id?: string
     title: string
     description: string
     link: string
@@ -68,7 +69,7 @@ export default function NewsCard({ article, variant = 'default' }: NewsCardProps
 
   return (
     <Link 
-      href={`/news/${encodeURIComponent(article.link)}`}
+      href={`/news/${article.id || encodeURIComponent(article.link)}`}
       className={`block bg-white rounded-2xl shadow-soft hover:shadow-professional transition-all duration-500 overflow-hidden group max-w-sm mx-auto transform hover:-translate-y-2 ${
         isLarge ? 'h-full' : ''
       }`}
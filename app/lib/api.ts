@@ -1,6 +1,7 @@
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
 
 export interface Article {
+  id?: string
   title: string
   description: string
   link: string
@@ -20,10 +21,45 @@ export interface Video {
   published_at: string
 }
 
+export interface ArticleChanges {
+  version: number
+  upserts: Article[]
+  removed: string[]
+}
+
+/** Apply added, updated and removed articles from /news/stream or /news/changes to a list. */
+export function applyChanges(articles: Article[], changes: ArticleChanges): Article[] {
+  const key = (article: Article) => article.id || article.link
+  const removed = new Set(changes.removed)
+  const upserts = new Map(changes.upserts.map(article => [key(article), article]))
+  const merged = articles
+    .filter(article => !removed.has(key(article)))
+    .map(article => {
+      const updated = upserts.get(key(article))
+      upserts.delete(key(article))
+      return updated || article
+    })
+  return [...upserts.values(), ...merged]
+}
+
+// Server-side copy of /news/all, patched with /news/changes on each render
+let newsCopy: { version: number, articles: Article[] } | null = null
+
 export async function fetchAllNews(): Promise<Article[]> {
-  const response = await fetch(`${API_URL}/news/all`, { next: { revalidate: 300 } })
+  const since = newsCopy ? `?since=${newsCopy.version}` : ''
+  const response = await fetch(`${API_URL}/news/changes${since}`, { cache: 'no-store' })
+  if (!response.ok) {
+    throw new Error(`Failed to fetch news changes: ${response.status}`)
+  }
   const data = await response.json()
-  return data.articles || []
+  if (data.full) {
+    newsCopy = { version: data.version, articles: data.articles || [] }
+  } else if (newsCopy && data.version !== newsCopy.version) {
+    const articles = applyChanges(newsCopy.articles, data)
+    articles.sort((a, b) => new Date(b.published_at || 0).getTime() - new Date(a.published_at || 0).getTime())
+    newsCopy = { version: data.version, articles }
+  }
+  return newsCopy ? newsCopy.articles : []
 }
 
 export async function fetchTrendingNews(): Promise<Article[]> {
@@ -4,12 +4,12 @@ import Image from 'next/image'
 
 const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
 
-async function getArticle(url: string) {
+async function getArticle(slug: string) {
   try {
-    const allRes = await fetch(`${apiUrl}/news/all`, { next: { revalidate: 300 } })
-    const data = await allRes.json()
-    const articles = data.articles || []
-    return articles.find((a: any) => a.link === decodeURIComponent(url))
+    // The slug is the article ID; older links use the encoded article URL, which the API also accepts
+    const res = await fetch(`${apiUrl}/news/${slug}`, { next: { revalidate: 300 } })
+    if (!res.ok) return null
+    return await res.json()
   } catch {
     return null
   }
@@ -27,34 +27,15 @@ async function getArticleContent(articleUrl: string) {
   }
 }
 
-async function getRelatedArticles(currentUrl: string) {
-  try {
-    const allRes = await fetch(`${apiUrl}/news/all`, { next: { revalidate: 300 } })
-    const data = await allRes.json()
-    const articles = data.articles || []
-    // Get articles from same source or similar topics
-    const current = articles.find((a: any) => a.link === decodeURIComponent(currentUrl))
-    if (!current) return []
-    
-    return articles
-      .filter((a: any) => a.link !== currentUrl && (a.source === current.source || 
-        a.title.toLowerCase().split(' ').some((word: string) => 
-          current.title.toLowerCase().includes(word) && word.length > 4
-        )))
-      .slice(0, 3)
-  } catch {
-    return []
-  }
-}
-
 export default async function NewsDetailPage({ params }: { params: { slug: string } }) {
-  const article = await getArticle(params.slug)
+  const data = await getArticle(params.slug)
   
-  if (!article) {
+  if (!data?.article) {
     notFound()
   }
 
-  const relatedArticles = await getRelatedArticles(params.slug)
+  const article = data.article
+  const relatedArticles = data.related || []
   const fullContent = await getArticleContent(article.link)
 
   const formatDate = (dateStr: string) => {
@@ -211,8 +192,8 @@ export default async function NewsDetailPage({ params }: { params: { slug: strin
             <div className="grid grid-cols-1 md:grid-cols-3 gap-6">
               {relatedArticles.map((related: any, index: number) => (
                 <Link
-                  key={index}
-                  href={`/news/${encodeURIComponent(related.link)}`}
+                  key={related.id || index}
+                  href={`/news/${related.id || encodeURIComponent(related.link)}`}
                   className="bg-white rounded-xl shadow-md hover:shadow-xl transition p-6"
                 >
                   <h3 className="font-bold text-[#0A1A3A] mb-2 hover:text-[#4A6FF3] transition line-clamp-2">
@@ -3,6 +3,7 @@
 import { useState, useEffect } from 'react'
 import NewsCard from '../components/NewsCard'
 import LoadingSpinner from '../components/LoadingSpinner'
+import { applyChanges } from '../lib/api'
 
 const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
 
@@ -17,7 +18,16 @@ export default function AllNewsPage() {
   const [displayCount, setDisplayCount] = useState(20)
 
   useEffect(() => {
+    // Subscribe before loading the list so no change in between is missed; re-applying one is harmless
+    const stream = new EventSource(`${apiUrl}/news/stream`)
+    stream.addEventListener('changes', (event) => {
+      const changes = JSON.parse((event as MessageEvent).data)
+      setArticles(current => applyChanges(current, changes))
+    })
+    // The server no longer has the changes we missed; start over from the full list
+    stream.addEventListener('reset', () => fetchAllNews())
     fetchAllNews()
+    return () => stream.close()
   }, [])
 
   useEffect(() => {
@@ -2,6 +2,7 @@ import TrendingSlider from './components/TrendingSlider'
 import NewsGrid from './components/NewsGrid'
 import NewsList from './components/NewsList'
 import BackendStatus from './components/BackendStatus'
+import { fetchAllNews } from './lib/api'
 
 export default async function Home() {
   const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
@@ -38,9 +39,10 @@ export default async function Home() {
       }
 
       const [trendingRes, importantRes, allRes] = await Promise.allSettled([
-        createFetchWithTimeout(`${apiUrl}/news/trending`),
-        createFetchWithTimeout(`${apiUrl}/news/important`),
-        createFetchWithTimeout(`${apiUrl}/news/all`),
+        createFetchWithTimeout(`${apiUrl}/news/trending?limit=15`),
+        createFetchWithTimeout(`${apiUrl}/news/important?limit=6`),
+        // Kept up to date with small patches from /news/changes instead of re-downloading the list
+        fetchAllNews(),
       ])
 
       if (trendingRes.status === 'fulfilled' && trendingRes.value.ok) {
@@ -55,8 +57,8 @@ export default async function Home() {
         important.error = importantRes.reason?.message || 'Failed to fetch important news'
       }
       
-      if (allRes.status === 'fulfilled' && allRes.value.ok) {
-        all = await allRes.value.json().catch(() => ({ articles: [], error: 'Failed to parse all news' }))
+      if (allRes.status === 'fulfilled') {
+        all = { articles: allRes.value as any, error: '' }
       } else if (allRes.status === 'rejected') {
         all.error = allRes.reason?.message || 'Failed to fetch all news'
       }
@@ -0,0 +1,109 @@
+"""Benchmark categorize_articles() against the per-article categorize_article() it replaced.
+
+Run from the backend directory:
+    python -m benchmarks.bench_categorize
+"""
+import random
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+from utils.clean_data import categorize_articles, parse_date
+
+SIZES = [100, 500, 1_000, 2_000]
+
+SOURCES = ["Google News AI", "TechCrunch AI", "OpenAI Blog", "DeepMind Blog", "Anthropic Blog", "Reuters", "Wired"]
+WORDS = ["model", "release", "agents", "gpu", "safety", "chips", "startup", "funding", "policy", "claude",
+         "gemini", "benchmark", "robotics", "open", "weights", "research", "breakthrough", "new", "update",
+         "inference", "training", "data", "cloud", "latest", "reasoning", "vision", "speech", "lab"]
+
+def legacy_categorize_article(article: Dict[str, Any], all_articles: List[Dict[str, Any]]) -> Dict[str, bool]:
+    """The original categorize_article: regex over every title and per-keyword scans for each article."""
+    try:
+        title = str(article.get("title", "")).lower()
+        description = str(article.get("description", "")).lower()
+        content = f"{title} {description}"
+
+        publish_date = article.get("published_at")
+        if isinstance(publish_date, str):
+            try:
+                publish_date = parse_date(publish_date)
+            except:
+                publish_date = datetime.now()
+        elif not isinstance(publish_date, datetime):
+            publish_date = datetime.now()
+
+        is_trending = False
+        if publish_date:
+            try:
+                if publish_date.tzinfo is not None:
+                    now = datetime.now(timezone.utc)
+                    hours_ago = (now - publish_date).total_seconds() / 3600
+                else:
+                    hours_ago = (datetime.now() - publish_date).total_seconds() / 3600
+                if hours_ago <= 24:
+                    is_trending = True
+            except Exception:
+                pass
+
+        title_normalized = re.sub(r'[^\w\s]', '', title)
+        source_count = sum(1 for a in all_articles
+                          if re.sub(r'[^\w\s]', '', str(a.get("title", "")).lower()) == title_normalized)
+        if source_count > 1:
+            is_trending = True
+
+        viral_keywords = ["breaking", "exclusive", "major", "huge", "revolutionary", "new", "latest", "update", "announcement"]
+        if any(kw in content for kw in viral_keywords):
+            is_trending = True
+
+        is_important = False
+        important_keywords = [
+            "model release", "agi", "breakthrough", "announcement",
+            "research", "ai bill", "safety", "gpt-", "claude", "gemini"
+        ]
+        if any(kw in content for kw in important_keywords):
+            is_important = True
+
+        source = str(article.get("source", "")).lower()
+        major_labs = ["openai", "deepmind", "anthropic", "google research"]
+        if any(lab in source for lab in major_labs):
+            is_important = True
+
+        return {"trending": is_trending, "important": is_important}
+    except Exception:
+        return {"trending": False, "important": False}
+
+def make_articles(n: int, seed: int = 11) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    articles = []
+    for i in range(n):
+        if articles and rng.random() < 0.05:
+            title = articles[rng.randrange(len(articles))]["title"] + "!"
+        else:
+            title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 9))).capitalize()
+        articles.append({
+            "title": title,
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 30))),
+            "source": rng.choice(SOURCES),
+            "published_at": (now - timedelta(hours=rng.uniform(0, 96))).isoformat(),
+        })
+    return articles
+
+def main() -> None:
+    print(f"{'articles':>8} {'legacy ms':>10} {'batch ms':>9} {'speedup':>8} {'same flags':>11}")
+    for n in SIZES:
+        articles = make_articles(n)
+
+        started = time.perf_counter()
+        legacy = [legacy_categorize_article(a, articles) for a in articles]
+        legacy_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        batch = categorize_articles(articles)
+        batch_ms = (time.perf_counter() - started) * 1000
+
+        print(f"{n:>8} {legacy_ms:>10.1f} {batch_ms:>9.1f} {legacy_ms / batch_ms:>7.1f}x {str(legacy == batch):>11}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Scaling benchmark for title deduplication.
+
+Run from the backend directory:
+    python -m benchmarks.bench_dedup
+"""
+import random
+import re
+import time
+from typing import List, Tuple
+from utils.dedup import cluster_titles
+
+SIZES = [100, 1_000, 10_000, 100_000]
+# The quadratic reference gets too slow to be worth waiting for past this size
+LEGACY_MAX = 10_000
+
+PUBLISHERS = ["The Verge", "TechCrunch", "Reuters", "Wired", "VentureBeat", "Ars Technica"]
+
+def legacy_deduplicate(titles: List[str]) -> int:
+    """The substring-scan deduplication this engine replaced. Returns the unique count."""
+    seen_titles = set()
+    for title in titles:
+        title_normalized = re.sub(r'[^\w\s]', '', title.lower().strip())
+        is_duplicate = False
+        for seen_title in seen_titles:
+            if title_normalized in seen_title or seen_title in title_normalized:
+                if len(title_normalized) > 20 and len(seen_title) > 20:
+                    is_duplicate = True
+                    break
+        if not is_duplicate:
+            seen_titles.add(title_normalized)
+    return len(seen_titles)
+
+def make_corpus(n: int, seed: int = 7) -> Tuple[List[str], List[int]]:
+    """Synthetic headlines where ~20% derive from an earlier one.
+
+    Copies with a publisher suffix or changed case/punctuation are the same story; a copy
+    with one word swapped ("rise" for "fall") is planted as a different story.
+    """
+    rng = random.Random(seed)
+    vocab = [f"{rng.choice('bcdfghklmnprstvz')}{rng.choice('aeiou')}{rng.choice('bcdfghklmnprstvz')}"
+             f"{rng.choice('aeiou')}{rng.choice('nrstl')}" for _ in range(5000)]
+    titles, origins = [], []
+    for i in range(n):
+        if titles and rng.random() < 0.2:
+            j = rng.randrange(len(titles))
+            words = titles[j].split(" - ")[0].split()
+            variant = rng.random()
+            if variant < 0.4:
+                words = words + ["-", rng.choice(PUBLISHERS)]
+            elif variant < 0.7:
+                k = rng.randrange(len(words))
+                words = words[:k] + [rng.choice(vocab)] + words[k + 1:]
+            else:
+                words = [w.capitalize() if rng.random() < 0.5 else w for w in words] + ["!"]
+            titles.append(" ".join(words))
+            origins.append(origins[j] if variant < 0.4 or variant >= 0.7 else i)
+        else:
+            titles.append(" ".join(rng.choice(vocab) for _ in range(rng.randint(6, 12))))
+            origins.append(i)
+    return titles, origins
+
+def main() -> None:
+    print(f"{'titles':>8} {'minhash ms':>11} {'us/title':>9} {'clusters':>9} {'recall':>7} {'merged':>7} {'legacy ms':>10} {'legacy unique':>14}")
+    for n in SIZES:
+        titles, origins = make_corpus(n)
+
+        started = time.perf_counter()
+        clusters = cluster_titles(titles)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        # Share of planted copies that landed in the same cluster as their original
+        planted = [(i, o) for i, o in enumerate(origins) if i != o]
+        found = sum(1 for i, o in planted if clusters[i] == clusters[o])
+        recall = found / len(planted) if planted else 1.0
+        # Share of distinct stories that were merged into another one
+        merged = sum(1 for i, o in enumerate(origins) if i == o and clusters[i] != i) / len(set(origins))
+
+        legacy = "-"
+        legacy_unique = "-"
+        if n <= LEGACY_MAX:
+            started = time.perf_counter()
+            legacy_unique = legacy_deduplicate(titles)
+            legacy = f"{(time.perf_counter() - started) * 1000:.1f}"
+
+        print(f"{n:>8} {elapsed:>11.1f} {elapsed * 1000 / n:>9.1f} {len(set(clusters)):>9} "
+              f"{recall:>7.1%} {merged:>7.1%} {legacy:>10} {legacy_unique:>14}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Benchmark for article text extraction: lxml scoring engine against the BeautifulSoup one.
+
+Run from the backend directory:
+    python -m benchmarks.bench_extract [directory of saved .html pages]
+
+Two corpora are timed separately: a synthetic one generated in several common layouts, with
+the article text known so precision and recall can be reported, and the saved real pages in
+benchmarks/pages (or the given directory). Saved pages have no ground truth; for those the
+engines' agreement with each other is reported per page instead.
+"""
+import random
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from utils.extract import extract_article
+from utils.fetch_article_content import extract_content
+
+PAGES_PER_LAYOUT = 40
+ROUNDS = 3
+PAGES_DIR = Path(__file__).resolve().parent / "pages"
+WORD = re.compile(r"\w+")
+
+def _words(rng: random.Random, vocab: List[str], n: int) -> str:
+    return " ".join(rng.choice(vocab) for _ in range(n))
+
+def _paragraphs(rng: random.Random, vocab: List[str], count: int) -> List[str]:
+    return [", ".join(_words(rng, vocab, rng.randint(8, 16)) for _ in range(rng.randint(2, 5))) + "."
+            for _ in range(count)]
+
+def _chrome(rng: random.Random, vocab: List[str]) -> Dict[str, str]:
+    """Navigation, sidebars, comments, scripts and footers that surround the article."""
+    links = "".join(f'<li><a href="/s/{i}">{_words(rng, vocab, 3)}</a></li>' for i in range(30))
+    comments = "".join(f'<div class="comment"><p>{_words(rng, vocab, 30)}</p></div>' for _ in range(6))
+    related = "".join(f'<li><a href="/r/{i}">{_words(rng, vocab, 9)}</a></li>' for i in range(8))
+    blob = "{" + ",".join(f'"k{i}":"{_words(rng, vocab, 12)}"' for i in range(600)) + "}"
+    return {
+        "head": f"<head><meta charset='utf-8'><title>{_words(rng, vocab, 6)} | Site</title>"
+                f"<style>body{{margin:0}}</style><script>window.__DATA__={blob}</script></head>",
+        "nav": f"<header><nav><ul>{links}</ul></nav></header>",
+        "sidebar": f'<aside class="sidebar"><ul>{related}</ul></aside>',
+        "related": f'<div class="related-posts"><ul>{related}</ul></div>',
+        "comments": f'<section class="comments">{comments}</section>',
+        "footer": f"<footer><p>{_words(rng, vocab, 20)}</p><ul>{links}</ul></footer>",
+    }
+
+def _layout_article(title: str, body: str, c: Dict[str, str]) -> str:
+    return (f"<html>{c['head']}<body>{c['nav']}<main><article><h1>{title}</h1>{body}</article>"
+            f"{c['related']}{c['comments']}</main>{c['sidebar']}{c['footer']}</body></html>")
+
+def _layout_wordpress(title: str, body: str, c: Dict[str, str]) -> str:
+    return (f"<html>{c['head']}<body>{c['nav']}<div id='page'><div class='post'><h1 class='entry-title'>"
+            f"{title}</h1><div class='entry-content'>{body}</div></div>{c['sidebar']}</div>"
+            f"{c['comments']}{c['footer']}</body></html>")
+
+def _layout_content_wrapper(title: str, body: str, c: Dict[str, str]) -> str:
+    # Everything inside one generic .content wrapper, as many CMS themes do
+    return (f"<html>{c['head']}<body><div class='content'>{c['nav']}<h1>{title}</h1>"
+            f"<div class='story'>{body}</div>{c['related']}{c['comments']}</div>{c['footer']}</body></html>")
+
+def _layout_divs(title: str, body: str, c: Dict[str, str]) -> str:
+    # No semantic markup or helpful class names at all
+    body = body.replace("<p>", "<div class='x1'><p>").replace("</p>", "</p></div>")
+    return (f"<html>{c['head']}<body><div id='a'>{c['nav']}</div><div id='b'><div id='c'><h1>{title}</h1>"
+            f"<div id='d'>{body}</div></div><div id='e'>{c['comments']}</div></div>{c['footer']}</body></html>")
+
+def _layout_table(title: str, body: str, c: Dict[str, str]) -> str:
+    return (f"<html>{c['head']}<body><table><tr><td>{c['nav']}</td></tr><tr><td><h1>{title}</h1>{body}</td>"
+            f"<td>{c['sidebar']}</td></tr><tr><td>{c['footer']}</td></tr></table></body></html>")
+
+LAYOUTS = {
+    "article": _layout_article,
+    "wordpress": _layout_wordpress,
+    "content_wrapper": _layout_content_wrapper,
+    "plain_divs": _layout_divs,
+    "table": _layout_table,
+}
+
+def make_corpus(seed: int = 5) -> List[Tuple[str, bytes, Optional[str]]]:
+    """(layout, page bytes, article text) for every synthetic page."""
+    rng = random.Random(seed)
+    vocab = ["".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(2, 4)))
+             for _ in range(3000)]
+    corpus = []
+    for name, layout in LAYOUTS.items():
+        for _ in range(PAGES_PER_LAYOUT):
+            title = _words(rng, vocab, 8)
+            paragraphs = _paragraphs(rng, vocab, rng.randint(5, 25))
+            body = "".join(f"<p>{p}</p>" for p in paragraphs)
+            page = layout(title, body, _chrome(rng, vocab))
+            corpus.append((name, page.encode("utf-8"), " ".join(paragraphs)))
+    return corpus
+
+def load_corpus(directory: str) -> List[Tuple[str, bytes, Optional[str]]]:
+    """(file name, page bytes, None) for every saved page in a directory."""
+    return [(path.name, path.read_bytes(), None) for path in sorted(Path(directory).glob("*.htm*"))]
+
+def _overlap(found: str, wanted: str) -> Tuple[float, float]:
+    """Word-level (precision, recall) of found against wanted."""
+    found_words, wanted_words = Counter(WORD.findall(found.lower())), Counter(WORD.findall(wanted.lower()))
+    common = sum((found_words & wanted_words).values())
+    precision = common / sum(found_words.values()) if found_words else 0.0
+    recall = common / sum(wanted_words.values()) if wanted_words else 0.0
+    return precision, recall
+
+def _run_lxml(page: bytes) -> str:
+    return extract_article(page, "https://example.com/")[0]["content"] or ""
+
+def _run_bs4(page: bytes) -> str:
+    return extract_content(page.decode("utf-8", errors="replace"), "https://example.com/")["content"] or ""
+
+ENGINES: Dict[str, Callable[[bytes], str]] = {"bs4": _run_bs4, "lxml": _run_lxml}
+
+def _time_engines(label: str, corpus: List[Tuple[str, bytes, Optional[str]]]) -> Dict[str, List[str]]:
+    """Print each engine's best-of-ROUNDS throughput on a corpus and return its outputs."""
+    total_mb = sum(len(page) for _, page, _ in corpus) / 1e6
+    print(f"{label}: {len(corpus)} pages, {total_mb:.1f} MB")
+    outputs: Dict[str, List[str]] = {}
+    print(f"{'engine':>6} {'pages/s':>8} {'MB/s':>6} {'ms/page':>8}")
+    for name, engine in ENGINES.items():
+        best = float("inf")
+        for _ in range(ROUNDS):
+            started = time.perf_counter()
+            outputs[name] = [engine(page) for _, page, _ in corpus]
+            best = min(best, time.perf_counter() - started)
+        print(f"{name:>6} {len(corpus) / best:>8.1f} {total_mb / best:>6.1f} {best * 1000 / len(corpus):>8.2f}")
+
+    stages: Counter = Counter()
+    for _, page, _ in corpus:
+        stages.update(extract_article(page, "https://example.com/")[1])
+    print("lxml stages (ms/page): " + ", ".join(f"{s} {ms / len(corpus):.2f}" for s, ms in stages.items()) + "\n")
+    return outputs
+
+def _report_quality(corpus: List[Tuple[str, bytes, Optional[str]]], outputs: Dict[str, List[str]]) -> None:
+    """Precision and recall against the known text per layout."""
+    print(f"{'layout':>16} {'engine':>6} {'precision':>9} {'recall':>7}")
+    for layout in sorted({layout for layout, _, _ in corpus}):
+        indexes = [i for i, (name, _, _) in enumerate(corpus) if name == layout]
+        for name in ENGINES:
+            pairs = [_overlap(outputs[name][i], corpus[i][2]) for i in indexes]
+            precision = sum(p for p, _ in pairs) / len(pairs)
+            recall = sum(r for _, r in pairs) / len(pairs)
+            print(f"{layout:>16} {name:>6} {precision:>9.1%} {recall:>7.1%}")
+    print()
+
+def _report_agreement(corpus: List[Tuple[str, bytes, Optional[str]]], outputs: Dict[str, List[str]]) -> None:
+    """Per saved page: words each engine extracted, and how much of bs4's text lxml kept and vice versa."""
+    print(f"{'page':>28} {'bs4 words':>9} {'lxml words':>10} {'lxml in bs4':>11} {'bs4 in lxml':>11}")
+    for i, (name, _, _) in enumerate(corpus):
+        bs4_text, lxml_text = outputs["bs4"][i], outputs["lxml"][i]
+        # Precision of lxml against bs4 is the share of lxml's words bs4 also found, recall the reverse
+        in_bs4, in_lxml = _overlap(lxml_text, bs4_text)
+        print(f"{name:>28} {len(WORD.findall(bs4_text)):>9} {len(WORD.findall(lxml_text)):>10} "
+              f"{in_bs4:>11.1%} {in_lxml:>11.1%}")
+
+def main() -> None:
+    synthetic = make_corpus()
+    _report_quality(synthetic, _time_engines("synthetic", synthetic))
+
+    saved = load_corpus(sys.argv[1] if len(sys.argv) > 1 else str(PAGES_DIR))
+    if not saved:
+        print("No saved pages found")
+        return
+    _report_agreement(saved, _time_engines("saved", saved))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Memory used by the in-memory article corpus: plain dicts vs slotted Article models, and the whole ArticleStore.
+
+Each mode runs in its own process so resident memory isn't shared between them:
+    python -m benchmarks.bench_memory
+"""
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+from utils.article_store import ArticleStore, short_hash
+from utils.clean_data import PLACEHOLDER_IMAGES
+from utils.models import Article
+
+ARTICLES = 10_000
+SOURCES = [f"Source {i}" for i in range(40)]
+AUTHORS = [f"Author {i}" for i in range(300)] + [""] * 100
+
+def make_feed(n: int, seed: int = 5) -> List[bytes]:
+    """Articles as the fetchers produce them, one JSON document each so no string is shared up front."""
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(3000)]
+    now = datetime.now(timezone.utc)
+    feed = []
+    for i in range(n):
+        feed.append(json.dumps({
+            "title": " ".join(rng.choices(words, k=9)).capitalize(),
+            "description": " ".join(rng.choices(words, k=45)),
+            "link": f"https://site{i % 200}.example.com/2026/article-{i}",
+            "published_at": (now - timedelta(seconds=rng.uniform(0, 6 * 86400))).isoformat(),
+            "source": rng.choice(SOURCES),
+            "author": rng.choice(AUTHORS),
+            "image": rng.choice(PLACEHOLDER_IMAGES) if rng.random() < 0.6 else f"https://cdn.example.com/img/{i}.jpg",
+        }).encode())
+    return feed
+
+def build_dicts(feed: List[bytes]) -> Any:
+    """The previous representation: one dict per article with an ISO date string, plus the views."""
+    articles = []
+    for line in feed:
+        raw = json.loads(line)
+        article_id = short_hash(raw["link"])
+        articles.append({**raw, "id": article_id, "is_trending": len(articles) % 3 == 0,
+                         "is_important": len(articles) % 2 == 0, "cluster_id": article_id, "cluster_size": 1})
+    return (tuple(articles), tuple(a for a in articles if a["is_trending"]),
+            tuple(a for a in articles if a["is_important"]))
+
+def build_models(feed: List[bytes]) -> Any:
+    articles = []
+    for line in feed:
+        raw = json.loads(line)
+        articles.append(Article(
+            id=short_hash(raw["link"]), title=raw["title"], description=raw["description"], link=raw["link"],
+            published=int(datetime.fromisoformat(raw["published_at"]).timestamp()), source=raw["source"],
+            author=raw["author"], image=raw["image"], is_trending=len(articles) % 3 == 0,
+            is_important=len(articles) % 2 == 0,
+        ))
+    return (tuple(articles), tuple(a for a in articles if a.is_trending),
+            tuple(a for a in articles if a.is_important))
+
+def build_store(feed: List[bytes]) -> Any:
+    """The full ArticleStore (models, sort orders, dedup index) as ingestion builds it."""
+    store = ArticleStore(max_articles=len(feed), retention_days=30)
+    store.upsert([json.loads(line) for line in feed])
+    return store, store.views()
+
+MODES: Dict[str, Callable[[List[bytes]], Any]] = {"dicts": build_dicts, "models": build_models, "store": build_store}
+
+def rss_bytes() -> Optional[int]:
+    """Resident memory of this process, or None where it can't be read (e.g. Windows)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current RSS, which is close enough in a process that only builds the corpus.
+    # macOS reports bytes, other Unixes kilobytes.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def measure(mode: str) -> None:
+    feed = make_feed(ARTICLES)
+    build = MODES[mode]
+    gc.collect()
+    rss_before = rss_bytes()
+    started = time.perf_counter()
+    corpus = build(feed)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    rss_after = rss_bytes()
+    rss = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+
+    # Traced separately: tracemalloc's own bookkeeping would inflate the RSS figure
+    del corpus
+    gc.collect()
+    tracemalloc.start()
+    corpus = build(feed)
+    gc.collect()
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(json.dumps({"mode": mode, "rss": rss, "traced": traced, "seconds": elapsed}))
+
+def main() -> None:
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        measure(sys.argv[2])
+        return
+    per = 10_000 / ARTICLES
+    print(f"{'mode':>7} {'traced MB/10k':>14} {'RSS MB/10k':>11} {'build ms':>9}")
+    for mode in MODES:
+        out = subprocess.run([sys.executable, "-m", "benchmarks.bench_memory", "--mode", mode],
+                             capture_output=True, text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        rss = f"{result['rss'] * per / 2**20:.2f}" if result["rss"] is not None else "unsupported"
+        print(f"{mode:>7} {result['traced'] * per / 2**20:>14.2f} {rss:>11} {result['seconds'] * 1000:>9.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark for the related-articles graph.
+
+Per-article cost should stay flat as the corpus grows: postings/article is the number of
+posting entries scoring one article reads, which max_df bounds.
+
+Run from the backend directory:
+    python -m benchmarks.bench_related
+"""
+import math
+import random
+import time
+from typing import Dict, List, Tuple
+from utils.related import RelatedIndex
+
+SIZES = [500, 2_000, 5_000, 10_000, 20_000]
+# Articles added and removed per simulated refresh
+REFRESH = 100
+# Corpus size up to which recall is checked against exact all-pairs scoring
+EXACT_MAX = 2_000
+
+def make_corpus(n: int, seed: int = 11) -> List[Tuple[str, str]]:
+    """Synthetic (title, description) pairs: each story has its own names and terms, shared
+    by the few articles covering it, plus filler from a Zipf-distributed common vocabulary."""
+    rng = random.Random(seed)
+
+    def word() -> str:
+        return "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(3))
+
+    vocab = [word() for _ in range(5000)]
+    weights = [1 / rank for rank in range(1, len(vocab) + 1)]
+    topics = [[word() for _ in range(10)] for _ in range(max(10, n // 8))]
+    corpus = []
+    for _ in range(n):
+        topic = rng.choice(topics)
+        title = " ".join(rng.sample(topic, 5) + rng.choices(vocab, weights, k=4))
+        description = " ".join(rng.sample(topic, 4) + rng.choices(vocab, weights, k=20))
+        corpus.append((title, description))
+    return corpus
+
+def exact_neighbors(index: RelatedIndex, k: int) -> Dict[int, List[int]]:
+    """All-pairs IDF cosine over the same capped terms, as the reference."""
+    n = len(index.terms)
+    cap = index.max_df
+    vectors = {}
+    for doc_id, terms in index.terms.items():
+        vectors[doc_id] = {
+            t: math.log(1 + n / len(index.postings[t]))
+            for t in terms if 1 < len(index.postings[t]) <= cap
+        }
+    norms = {d: math.sqrt(sum(w * w for w in v.values())) for d, v in vectors.items()}
+    result = {}
+    for a, va in vectors.items():
+        scores = []
+        for b, vb in vectors.items():
+            if a == b or not norms[a] or not norms[b]:
+                continue
+            dot = sum(w * w for t, w in va.items() if t in vb)
+            score = dot / (norms[a] * norms[b])
+            if score >= index.min_score:
+                scores.append((score, b))
+        scores.sort(reverse=True)
+        result[a] = [b for _, b in scores[:k]]
+    return result
+
+def main() -> None:
+    print(f"{'articles':>8} {'build ms':>9} {'us/article':>10} {'postings/article':>16} {'refresh ms':>11} "
+          f"{'recall@5':>9}")
+    for n in SIZES:
+        corpus = make_corpus(n + REFRESH)
+        index = RelatedIndex(budget_ms=float("inf"))
+
+        started = time.perf_counter()
+        for doc_id, (title, description) in enumerate(corpus[:n]):
+            index.add(doc_id, title, description)
+        index.update()
+        build = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        for doc_id in range(REFRESH):
+            index.remove(doc_id)
+        for doc_id in range(n, n + REFRESH):
+            index.add(doc_id, *corpus[doc_id])
+        index.update()
+        refresh = (time.perf_counter() - started) * 1000
+
+        postings = sum(
+            len(index.postings[t]) for terms in index.terms.values() for t in terms
+            if 1 < len(index.postings[t]) <= index.max_df
+        ) / len(index.terms)
+
+        recall = "-"
+        if n <= EXACT_MAX:
+            exact = exact_neighbors(index, index.k)
+            wanted = sum(len(v) for v in exact.values())
+            found = sum(len(set(v) & set(index.related(d))) for d, v in exact.items())
+            recall = f"{found / wanted:.1%}" if wanted else "-"
+
+        print(f"{n:>8} {build:>9.1f} {build * 1000 / n:>10.1f} {postings:>16.0f} {refresh:>11.1f} {recall:>9}")
+
+if __name__ == "__main__":
+    main()
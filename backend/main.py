@@ -1,8 +1,30 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routers import news, videos, search
+from routers import news, videos, search, sources
+from utils.ingestion import ingestor
+from utils.cache import cache_stats, sweep_expired
+from utils.http_client import http
+from utils.parse_pool import parse_pool
+from utils.persistence import snapshot_db
+from utils.content_pipeline import content_pipeline
 
-app = FastAPI(title="AI News Hub API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The last persisted snapshot is served at once; feeds are refreshed in the background
+    content_pipeline.start()
+    await ingestor.start()
+    sweeper = asyncio.create_task(sweep_expired(), name="cache-sweeper")
+    yield
+    sweeper.cancel()
+    await ingestor.stop()
+    await content_pipeline.stop()
+    await http.close()
+    parse_pool.shutdown()
+    snapshot_db.close()
+
+app = FastAPI(title="AI News Hub API", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -17,6 +39,7 @@ app.add_middleware(
 app.include_router(news.router, prefix="/news", tags=["news"])
 app.include_router(videos.router, prefix="/videos", tags=["videos"])
 app.include_router(search.router, prefix="/search", tags=["search"])
+app.include_router(sources.router, prefix="/sources", tags=["sources"])
 
 @app.get("/")
 async def root():
@@ -24,4 +47,10 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "ingestion": ingestor.status(),
+        "cache": cache_stats(),
+        "parse_pool": parse_pool.stats(),
+        "content_pipeline": content_pipeline.stats(),
+    }
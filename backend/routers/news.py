@@ -1,123 +1,56 @@
-from fastapi import APIRouter, Query
-from typing import List, Dict, Any
-from datetime import datetime
-from utils.fetch_rss import fetch_all_rss_feeds
-from utils.fetch_newsapi import fetch_all_news_apis
-from utils.clean_data import deduplicate_articles, categorize_article, parse_date
-from utils.fetch_article_content import fetch_article_content
-from utils.cache import cache
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Dict, Any, Optional
+import os
+from urllib.parse import unquote
+from utils.content_pipeline import content_pipeline
+from utils.ingestion import ingestor
+from utils.article_store import StoredArticle, canonical_url
+from utils.cache import content_cache, news_cache
+from utils.responses import PageParams, extend_json, paged_response, prepare_json, prepared_response
 
 router = APIRouter()
 
-async def get_all_news() -> List[Dict[str, Any]]:
-    """Internal function to fetch all news."""
-    # Check cache
-    cached = cache.get("all_news")
-    if cached:
-        return cached
-    
-    # Fetch from all sources
-    rss_articles = await fetch_all_rss_feeds()
-    api_articles = await fetch_all_news_apis()
-    
-    all_articles = rss_articles + api_articles
-    
-    # Deduplicate
-    all_articles = deduplicate_articles(all_articles)
-    
-    # Sort by date (with error handling)
-    try:
-        all_articles.sort(key=lambda x: parse_date(x.get("published_at", "")), reverse=True)
-    except Exception as e:
-        print(f"Error sorting articles: {e}")
-        # Sort by title as fallback
-        all_articles.sort(key=lambda x: x.get("title", ""), reverse=True)
-    
-    # Categorize each article
-    for article in all_articles:
-        categories = categorize_article(article, all_articles)
-        article["is_trending"] = categories["trending"]
-        article["is_important"] = categories["important"]
-    
-    # Cache results
-    cache.set("all_news", all_articles)
-    
-    return all_articles
+# Related articles returned with a single article
+RELATED_LIMIT = 3
+# Open /news/stream connections allowed per worker
+STREAM_MAX_CLIENTS = int(os.getenv("STREAM_MAX_CLIENTS", "10000"))
+
+def _list_response(request: Request, name: str, params: PageParams):
+    snapshot = ingestor.snapshot
+    if params.is_default:
+        return prepared_response(request, snapshot.bodies[name])
+    return paged_response(request, news_cache, f"{name}_{snapshot.version}", snapshot.views[name], "articles", params)
 
 @router.get("/all")
-async def get_news_all():
+async def get_news_all(request: Request, params: PageParams = Depends()):
     """Get all news articles."""
-    try:
-        articles = await get_all_news()
-        return {"articles": articles, "count": len(articles)}
-    except Exception as e:
-        print(f"Error in get_news_all: {e}")
-        import traceback
-        traceback.print_exc()
-        return {"articles": [], "count": 0, "error": str(e)}
+    return _list_response(request, "news_all", params)
 
 @router.get("/trending")
-async def get_news_trending():
+async def get_news_trending(request: Request, params: PageParams = Depends()):
     """Get trending news articles."""
-    try:
-        cached = cache.get("trending_news")
-        if cached:
-            return cached
-        
-        all_articles = await get_all_news()
-        trending = [a for a in all_articles if a.get("is_trending", False)]
-        
-        # If no trending articles found, use the most recent 10 articles as trending
-        if len(trending) == 0 and len(all_articles) > 0:
-            trending = all_articles[:10]
-            # Mark them as trending
-            for article in trending:
-                article["is_trending"] = True
-        
-        result = {"articles": trending, "count": len(trending)}
-        cache.set("trending_news", result)
-        return result
-    except Exception as e:
-        print(f"Error in get_news_trending: {e}")
-        import traceback
-        traceback.print_exc()
-        return {"articles": [], "count": 0, "error": str(e)}
+    return _list_response(request, "news_trending", params)
 
 @router.get("/important")
-async def get_news_important():
+async def get_news_important(request: Request, params: PageParams = Depends()):
     """Get important news articles."""
-    try:
-        cached = cache.get("important_news")
-        if cached:
-            return cached
-        
-        all_articles = await get_all_news()
-        important = [a for a in all_articles if a.get("is_important", False)]
-        
-        result = {"articles": important, "count": len(important)}
-        cache.set("important_news", result)
-        return result
-    except Exception as e:
-        print(f"Error in get_news_important: {e}")
-        import traceback
-        traceback.print_exc()
-        return {"articles": [], "count": 0, "error": str(e)}
+    return _list_response(request, "news_important", params)
 
 @router.get("/content")
 async def get_article_content(url: str = Query(..., description="Article URL")):
     """Get full article content from source."""
+    # Only pages of articles we serve are fetched and stored, never arbitrary URLs
+    entry = ingestor.store.get(canonical_url(url))
+    if entry is None or not entry.article.link:
+        raise HTTPException(status_code=404, detail="Article not found")
+    link = entry.article.link
     try:
-        # Check cache
-        cache_key = f"article_content_{url}"
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
-        
-        # Fetch content
-        content_data = await fetch_article_content(url)
+        # Concurrent views of the same article share one upstream fetch
+        cache_key = f"article_content_{link}"
+        content_data = await content_cache.get_or_compute(cache_key, lambda: content_pipeline.get(link))
         
         if content_data:
-            cache.set(cache_key, content_data)
             return content_data
         else:
             return {"content": None, "error": "Could not fetch article content"}
@@ -127,3 +60,124 @@ async def get_article_content(url: str = Query(..., description="Article URL")):
         traceback.print_exc()
         return {"content": None, "error": str(e)}
 
+def _find_article(article_id: str) -> Optional[StoredArticle]:
+    store = ingestor.store
+    entry = store.get_by_id(article_id)
+    if entry is None:
+        # Older links use the article URL itself as the ID
+        url = unquote(article_id) if "%" in article_id else article_id
+        entry = store.get(canonical_url(url))
+    return entry
+
+def _related_articles(article: Dict[str, Any], limit: int = RELATED_LIMIT) -> List[Dict[str, Any]]:
+    """Most similar articles from the related graph, else the newest from the same source."""
+    by_id = ingestor.store.by_id
+    related = [by_id[other].article for other in ingestor.snapshot.related.get(article["id"], ()) if other in by_id]
+    if related:
+        return related[:limit]
+    for other in ingestor.snapshot.articles:
+        if other["id"] != article["id"] and other.get("source") == article.get("source"):
+            related.append(other)
+            if len(related) >= limit:
+                break
+    return related
+
+def _sse(event: str, version: int) -> bytes:
+    return b'id: %d\nevent: %s\ndata: {"version": %d}\n\n' % (version, event.encode(), version)
+
+async def _change_events(version: Optional[int]) -> AsyncIterator[bytes]:
+    changes = ingestor.changes
+    changes.subscribers += 1
+    try:
+        # Browsers reconnect after this many milliseconds and resend the last event ID
+        yield b"retry: 5000\n\n"
+        if version is None:
+            version = changes.latest
+            yield _sse("hello", version)
+        elif changes.since(version) is None:
+            # Too far behind to catch up from the log: the client reloads the lists
+            version = changes.latest
+            yield _sse("reset", version)
+        else:
+            frame = changes.event(version)
+            version = changes.latest
+            if frame is not None:
+                yield frame
+        while True:
+            await changes.wait()
+            if changes.latest <= version:
+                yield b": ping\n\n"
+                continue
+            frame = changes.event(version)
+            if frame is None and changes.since(version) is None:
+                version = changes.latest
+                yield _sse("reset", version)
+                continue
+            version = changes.latest
+            if frame is not None:
+                yield frame
+    finally:
+        changes.subscribers -= 1
+
+@router.get("/stream")
+async def stream_news_changes(
+    since: Optional[int] = Query(None, ge=0, description="Snapshot version the client already has"),
+    last_event_id: Optional[int] = Header(None, ge=0),
+):
+    """Server-sent events with article additions, updates and removals as they are ingested.
+
+    Each event's ID is the snapshot version it brings the client to; reconnecting with
+    Last-Event-ID (or ?since=) resumes from there.
+    """
+    if ingestor.changes.subscribers >= STREAM_MAX_CLIENTS:
+        raise HTTPException(status_code=503, detail="Too many stream subscribers")
+    version = last_event_id if last_event_id is not None else since
+    return StreamingResponse(
+        _change_events(version),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/changes")
+async def get_news_changes(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0, description="Snapshot version the client already has"),
+):
+    """Articles added, updated and removed since a snapshot version.
+
+    Returns {version, full: false, upserts, removed}; when since is missing or older than
+    the change log reaches, the whole list as {version, full: true, articles, count}.
+    """
+    snapshot = ingestor.snapshot
+    change = ingestor.changes.since(since) if since is not None else None
+    if change is None:
+        cache_key = f"changes_full_{snapshot.version}"
+        body = news_cache.get(cache_key)
+        if body is None:
+            # The full list is already serialized for /news/all; only the version fields are added
+            body = extend_json(snapshot.bodies["news_all"], version=snapshot.version, full=True)
+            news_cache.set(cache_key, body)
+        return prepared_response(request, body)
+
+    cache_key = f"changes_{change.prev_version}_{change.version}"
+    body = news_cache.get(cache_key)
+    if body is None:
+        body = prepare_json({"version": change.version, "full": False,
+                             "upserts": change.upserts, "removed": change.removed})
+        news_cache.set(cache_key, body)
+    return prepared_response(request, body)
+
+# Declared last so the fixed paths above take precedence
+@router.get("/{article_id:path}")
+async def get_article(request: Request, article_id: str):
+    """Get one article by ID (or URL) with its related articles."""
+    entry = _find_article(article_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    
+    cache_key = f"article_{ingestor.snapshot.version}_{entry.id}"
+    body = news_cache.get(cache_key)
+    if body is None:
+        body = prepare_json({"article": entry.article, "related": _related_articles(entry.article)})
+        news_cache.set(cache_key, body)
+    return prepared_response(request, body)
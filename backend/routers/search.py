@@ -1,57 +1,29 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request
 from typing import List, Dict, Any
-from routers import news
-from utils.fetch_youtube import fetch_all_youtube_videos
-from utils.cache import cache
+from utils.ingestion import ingestor
+from utils.cache import search_cache
+from utils.responses import prepare_json, prepared_response
 
 router = APIRouter()
 
 @router.get("")
-async def search(q: str = Query(..., description="Search query")):
+async def search(
+    request: Request,
+    q: str = Query(..., description='Search query. Words are AND-ed; supports OR and "quoted phrases"'),
+    limit: int = Query(20, ge=1, le=100, description="Results per page for news and for videos"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
+):
     """Search across news and videos."""
-    query_lower = q.lower()
-    
-    # Check cache
-    cache_key = f"search_{q}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
-    
-    # Get all news
-    all_news = await news.get_all_news()
-    
-    # Search in news
-    news_results = []
-    for article in all_news:
-        title = article.get("title", "").lower()
-        description = article.get("description", "").lower()
-        source = article.get("source", "").lower()
-        
-        if query_lower in title or query_lower in description or query_lower in source:
-            news_results.append(article)
-    
-    # Get all videos
-    all_videos_data = await fetch_all_youtube_videos()
-    all_videos = all_videos_data if isinstance(all_videos_data, list) else []
-    
-    # Search in videos
-    video_results = []
-    for video in all_videos:
-        title = video.get("title", "").lower()
-        description = video.get("description", "").lower()
-        channel = video.get("channel", "").lower()
-        
-        if query_lower in title or query_lower in description or query_lower in channel:
-            video_results.append(video)
-    
-    result = {
-        "query": q,
-        "news": news_results,
-        "videos": video_results,
-        "news_count": len(news_results),
-        "videos_count": len(video_results)
-    }
-    
-    cache.set(cache_key, result)
-    return result
-
+    # Check cache (keyed by snapshot version so results follow each refresh)
+    cache_key = f"search_{ingestor.snapshot.version}_{limit}_{offset}_{q}"
+    body = search_cache.get(cache_key)
+    if body is None:
+        # Serialized once per query and snapshot, like the list endpoints
+        body = prepare_json({
+            "query": q,
+            "limit": limit,
+            "offset": offset,
+            **ingestor.search(q, limit, offset),
+        })
+        search_cache.set(cache_key, body)
+    return prepared_response(request, body)
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException
+from utils.ingestion import ingestor
+
+router = APIRouter()
+
+@router.get("")
+async def get_sources():
+    """Per-source schedule and last fetch: time, latency, items and errors."""
+    return {
+        # Only the leader worker polls; a follower reports its configuration only
+        "role": "follower" if ingestor.following else "leader",
+        **ingestor.scheduler.summary(),
+        "sources": ingestor.scheduler.stats(),
+    }
+
+@router.get("/{name}")
+async def get_source(name: str):
+    """Stats of one configured source, by name."""
+    for source in ingestor.scheduler.stats():
+        if source["name"] == name:
+            return source
+    raise HTTPException(status_code=404, detail="Source not found")
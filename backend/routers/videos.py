@@ -1,40 +1,41 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query, Request
 from typing import List, Dict, Any
-from utils.fetch_youtube import fetch_all_youtube_videos
-from utils.cache import cache
+from utils.ingestion import ingestor
+from utils.cache import videos_cache
+from utils.responses import PageParams, paged_response, prepared_response
 
 router = APIRouter()
 
+def _in_category(video: Dict[str, Any], category_lower: str) -> bool:
+    title_lower = video.get("title", "").lower()
+    
+    if category_lower == "talks":
+        return "talk" in title_lower or "conference" in title_lower or "presentation" in title_lower
+    if category_lower == "demos":
+        return "demo" in title_lower or "demonstration" in title_lower or "showcase" in title_lower
+    if category_lower == "research":
+        return "research" in title_lower or "paper" in title_lower or "study" in title_lower
+    return False
+
 @router.get("")
-async def get_videos(category: str = Query(None, description="Filter by category: talks, demos, research")):
+async def get_videos(
+    request: Request,
+    category: str = Query(None, description="Filter by category: talks, demos, research"),
+    params: PageParams = Depends(),
+):
     """Get AI-related videos."""
-    cached = cache.get("all_videos")
-    if cached and not category:
-        return cached
-    
-    videos = await fetch_all_youtube_videos()
+    snapshot = ingestor.snapshot
     
     # Filter by category if provided
     if category:
         category_lower = category.lower()
-        filtered = []
-        for video in videos:
-            title_lower = video.get("title", "").lower()
-            desc_lower = video.get("description", "").lower()
-            
-            if category_lower == "talks" and ("talk" in title_lower or "conference" in title_lower or "presentation" in title_lower):
-                filtered.append(video)
-            elif category_lower == "demos" and ("demo" in title_lower or "demonstration" in title_lower or "showcase" in title_lower):
-                filtered.append(video)
-            elif category_lower == "research" and ("research" in title_lower or "paper" in title_lower or "study" in title_lower):
-                filtered.append(video)
-        
-        videos = filtered
+        cache_key = f"category_{snapshot.version}_{category_lower}"
+        view = videos_cache.get(cache_key)
+        if view is None:
+            view = snapshot.views["videos"].filter(lambda video: _in_category(video, category_lower))
+            videos_cache.set(cache_key, view)
+        return paged_response(request, videos_cache, f"page_{cache_key}", view, "videos", params)
     
-    result = {"videos": videos, "count": len(videos)}
-    
-    if not category:
-        cache.set("all_videos", result)
-    
-    return result
-
+    if params.is_default:
+        return prepared_response(request, snapshot.bodies["videos"])
+    return paged_response(request, videos_cache, f"page_{snapshot.version}", snapshot.views["videos"], "videos", params)
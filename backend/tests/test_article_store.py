@@ -0,0 +1,171 @@
+import time
+from datetime import datetime, timedelta, timezone
+from utils.article_store import ArticleStore, canonical_url, short_hash
+from utils.models import Article
+
+def iso(hours_ago: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(hours=hours_ago)).replace(microsecond=0).isoformat()
+
+def article(title: str, link: str, hours_ago: float = 48, source: str = "Example", description: str = "") -> dict:
+    return {"title": title, "description": description, "link": link, "published_at": iso(hours_ago),
+            "source": source, "author": "", "image": None}
+
+def test_upsert_counts_and_unchanged():
+    store = ArticleStore()
+    batch = [article("Meta releases Llama 3", "https://a.example/llama-3"),
+             article("Meta releases Llama 4", "https://a.example/llama-4")]
+    assert store.upsert(batch) == {"added": 2, "updated": 0, "unchanged": 0, "duplicates": 0, "skipped": 0,
+                                  "removed": 0}
+    assert store.upsert(batch)["unchanged"] == 2
+    batch[0]["description"] = "Now with a description"
+    assert store.upsert(batch)["updated"] == 1
+    assert store.get(canonical_url("https://a.example/llama-3")).article.description == "Now with a description"
+
+def test_distinct_versions_stay_separate():
+    store = ArticleStore()
+    store.upsert([article("Meta releases Llama 3", "https://a.example/llama-3")])
+    stats = store.upsert([article("Meta releases Llama 4", "https://b.example/llama-4")])
+    assert stats["added"] == 1 and stats["duplicates"] == 0
+    assert store.get_by_id(short_hash(canonical_url("https://b.example/llama-4"))) is not None
+
+def test_duplicates_are_grouped_and_reachable():
+    store = ArticleStore()
+    store.upsert([article("Meta releases Llama 3", "https://a.example/llama-3", source="A")])
+    stats = store.upsert([article("Meta releases Llama 3 - The Verge", "https://verge.example/llama?utm_source=x",
+                                  source="The Verge")])
+    assert stats["duplicates"] == 1
+    head = store.get(canonical_url("https://a.example/llama-3"))
+    assert head.article.cluster_size == 2
+    assert head.article.is_trending
+    assert head.article.to_dict()["duplicates"] == [{"link": "https://verge.example/llama?utm_source=x",
+                                                    "source": "The Verge"}]
+    # The copy's own URL and ID lead to the article it was grouped under
+    copy_key = canonical_url("https://verge.example/llama")
+    assert store.get(copy_key) is head
+    assert store.get_by_id(short_hash(copy_key)) is head
+
+def test_views_are_newest_first_with_flags():
+    store = ArticleStore()
+    store.upsert([
+        article("Old research paper on robotics", "https://a.example/1", hours_ago=72),
+        article("Fresh robotics demo", "https://a.example/2", hours_ago=1),
+        article("Breaking: chip export rules", "https://a.example/3", hours_ago=60),
+    ])
+    articles, trending, important = store.views()
+    assert [a.title for a in articles.items] == [
+        "Fresh robotics demo", "Breaking: chip export rules", "Old research paper on robotics"]
+    # Recent or viral articles are trending; keyword matches are important
+    assert [a.title for a in trending.items] == ["Fresh robotics demo", "Breaking: chip export rules"]
+    assert [a.title for a in important.items] == ["Old research paper on robotics"]
+
+def test_trending_falls_back_to_newest():
+    store = ArticleStore()
+    store.upsert([article(f"Quiet story number {i}", f"https://a.example/{i}", hours_ago=30 + i) for i in range(12)])
+    _, trending, _ = store.views()
+    assert len(trending.items) == 10
+    assert all(a.is_trending for a in trending.items)
+
+def test_trending_window_ages_out(monkeypatch):
+    store = ArticleStore()
+    store.upsert([article("Fresh robotics demo", "https://a.example/2", hours_ago=1),
+                  article("Another quiet story", "https://a.example/3", hours_ago=30)])
+    assert [a.title for a in store.views()[1].items] == ["Fresh robotics demo"]
+    store.drain_changes()
+
+    # A day later the article has aged out of the window; nothing is trending, so the newest stand in
+    now = time.time() + 86400
+    monkeypatch.setattr(time, "time", lambda: now)
+    _, trending, _ = store.views()
+    assert not store.get(canonical_url("https://a.example/2")).article.is_trending
+    assert canonical_url("https://a.example/2") in store.drain_changes()[0]
+    assert len(trending.items) == 2
+
+def test_evict_oldest_beyond_cap():
+    store = ArticleStore(max_articles=3)
+    stats = store.upsert([article(f"Story about topic {i}", f"https://a.example/{i}", hours_ago=i * 10)
+                          for i in reversed(range(6))])
+    assert stats["added"] == 6 and stats["removed"] == 3
+    assert [a.link for a in store.views()[0].items] == [f"https://a.example/{i}" for i in range(3)]
+    # Evicted before they were ever published, so they aren't reported as removed
+    changed, removed = store.drain_changes()
+    assert changed == {canonical_url(f"https://a.example/{i}") for i in range(3)} and removed == set()
+    assert store.get_by_id(short_hash(canonical_url("https://a.example/5"))) is None
+
+    stats = store.upsert([article("Newest story", "https://a.example/new", hours_ago=0)])
+    assert stats["removed"] == 1
+    assert store.drain_changes() == ({canonical_url("https://a.example/new")}, {canonical_url("https://a.example/2")})
+
+def test_stale_items_are_not_churned():
+    store = ArticleStore(max_articles=3)
+    store.upsert([article(f"Story about topic {i}", f"https://a.example/{i}", hours_ago=i) for i in range(3)])
+    store.drain_changes()
+    # Older than everything in a full store: skipped instead of added and evicted on every poll
+    stale = [article("Lab post from last year", "https://lab.example/old", hours_ago=24 * 365)]
+    for _ in range(3):
+        stats = store.upsert(stale)
+        assert stats["skipped"] == 1 and stats["removed"] == 0
+        assert not store.has_changes
+
+def test_retention_keeps_articles_feeds_still_list(monkeypatch):
+    store = ArticleStore(retention_days=2)
+    listed = article("Lab post from last year", "https://lab.example/old", hours_ago=24 * 365)
+    dropped = article("Story that left the feed", "https://a.example/dropped", hours_ago=40)
+    assert store.upsert([listed, dropped])["added"] == 2
+    store.drain_changes()
+    assert store.upsert([listed, dropped])["removed"] == 0
+    assert not store.has_changes
+
+    # Two days on, only the article the feed still lists is kept
+    now = time.time() + 2 * 86400 + 60
+    monkeypatch.setattr(time, "time", lambda: now)
+    assert store.upsert([listed])["removed"] == 1
+    assert store.drain_changes()[1] == {canonical_url("https://a.example/dropped")}
+    assert store.get(canonical_url("https://lab.example/old")) is not None
+
+def test_evicting_an_article_drops_its_copies():
+    store = ArticleStore(max_articles=1)
+    store.upsert([article("Meta releases Llama 3", "https://a.example/llama-3", hours_ago=5),
+                  article("Meta releases Llama 3 - Wired", "https://wired.example/llama-3", hours_ago=5)])
+    store.upsert([article("Unrelated newer story", "https://a.example/new", hours_ago=1)])
+    assert len(store) == 1
+    assert store.get(canonical_url("https://wired.example/llama-3")) is None
+    assert store._duplicate_ids == {}
+
+def test_restored_articles_keep_their_copies():
+    store = ArticleStore()
+    store.upsert([article("Meta releases Llama 3", "https://a.example/llama-3", hours_ago=48),
+                  article("Meta releases Llama 3 - Wired", "https://wired.example/llama-3", hours_ago=48)])
+    persisted = Article.from_dict(store.views()[0].items[0].to_dict())
+
+    restored = ArticleStore()
+    restored.upsert([persisted])
+    head = restored.get(canonical_url("https://a.example/llama-3"))
+    assert head.article == persisted
+    assert (head.article.cluster_size, head.article.is_trending) == (2, True)
+    assert restored.get(canonical_url("https://wired.example/llama-3")) is head
+    # The copy showing up again in a feed is still recognised
+    stats = restored.upsert([article("Meta releases Llama 3 - Wired", "https://wired.example/llama-3", hours_ago=48)])
+    assert stats["duplicates"] == 1
+
+def test_restore_mirrors_published_articles_as_is(monkeypatch):
+    leader = ArticleStore()
+    leader.upsert([article("Meta releases Llama 3", "https://a.example/llama-3", hours_ago=1),
+                   article("Meta releases Llama 3 - Wired", "https://wired.example/llama-3", hours_ago=1),
+                   article("Robotics startup raises funding", "https://a.example/robots", hours_ago=30)])
+    rows = [Article.from_dict(a.to_dict()) for a in leader.views()[0].items]
+
+    follower = ArticleStore()
+    assert follower.restore(rows) == 2
+    assert follower.restore(rows) == 0
+    # Even once the trending window has moved on, a follower serves the flags it was given
+    now = time.time() + 86400
+    monkeypatch.setattr(time, "time", lambda: now)
+    articles, trending, _ = follower.views(advance_window=False)
+    assert list(articles.items) == rows
+    assert [a.title for a in trending.items] == ["Meta releases Llama 3"]
+    assert follower.get(canonical_url("https://wired.example/llama-3")).article.cluster_size == 2
+
+    follower.drain_changes()
+    follower.retain({rows[0].id})
+    assert len(follower) == 1
+    assert follower.drain_changes()[1] == {canonical_url("https://a.example/robots")}
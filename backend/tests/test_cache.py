@@ -0,0 +1,53 @@
+import asyncio
+import time
+import pytest
+from utils import cache as cache_module
+from utils.cache import Cache, approx_size, sweep_expired
+from utils.cache_backends import MemoryBackend
+
+def make_cache(**kwargs) -> Cache:
+    return Cache("test", backend=MemoryBackend(approx_size), **kwargs)
+
+def test_evicts_least_recently_used_beyond_max_entries():
+    c = make_cache(max_entries=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert (c.get("a"), c.get("c")) == (1, 3)
+    assert c.stats()["evictions"] == 1 and c.stats()["entries"] == 2
+
+def test_evicts_beyond_byte_budget():
+    c = make_cache(max_bytes=3000)
+    for i in range(5):
+        c.set(str(i), "x" * 1000)
+    assert c.stats()["bytes"] <= 3000
+    assert c.get("4") is not None and c.get("0") is None
+
+def test_expired_entries_are_misses_and_purged(monkeypatch):
+    c = make_cache(ttl_minutes=1, stale_minutes=1)
+    c.set("a", 1)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 90)
+    # Past its TTL but inside the stale window: a miss, kept for stale-while-revalidate
+    assert c.get("a") is None
+    assert c.cleanup_expired() == 0
+    monkeypatch.setattr(time, "time", lambda: now + 150)
+    assert c.cleanup_expired() == 1
+    assert c.stats()["entries"] == 0
+
+def test_sweeper_purges_every_namespace(monkeypatch):
+    c = make_cache(ttl_minutes=0, stale_minutes=0)
+    monkeypatch.setattr(cache_module, "CACHES", {"test": c})
+    c.set("a", 1)
+
+    async def sweep_once():
+        task = asyncio.create_task(sweep_expired(interval_seconds=0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(sweep_once())
+    assert len(c.backend) == 0 and c.stats()["expired"] == 1
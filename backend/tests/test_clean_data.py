@@ -0,0 +1,43 @@
+import zlib
+from datetime import datetime, timedelta, timezone
+import pytest
+from utils.clean_data import PLACEHOLDER_IMAGES, categorize_article, categorize_articles, parse_date, placeholder_image
+
+EXPECTED = datetime(2024, 10, 15, 14, 3, tzinfo=timezone.utc)
+
+@pytest.mark.parametrize("text", [
+    "Tue, 15 Oct 2024 14:03:00 GMT",
+    "Tue, 15 Oct 2024 14:03:00 +0000",
+    "Tue, 15 Oct 2024 10:03:00 -0400",
+    "2024-10-15T14:03:00Z",
+    "2024-10-15T14:03:00.0000000Z",
+    "2024-10-15T14:03:00+00:00",
+    "2024-10-15 14:03:00",
+    "October 15, 2024 14:03",
+])
+def test_parse_date_formats(text):
+    assert parse_date(text) == EXPECTED
+
+def test_parse_date_falls_back_to_now():
+    before = datetime.now(timezone.utc)
+    assert parse_date("not a date") >= before
+    assert parse_date("") >= before
+
+def test_placeholder_image_is_stable():
+    # Same pick in every process, unlike hash()
+    assert placeholder_image("Meta releases Llama 3") == PLACEHOLDER_IMAGES[zlib.crc32(b"Meta releases Llama 3") % 15]
+
+def test_categorize_articles_matches_per_article():
+    old = (datetime.now(timezone.utc) - timedelta(days=3)).isoformat()
+    articles = [
+        {"title": "Chip export rules tighten", "published_at": old, "source": "Reuters"},
+        {"title": "Chip export rules tighten!", "published_at": old, "source": "Wired"},
+        {"title": "Lab publishes safety report", "published_at": old, "source": "Anthropic Blog"},
+        {"title": "A quiet week", "published_at": old, "source": "Wired"},
+        {"title": "Fresh news", "published_at": datetime.now(timezone.utc).isoformat(), "source": "Wired"},
+    ]
+    flags = categorize_articles(articles)
+    assert flags == [categorize_article(article, articles) for article in articles]
+    # Seen in two sources, a major lab, neither, and recent
+    assert [f["trending"] for f in flags] == [True, True, False, False, True]
+    assert flags[2]["important"]
@@ -0,0 +1,49 @@
+import asyncio
+import gc
+from utils import content_pipeline as pipeline_module
+from utils.content_pipeline import ContentPipeline, DomainLimiter
+from utils.persistence import SnapshotDB
+
+def test_recent_failures_are_not_fetched_again_on_demand(tmp_path, monkeypatch):
+    calls = []
+
+    async def fetch(url):
+        calls.append(url)
+        return {"content": None}
+
+    monkeypatch.setattr(pipeline_module, "fetch_article_content", fetch)
+    db = SnapshotDB(str(tmp_path / "news.db"))
+    pipeline = ContentPipeline(db=db)
+
+    async def get_twice():
+        return await pipeline.get("https://a.example/1"), await pipeline.get("https://a.example/1")
+
+    first, second = asyncio.run(get_twice())
+    db.close()
+    assert first == {"content": None} and second is None
+    assert calls == ["https://a.example/1"]
+    assert pipeline.metrics["failed"] == 1
+
+def test_stored_content_is_served_without_fetching(tmp_path, monkeypatch):
+    async def fetch(url):
+        raise AssertionError("should not fetch")
+
+    monkeypatch.setattr(pipeline_module, "fetch_article_content", fetch)
+    db = SnapshotDB(str(tmp_path / "news.db"))
+    db.save_content("https://a.example/1", {"content": "Text"})
+    assert asyncio.run(ContentPipeline(db=db).get("https://a.example/1")) == {"content": "Text"}
+    db.close()
+
+def test_domain_limiter_forgets_idle_sites(monkeypatch):
+    monkeypatch.setattr(pipeline_module, "MAX_PACED_DOMAINS", 10)
+    limiter = DomainLimiter(concurrency=1, interval=0.0)
+
+    async def visit(count):
+        for i in range(count):
+            async with limiter.slot(f"site{i}.example"):
+                pass
+
+    asyncio.run(visit(50))
+    gc.collect()
+    assert len(limiter._slots) == 0
+    assert len(limiter._next_at) <= 11
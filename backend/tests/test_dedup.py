@@ -0,0 +1,46 @@
+import pytest
+from utils.clean_data import deduplicate_articles
+from utils.dedup import DuplicateIndex, cluster_titles
+
+DISTINCT = [
+    ("OpenAI releases GPT-5 with improved reasoning", "OpenAI releases GPT-4o with improved reasoning"),
+    ("Google launches Gemini 2.0 for developers", "Google launches Gemini 2.5 for developers"),
+    ("Meta releases Llama 3", "Meta releases Llama 4"),
+    ("Nvidia shares rise after record AI chip demand", "Nvidia shares fall after record AI chip demand"),
+    ("Nvidia stock rises on AI demand", "Nvidia stock falls on AI demand"),
+]
+
+SYNDICATED = [
+    ("Meta releases Llama 3", "Meta releases Llama 3 - The Verge"),
+    ("OpenAI releases GPT-5 with improved reasoning", "OpenAI releases GPT-5 with improved reasoning | Reuters"),
+    ("Anthropic raises $4 billion from Amazon", "Anthropic Raises $4 Billion From Amazon!"),
+]
+
+@pytest.mark.parametrize("first,second", DISTINCT)
+def test_distinct_stories_are_not_merged(first, second):
+    assert cluster_titles([first, second]) == [0, 1]
+
+@pytest.mark.parametrize("first,second", SYNDICATED)
+def test_syndicated_copies_are_merged(first, second):
+    assert cluster_titles([first, second]) == [0, 0]
+
+def test_numbers_must_match():
+    index = DuplicateIndex()
+    index.add("a", "Apple reports $90 billion in quarterly revenue")
+    assert index.match("Apple reports $90 billion in quarterly revenue - CNBC") == "a"
+    assert index.match("Apple reports $95 billion in quarterly revenue") is None
+
+def test_remove():
+    index = DuplicateIndex()
+    index.add("a", "Meta releases Llama 3")
+    index.remove("a")
+    assert len(index) == 0
+    assert index.match("Meta releases Llama 3") is None
+
+def test_deduplicate_articles_keeps_first_of_each_story():
+    articles = [{"title": "Meta releases Llama 3"}, {"title": "Meta releases Llama 4"},
+                {"title": "Meta releases Llama 3 - The Verge"}]
+    assert deduplicate_articles(articles) == [
+        {"title": "Meta releases Llama 3", "cluster_id": 0, "cluster_size": 2},
+        {"title": "Meta releases Llama 4", "cluster_id": 1, "cluster_size": 1},
+    ]
@@ -0,0 +1,18 @@
+from utils.extract import extract_article
+
+SECTION = "<section><h2>Part</h2>" + "<p>A sentence about the subject, with a clause, and another one.</p>" * 6 + "</section>"
+
+def test_lead_paragraph_beside_the_best_section_is_kept():
+    page = (f"<html><body><nav><a href='/'>Home</a></nav><div id='wrap'>"
+            f"<p>The lead paragraph sits directly in the wrapper, next to the sections.</p>"
+            f"{SECTION}</div></body></html>").encode()
+    content = extract_article(page, "https://example.com/")[0]["content"]
+    assert content.startswith("The lead paragraph")
+    assert "A sentence about the subject" in content
+    assert "Home" not in content
+
+def test_link_lists_beside_the_best_section_are_dropped():
+    links = "".join(f"<a href='/{i}'>another story link</a> " for i in range(5))
+    page = f"<html><body><div>{SECTION}<p>{links}</p></div></body></html>".encode()
+    content = extract_article(page, "https://example.com/")[0]["content"]
+    assert "another story link" not in content
@@ -0,0 +1,33 @@
+import asyncio
+import httpx
+import pytest
+from utils.fetch_youtube import QuotaBudget, YouTubeIngest, get_mock_videos
+from utils.http_client import http
+from utils.persistence import SnapshotDB
+
+def test_failed_calls_are_not_retried_past_the_budget(tmp_path, monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(503)
+
+    monkeypatch.setattr(http, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    db = SnapshotDB(str(tmp_path / "news.db"))
+    budget = QuotaBudget(daily_budget=100, db=db)
+    ingest = YouTubeIngest(["UC1"], [], budget, db=db)
+
+    async def call():
+        try:
+            await ingest._call("playlistItems", {"playlistId": "UU1"})
+        finally:
+            await http.close()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(call())
+    db.close()
+    # Every request sent to the API was charged
+    assert len(requests) == budget.used == 1
+
+def test_mock_videos_are_stable():
+    assert get_mock_videos() == get_mock_videos()
@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from utils.article_store import canonical_url
+from utils.content_pipeline import ContentPipeline
+from utils.ingestion import Ingestor
+from utils.leader import LeaderLock
+from utils.persistence import SnapshotDB
+from utils.sources import SourceConfig
+
+def article(title: str, link: str, hours_ago: float = 2) -> dict:
+    published = (datetime.now(timezone.utc) - timedelta(hours=hours_ago)).isoformat()
+    return {"title": title, "description": "", "link": link, "published_at": published,
+            "source": "Example", "author": "", "image": None}
+
+@pytest.fixture
+def ingestor(tmp_path):
+    db = SnapshotDB(str(tmp_path / "news.db"))
+    yield Ingestor(db=db, leader=LeaderLock(str(tmp_path / "ingest.lock")), content=ContentPipeline())
+    db.close()
+
+def test_publish_skips_unchanged_batches(ingestor):
+    batch = [article("Meta releases Llama 3", "https://a.example/1"),
+             article("Robotics startup raises funding", "https://a.example/2")]
+    ingestor.store.upsert(batch)
+    ingestor.publish()
+    first = ingestor.snapshot
+    assert first.version == 1 and len(first.articles) == 2
+
+    # A replayed feed (e.g. 304 Not Modified) changes nothing, so nothing is rebuilt
+    ingestor.store.upsert(batch)
+    ingestor.publish()
+    assert ingestor.snapshot is first
+
+    ingestor.store.upsert([article("Meta releases Llama 4", "https://a.example/3")])
+    ingestor.publish()
+    assert ingestor.snapshot.version == 2
+
+def test_search_skips_articles_evicted_before_publish(ingestor):
+    ingestor.store.upsert([article("Meta releases Llama 3", "https://a.example/1"),
+                           article("Meta releases Llama 4", "https://a.example/2")])
+    ingestor.publish()
+    ingestor.store.retain({ingestor.store.get(canonical_url("https://a.example/2")).id})
+    result = ingestor.search("llama ", 10, 0)
+    assert [a.link for a in result["news"]] == ["https://a.example/2"]
+
+def test_unchanged_poll_results_schedule_no_publish(ingestor):
+    source = SourceConfig(name="Example", kind="rss", url="https://a.example/feed", interval=300, priority=0,
+                          concurrency_class="feeds", hedge=True, timeout=10)
+    batch = [article("Meta releases Llama 3", "https://a.example/1")]
+
+    async def merge_twice():
+        ingestor._merge_partial(source, batch)
+        scheduled = ingestor._partial_publish is not None
+        ingestor._cancel_partial_publish()
+        ingestor.publish()
+        ingestor._merge_partial(source, batch)
+        return scheduled, ingestor._partial_publish is not None
+
+    assert asyncio.run(merge_twice()) == (True, False)
+    assert ingestor.last_upsert["Example"]["unchanged"] == 1
@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from utils.cache import Cache
+from utils.cache_backends import SQLiteBackend
+from utils.content_pipeline import ContentPipeline
+from utils.ingestion import Ingestor
+from utils.leader import LeaderLock
+from utils.persistence import SnapshotDB
+
+def article(title: str, link: str, hours_ago: float = 2) -> dict:
+    published = (datetime.now(timezone.utc) - timedelta(hours=hours_ago)).isoformat()
+    return {"title": title, "description": "", "link": link, "published_at": published,
+            "source": "Example", "author": "", "image": None}
+
+def test_only_one_worker_holds_the_lock(tmp_path):
+    path = str(tmp_path / "ingest.lock")
+    first, second = LeaderLock(path), LeaderLock(path)
+    assert first.try_acquire() and first.is_leader
+    assert not second.try_acquire() and not second.is_leader
+    # The leader exiting frees the lock for the next attempt
+    first.release()
+    assert second.try_acquire() and second.is_leader
+    second.release()
+
+def test_follower_publishes_the_leaders_snapshot(tmp_path):
+    path = str(tmp_path / "news.db")
+    leader_db, follower_db = SnapshotDB(path), SnapshotDB(path)
+    leader = Ingestor(db=leader_db, leader=LeaderLock(str(tmp_path / "ingest.lock")), content=ContentPipeline())
+    follower = Ingestor(db=follower_db, leader=LeaderLock(str(tmp_path / "ingest.lock")), content=ContentPipeline())
+    assert leader.leader.try_acquire()
+    follower.following = True
+
+    leader.store.upsert([article("Meta releases Llama 3", "https://a.example/1"),
+                         article("Robotics startup raises funding", "https://a.example/2", hours_ago=30)])
+    leader.publish()
+    asyncio.run(follower._sync_from_db())
+    assert follower.snapshot.version == leader.snapshot.version
+    assert follower.snapshot.bodies["news_all"].digest == leader.snapshot.bodies["news_all"].digest
+
+    # A follower writes nothing back
+    follower.store.upsert([article("Follower-only story", "https://a.example/3")])
+    follower.publish(version=follower.snapshot.version)
+    assert len(leader_db.load_articles()) == 2
+    leader.leader.release()
+    leader_db.close()
+    follower_db.close()
+
+def test_sqlite_cache_is_shared_by_file_and_split_by_namespace(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = Cache("news", backend=SQLiteBackend("news", path))
+    second = Cache("news", backend=SQLiteBackend("news", path))
+    first.set("key", {"articles": [1, 2]})
+    assert second.get("key") == {"articles": [1, 2]}
+    assert Cache("search", backend=SQLiteBackend("search", path)).get("key") is None
@@ -0,0 +1,22 @@
+from utils.clean_data import PLACEHOLDER_IMAGES
+from utils.models import Article
+
+def make(image, source="Example", author="Jane Doe") -> Article:
+    return Article(id="a1", title="Title", description="", link="https://a.example/1", published=1700000000,
+                   source=source, author=author, image=image)
+
+def test_placeholder_images_and_sources_share_one_copy():
+    url = "".join(PLACEHOLDER_IMAGES[3])
+    assert url is not PLACEHOLDER_IMAGES[3]
+    assert make(url).image is PLACEHOLDER_IMAGES[3]
+    assert make(None, source="".join("Reuters")).source is make(None, source="Reuters").source
+
+def test_other_images_are_kept_as_given():
+    url = "https://cdn.example.com/img/1.jpg"
+    assert make(url).image is url
+    assert make(None).image is None
+
+def test_serializes_like_the_dict_it_replaced():
+    article = make(None)
+    assert article["published_at"] == "2023-11-14T22:13:20+00:00"
+    assert Article.from_dict(article.to_dict()) == article
@@ -0,0 +1,24 @@
+import pytest
+from utils.paging import SortedView, decode_cursor, encode_cursor
+
+def make_view() -> SortedView:
+    return SortedView.build(((-float(ts), f"id{ts}"), {"id": f"id{ts}"}) for ts in (100, 300, 200, 400))
+
+def test_cursor_pages_through_in_order():
+    view = make_view()
+    items, total, cursor = view.page(limit=3)
+    assert [item["id"] for item in items] == ["id400", "id300", "id200"] and total == 4
+    items, _, cursor = view.page(limit=3, cursor=cursor)
+    assert [item["id"] for item in items] == ["id100"] and cursor is None
+
+def test_since_counts_only_newer_items():
+    items, total, _ = make_view().page(since=200)
+    assert [item["id"] for item in items] == ["id400", "id300"] and total == 2
+
+def test_cursor_round_trips():
+    assert decode_cursor(encode_cursor((-1700000000.25, "abc"))) == (-1700000000.25, "abc")
+
+@pytest.mark.parametrize("cursor", ["nan_x", "inf_x", "-inf_x", "Infinity_x", "1700000000", "_x", "abc_x"])
+def test_decode_cursor_rejects_invalid(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
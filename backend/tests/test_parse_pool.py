@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+import pytest
+from utils.parse_pool import ParseExecutor
+
+def slow(seconds: float) -> str:
+    time.sleep(seconds)
+    return threading.current_thread().name
+
+def test_jobs_run_off_the_event_loop():
+    pool = ParseExecutor(workers=1, queue_size=0)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        thread = await pool.run("slow", slow, 0.2)
+        task.cancel()
+        return thread, ticks
+
+    thread, ticks = asyncio.run(main())
+    assert thread.startswith("parse")
+    # The loop kept running while the job slept
+    assert ticks >= 5
+    assert pool.stats()["tasks"]["slow"]["count"] == 1
+
+def test_submitters_wait_for_a_slot():
+    pool = ParseExecutor(workers=1, queue_size=1)
+    peak = 0
+
+    async def main():
+        nonlocal peak
+
+        async def watch():
+            nonlocal peak
+            while True:
+                peak = max(peak, pool.in_flight)
+                await asyncio.sleep(0.005)
+
+        watcher = asyncio.create_task(watch())
+        await asyncio.gather(*(pool.run("slow", slow, 0.05) for _ in range(6)))
+        watcher.cancel()
+
+    asyncio.run(main())
+    assert peak == 2
+    assert pool.in_flight == 0
+    assert pool.stats()["tasks"]["slow"]["avg_wait_ms"] > 0
+
+def test_timeouts_and_errors_are_counted():
+    pool = ParseExecutor(workers=1, queue_size=0, timeout=0.05)
+
+    def fail():
+        raise ValueError("bad feed")
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run("slow", slow, 0.2)
+        with pytest.raises(ValueError):
+            await pool.run("fail", fail)
+
+    asyncio.run(main())
+    tasks = pool.stats()["tasks"]
+    assert tasks["slow"]["timeouts"] == 1 and tasks["fail"]["errors"] == 1
@@ -0,0 +1,62 @@
+import time
+from datetime import datetime, timedelta, timezone
+import pytest
+from utils.content_pipeline import ContentPipeline
+from utils.ingestion import Ingestor
+from utils.leader import LeaderLock
+from utils.persistence import SnapshotDB
+
+def article(title: str, link: str, hours_ago: float = 2) -> dict:
+    published = (datetime.now(timezone.utc) - timedelta(hours=hours_ago)).isoformat()
+    return {"title": title, "description": "", "link": link, "published_at": published,
+            "source": "Example", "author": "", "image": None}
+
+@pytest.fixture
+def db(tmp_path):
+    db = SnapshotDB(str(tmp_path / "news.db"))
+    yield db
+    db.close()
+
+def make_ingestor(db: SnapshotDB, tmp_path) -> Ingestor:
+    return Ingestor(db=db, leader=LeaderLock(str(tmp_path / "ingest.lock")), content=ContentPipeline())
+
+def test_restart_serves_the_last_snapshot(db, tmp_path):
+    first = make_ingestor(db, tmp_path)
+    first.store.upsert([article("Meta releases Llama 3", "https://a.example/1"),
+                        article("Robotics startup raises funding", "https://a.example/2", hours_ago=30)])
+    first.publish()
+
+    restarted = make_ingestor(db, tmp_path)
+    rows = restarted.load_persisted()
+    assert len(rows) == 2
+    snapshot = restarted.snapshot
+    assert snapshot.version == first.snapshot.version
+    assert snapshot.articles == first.snapshot.articles
+    # Same bytes, so clients holding an ETag from before the restart still get 304s
+    for name, body in first.snapshot.bodies.items():
+        assert snapshot.bodies[name].raw == body.raw
+
+def test_snapshots_are_written_incrementally(db, tmp_path):
+    ingestor = make_ingestor(db, tmp_path)
+    ingestor.store.max_articles = 1
+    ingestor.store.upsert([article("Meta releases Llama 3", "https://a.example/1", hours_ago=5)])
+    ingestor.publish()
+    ingestor.store.upsert([article("Robotics startup raises funding", "https://a.example/2", hours_ago=1)])
+    ingestor.publish()
+    assert [a.title for _, a in db.load_articles()] == ["Robotics startup raises funding"]
+    assert db.load_meta("snapshot")["version"] == 2
+
+def test_content_expires_after_max_age(db, monkeypatch):
+    db.save_content("https://a.example/1", {"content": "Text"})
+    assert db.load_content("https://a.example/1", max_age_seconds=60) == {"content": "Text"}
+    now = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: now)
+    assert db.load_content("https://a.example/1", max_age_seconds=60) is None
+    db.prune_content(max_age_seconds=60)
+    assert db.load_content("https://a.example/1", max_age_seconds=1e9) is None
+
+def test_disabled_without_a_path():
+    db = SnapshotDB("")
+    db.save_meta("snapshot", {"version": 3})
+    assert db.load_meta("snapshot", {}) == {}
+    assert db.load_articles() == []
@@ -0,0 +1,28 @@
+from utils.related import RelatedIndex
+
+def test_related_articles_share_rare_terms():
+    index = RelatedIndex(budget_ms=float("inf"))
+    index.add("a", "Anthropic ships Claude update", "Claude gains tool use")
+    index.add("b", "Claude update rolls out to Anthropic users", "")
+    index.add("c", "Robotics startup raises funding", "Warehouse robotics")
+    index.add("d", "Robotics funding round closes", "")
+    index.update()
+    assert index.related("a") == ["b"]
+    assert index.related("c") == ["d"]
+
+def test_terms_above_max_df_are_not_used():
+    index = RelatedIndex(max_df=3, budget_ms=float("inf"))
+    for i in range(4):
+        index.add(i, f"Common headline words story{i}", "")
+    index.update()
+    # "common", "headline" and "words" are in all four, so nothing links them
+    assert index.graph() == {}
+
+def test_removed_articles_leave_neighbour_lists():
+    index = RelatedIndex(budget_ms=float("inf"))
+    index.add("a", "Anthropic ships Claude update", "")
+    index.add("b", "Claude update from Anthropic", "")
+    index.update()
+    index.remove("b")
+    index.update()
+    assert index.related("a") == []
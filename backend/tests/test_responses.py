@@ -0,0 +1,21 @@
+import pytest
+from fastapi import HTTPException
+from utils.responses import extend_json, loads, parse_since, prepare_json
+
+def test_parse_since_accepts_epoch_and_iso():
+    assert parse_since("1700000000") == 1700000000.0
+    assert parse_since("2023-11-14T22:13:20Z") == 1700000000.0
+    assert parse_since("2023-11-14T22:13:20") == 1700000000.0
+
+@pytest.mark.parametrize("since", ["nan", "NaN", "inf", "-inf", "Infinity", "yesterday"])
+def test_parse_since_rejects_invalid(since):
+    with pytest.raises(HTTPException) as raised:
+        parse_since(since)
+    assert raised.value.status_code == 400
+
+def test_extend_json_puts_fields_first():
+    body = prepare_json({"articles": [{"id": "a"}], "count": 1})
+    extended = extend_json(body, version=7, full=True)
+    assert loads(extended.raw) == {"version": 7, "full": True, "articles": [{"id": "a"}], "count": 1}
+    assert extended.raw.startswith(b'{"version":7,"full":true,')
+    assert extend_json(body) is body
@@ -0,0 +1,52 @@
+from utils.search_index import SearchIndex, parse_query
+
+def make_index() -> SearchIndex:
+    index = SearchIndex({"title": 3.0, "source": 1.5, "description": 1.0})
+    index.add("a", {"title": "OpenAI releases GPT-5", "source": "The Verge", "description": "A new model"})
+    index.add("b", {"title": "Google launches Gemini", "source": "Reuters", "description": "Rivals GPT-5 from OpenAI"})
+    index.add("c", {"title": "Robotics startup raises funding", "source": "TechCrunch", "description": ""})
+    return index
+
+def test_title_matches_rank_first():
+    total, ids = make_index().search("openai ")
+    assert total == 2
+    assert ids == ["a", "b"]
+
+def test_and_or_and_phrases():
+    index = make_index()
+    assert index.search("openai gemini ")[1] == ["b"]
+    assert sorted(index.search("gemini OR robotics ")[1]) == ["b", "c"]
+    assert index.search('"releases gpt" ')[1] == ["a"]
+    assert index.search('"gpt releases" ')[0] == 0
+
+def test_last_word_is_a_prefix():
+    index = make_index()
+    assert index.search("robot")[1] == ["c"]
+    assert index.search("robot ")[0] == 0
+
+def test_paging():
+    index = make_index()
+    assert index.search("openai ", limit=1, offset=1) == (2, ["b"])
+
+def test_remove_and_replace():
+    index = make_index()
+    index.search("openai ")
+    index.remove("a")
+    assert index.search("openai ") == (1, ["b"])
+    index.add("b", {"title": "Gemini update", "source": "Reuters", "description": ""})
+    assert index.search("openai ") == (0, [])
+    assert len(index) == 2
+    assert "openai" not in index.vocab
+
+def test_empty_results_are_not_cached_across_adds():
+    index = make_index()
+    # Unknown terms, so no per-term scores were cached, only their empty rankings
+    assert index.search('"fusion"') == (0, [])
+    assert index.search("fusion ") == (0, [])
+    index.add("d", {"title": "Fusion startup raises funding", "source": "Reuters", "description": ""})
+    assert index.search('"fusion"') == (1, ["d"])
+    assert index.search("fusion ") == (1, ["d"])
+
+def test_parse_query_groups():
+    groups = parse_query('a b OR c "d e"')
+    assert [[clause.tokens for clause in group] for group in groups] == [[["a"]], [["b"], ["c"]], [["d", "e"]]]
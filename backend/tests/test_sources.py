@@ -0,0 +1,87 @@
+import asyncio
+import json
+import time
+from utils import sources
+from utils.fanout import FanOut
+from utils.persistence import SnapshotDB
+from utils.sources import SourceConfig, SourceScheduler, load_sources
+
+def config(name: str, interval: float = 60, priority: int = 0, concurrency_class: str = "feeds") -> SourceConfig:
+    return SourceConfig(name=name, kind="rss", url=f"https://{name}.example/feed", interval=interval,
+                        priority=priority, concurrency_class=concurrency_class, hedge=False, timeout=5)
+
+def test_load_sources_applies_defaults_and_skips_invalid(tmp_path):
+    path = tmp_path / "sources.json"
+    path.write_text(json.dumps({
+        "max_concurrency": 4,
+        "classes": {"feeds": {"concurrency": 3}},
+        "defaults": {"interval": 120, "class": "feeds"},
+        "sources": [
+            {"name": "a", "kind": "rss", "url": "https://a.example/feed", "priority": 5},
+            {"name": "a", "kind": "rss", "url": "https://dupe.example/feed"},
+            {"name": "b", "kind": "rss"},
+            {"name": "c", "kind": "unknown", "url": "https://c.example"},
+            {"name": "d", "kind": "rss", "url": "https://d.example/feed", "enabled": False},
+            {"name": "e", "kind": "newsapi", "class": "apis", "interval": 900},
+        ],
+    }))
+    configured, classes, max_concurrency = load_sources(str(path))
+    assert [s.name for s in configured] == ["a", "e"]
+    assert configured[0].interval == 120 and configured[0].priority == 5
+    assert classes == {"feeds": 3, "apis": 1}
+    assert max_concurrency == 4
+
+def test_load_state_resumes_from_last_success(tmp_path):
+    db = SnapshotDB(str(tmp_path / "news.db"))
+    db.save_meta("feed_a", {"last_success": 1000.0})
+    scheduler = SourceScheduler([config("a", interval=300), config("b")], {"feeds": 1}, 1, lambda *_: None, db=db)
+    scheduler.load_state()
+    assert scheduler.states["a"].next_due == 1300.0
+    assert scheduler.states["b"].next_due >= time.time() - 1
+    db.close()
+
+def test_polls_respect_class_limits_and_report_results(tmp_path, monkeypatch):
+    running = 0
+    peak = 0
+    calls = []
+
+    def fetcher(source: SourceConfig):
+        async def fetch():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            calls.append(source.name)
+            await asyncio.sleep(0.02)
+            running -= 1
+            if source.name == "broken":
+                raise RuntimeError("upstream down")
+            return [{"title": source.name}] if source.name != "empty" else []
+        return fetch
+
+    monkeypatch.setitem(sources.FETCHERS, "rss", fetcher)
+    configured = [config(f"feed{i}", priority=i) for i in range(6)]
+    configured += [config("empty"), config("broken")]
+    results = []
+    db = SnapshotDB(str(tmp_path / "news.db"))
+    scheduler = SourceScheduler(configured, {"feeds": 2}, 8, lambda source, items: results.append(source.name),
+                                db=db, executor=FanOut())
+    monkeypatch.setattr(sources, "STARTUP_STAGGER", 0.0)
+
+    async def run_for(seconds: float) -> None:
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(seconds)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    scheduler.load_state()
+    asyncio.run(run_for(0.3))
+    db.close()
+
+    assert peak == 2
+    assert sorted(calls) == sorted(s.name for s in configured)
+    # Higher priorities start first; empty and failed polls don't produce results
+    assert calls[:2] == ["feed5", "feed4"]
+    assert sorted(results) == sorted(f"feed{i}" for i in range(6))
+    assert scheduler.states["broken"].failures == 1
+    assert scheduler.states["empty"].last_success is not None
+    assert scheduler.summary()["failing"] == 1
@@ -0,0 +1,348 @@
+import bisect
+import hashlib
+import time
+from typing import List, Dict, Any, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from utils.clean_data import normalize_title, keyword_flags, TRENDING_WINDOW_HOURS
+from utils.dedup import DuplicateIndex, Prepared
+from utils.models import Article, to_epoch
+from utils.paging import SortedView, SortKey, MAX_ID
+
+# Query parameters that only track the click and don't identify the article
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "oc", "ref", "ref_src", "cmpid", "ncid"}
+
+def canonical_url(link: str) -> str:
+    """Normalize an article link so the same story always maps to the same key."""
+    parts = urlsplit(str(link).strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("", host, path, urlencode(sorted(query)), "")).lstrip("/")
+
+def short_hash(key: str) -> str:
+    """Stable 12-character ID derived from a canonical URL."""
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=6).hexdigest()
+
+def _key(article: Dict[str, Any]) -> str:
+    if article.get("link"):
+        return canonical_url(article["link"])
+    return f"title:{normalize_title(article.get('title', ''))}"
+
+def _published(article: Dict[str, Any]) -> int:
+    if isinstance(article, Article):
+        return article.published
+    return to_epoch(article.get("published_at", ""))
+
+def _fingerprint(article: Dict[str, Any], published: int) -> int:
+    # A hash rather than the fields themselves, so the raw strings aren't kept alive
+    return hash((article.get("title"), article.get("description"), published,
+                 article.get("source"), article.get("author"), article.get("image")))
+
+class StoredArticle:
+    """An article plus the derived fields the store keeps so they are computed only once."""
+    __slots__ = ("key", "id", "article", "viral", "fingerprint", "duplicates", "seen")
+
+    def __init__(self, key: str, article: Article, viral: bool, fingerprint: int):
+        self.key = key
+        self.id = article.id
+        # Public article served by the API. Replaced, never mutated, once it has been published.
+        self.article = article
+        self.viral = viral
+        self.fingerprint = fingerprint
+        # Canonical URL -> (link, source) of syndicated copies grouped under this article
+        self.duplicates: Dict[str, Tuple[str, str]] = {}
+        # Last time a feed listed this article (or one of its copies); retention counts from here too
+        self.seen = time.time()
+
+    @property
+    def published_ts(self) -> int:
+        return self.article.published
+
+    @property
+    def order_key(self) -> SortKey:
+        return (-self.article.published, self.id)
+
+class ArticleStore:
+    """Articles keyed by canonical URL, with date and flag views maintained on every upsert.
+
+    A refresh only pays for the articles that are new or changed; unchanged ones are
+    recognised by their fingerprint and skipped. Articles are kept while they are within
+    the retention window or still listed by a feed, up to max_articles newest.
+    """
+
+    def __init__(self, max_articles: int = 2000, retention_days: float = 7):
+        self.max_articles = max_articles
+        self.retention_seconds = retention_days * 86400
+        self.entries: Dict[str, StoredArticle] = {}
+        # Public article ID (short hash of the canonical URL) -> entry
+        self.by_id: Dict[str, StoredArticle] = {}
+        # (-published_ts, id), i.e. newest first
+        self._order: List[SortKey] = []
+        self._flag_order: Dict[str, List[SortKey]] = {"is_trending": [], "is_important": []}
+        # Canonical URL of a syndicated copy -> key of the article it was grouped under
+        self._duplicates: Dict[str, str] = {}
+        # Article ID a syndicated copy would have had -> its canonical URL, so old links still resolve
+        self._duplicate_ids: Dict[str, str] = {}
+        self._dedup = DuplicateIndex()
+        # Keys whose public article was inserted/replaced, and keys removed, since the last drain_changes()
+        self._changed: Set[str] = set()
+        self._removed: Set[str] = set()
+        # Keys first inserted since the last drain_changes(); removing one again leaves no trace
+        self._new: Set[str] = set()
+        self._trending_cutoff = time.time() - TRENDING_WINDOW_HOURS * 3600
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def upsert(self, articles: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert new articles, update changed ones and skip the rest. Returns counts."""
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "duplicates": 0, "skipped": 0, "removed": 0}
+        now = time.time()
+        for article in articles:
+            if not article.get("title"):
+                continue
+            key = _key(article)
+            published = _published(article)
+            fingerprint = _fingerprint(article, published)
+
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry.seen = now
+                if entry.fingerprint == fingerprint:
+                    stats["unchanged"] += 1
+                    continue
+                self._remove(key)
+                self._insert(key, article, published, fingerprint, entry.duplicates)
+                stats["updated"] += 1
+                continue
+
+            if key in self._duplicates:
+                self.entries[self._duplicates[key]].seen = now
+                stats["duplicates"] += 1
+                continue
+            prepared = self._dedup.prepare(article["title"])
+            duplicate_of = self._dedup.match(article["title"], prepared)
+            if duplicate_of is not None:
+                self._add_duplicate(self.entries[duplicate_of], key, article)
+                self.entries[duplicate_of].seen = now
+                stats["duplicates"] += 1
+                continue
+            if self._below_capacity_floor(key, published):
+                # It would be evicted again straight away, which would churn the change log every poll
+                stats["skipped"] += 1
+                continue
+
+            self._insert(key, article, published, fingerprint, prepared=prepared)
+            stats["added"] += 1
+
+        stats["removed"] = self._evict()
+        return stats
+
+    def restore(self, articles: List[Article]) -> int:
+        """Hold these published articles exactly as they are, e.g. the leader's persisted rows.
+
+        Nothing is recomputed, so a follower serves what the leader published. Dedup and
+        fingerprints are still filled in for when this worker takes over. Returns how many changed.
+        """
+        changed = 0
+        for article in articles:
+            key = _key(article)
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry.article == article:
+                    continue
+                self._remove(key)
+            viral, _ = keyword_flags(article)
+            entry = StoredArticle(key, article, viral, _fingerprint(article, article.published))
+            self._add(entry, {canonical_url(link): (link, source) for link, source in article.copies})
+            changed += 1
+        return changed
+
+    def views(self, advance_window: bool = True) -> Tuple[SortedView, SortedView, SortedView]:
+        """Return (all, trending, important), newest first.
+
+        Articles that aged out of the trending window are re-flagged first unless advance_window is False.
+        """
+        if advance_window:
+            self._advance_trending_window()
+        articles = self._view(self._order)
+        trending = self._view(self._flag_order["is_trending"])
+        important = self._view(self._flag_order["is_important"])
+
+        # If no trending articles found, use the most recent 10 articles as trending
+        if len(trending.items) == 0 and len(articles.items) > 0:
+            trending = SortedView(tuple(a.replace(is_trending=True) for a in articles.items[:10]), articles.keys[:10])
+
+        return articles, trending, important
+
+    def _view(self, order: List[SortKey]) -> SortedView:
+        by_id = self.by_id
+        return SortedView(tuple(by_id[item_id].article for _, item_id in order), tuple(order))
+
+    def _insert(self, key: str, article: Dict[str, Any], published: int, fingerprint: int,
+                duplicates: Optional[Dict[str, Tuple[str, str]]] = None, prepared: Optional[Prepared] = None) -> None:
+        viral, important = keyword_flags(article)
+        if duplicates is None and isinstance(article, Article):
+            # Restored from the database: regroup the copies it was published with
+            duplicates = {canonical_url(link): (link, source) for link, source in article.copies}
+        duplicates = duplicates or {}
+
+        entry = StoredArticle(key, Article(
+            id=short_hash(key),
+            title=article.get("title", ""),
+            description=article.get("description", ""),
+            link=article.get("link", ""),
+            published=published,
+            source=article.get("source", ""),
+            author=article.get("author", ""),
+            image=article.get("image"),
+            is_important=important,
+            cluster_size=1 + len(duplicates),
+            copies=tuple(duplicates.values()),
+        ), viral, fingerprint)
+        self._add(entry, duplicates, prepared)
+        self._refresh_trending(entry)
+
+    def _add(self, entry: StoredArticle, duplicates: Dict[str, Tuple[str, str]],
+             prepared: Optional[Prepared] = None) -> None:
+        key = entry.key
+        entry.duplicates = duplicates
+        for copy_key in duplicates:
+            self._duplicates[copy_key] = key
+            self._duplicate_ids[short_hash(copy_key)] = copy_key
+        self.entries[key] = entry
+        self.by_id[entry.id] = entry
+        self._changed.add(key)
+        if key in self._removed:
+            self._removed.discard(key)
+        else:
+            self._new.add(key)
+        self._dedup.add(key, entry.article.title, prepared)
+        bisect.insort(self._order, entry.order_key)
+        for flag, order in self._flag_order.items():
+            if getattr(entry.article, flag):
+                bisect.insort(order, entry.order_key)
+
+    def _add_duplicate(self, entry: StoredArticle, key: str, article: Dict[str, Any]) -> None:
+        self._duplicates[key] = entry.key
+        self._duplicate_ids[short_hash(key)] = key
+        entry.duplicates[key] = (article.get("link", ""), article.get("source", ""))
+        entry.article = entry.article.replace(cluster_size=1 + len(entry.duplicates),
+                                              copies=tuple(entry.duplicates.values()))
+        self._changed.add(entry.key)
+        # Being covered by more than one source makes a story trending
+        self._refresh_trending(entry)
+
+    def _remove(self, key: str) -> None:
+        entry = self.entries.pop(key)
+        self.by_id.pop(entry.id, None)
+        self._dedup.remove(key)
+        self._changed.discard(key)
+        if key in self._new:
+            self._new.discard(key)
+        else:
+            self._removed.add(key)
+        self._discard(self._order, entry.order_key)
+        for flag, order in self._flag_order.items():
+            if getattr(entry.article, flag):
+                self._discard(order, entry.order_key)
+
+    @staticmethod
+    def _discard(order: List[SortKey], item: SortKey) -> None:
+        index = bisect.bisect_left(order, item)
+        if index < len(order) and order[index] == item:
+            del order[index]
+
+    def _is_trending(self, entry: StoredArticle) -> bool:
+        return (
+            entry.viral
+            or entry.published_ts >= self._trending_cutoff
+            or len(entry.duplicates) > 0
+        )
+
+    def _refresh_trending(self, entry: StoredArticle) -> None:
+        trending = self._is_trending(entry)
+        if trending == entry.article.is_trending:
+            return
+        entry.article = entry.article.replace(is_trending=trending)
+        self._changed.add(entry.key)
+        if trending:
+            bisect.insort(self._flag_order["is_trending"], entry.order_key)
+        else:
+            self._discard(self._flag_order["is_trending"], entry.order_key)
+
+    def _advance_trending_window(self) -> None:
+        """Re-check only the articles that aged out of the trending window since the last call."""
+        cutoff = time.time() - TRENDING_WINDOW_HOURS * 3600
+        if cutoff <= self._trending_cutoff:
+            return
+        start = bisect.bisect_right(self._order, (-cutoff, MAX_ID))
+        end = bisect.bisect_right(self._order, (-self._trending_cutoff, MAX_ID))
+        self._trending_cutoff = cutoff
+        for _, item_id in self._order[start:end]:
+            self._refresh_trending(self.by_id[item_id])
+
+    def _below_capacity_floor(self, key: str, published: int) -> bool:
+        """Whether a new article would be the oldest of a full store, i.e. the next one evicted."""
+        return (len(self._order) >= self.max_articles
+                and (not self._order or (-published, short_hash(key)) > self._order[-1]))
+
+    def _evict(self) -> int:
+        """Drop the oldest articles beyond the size cap, and those past retention no feed lists anymore."""
+        removed = 0
+        while len(self._order) > self.max_articles:
+            self._remove(self.by_id[self._order[-1][1]].key)
+            removed += 1
+        oldest_allowed = time.time() - self.retention_seconds
+        start = bisect.bisect_right(self._order, (-oldest_allowed, MAX_ID))
+        for _, item_id in self._order[start:]:
+            entry = self.by_id[item_id]
+            if entry.seen < oldest_allowed:
+                self._remove(entry.key)
+                removed += 1
+        if removed:
+            self._prune_duplicates()
+        return removed
+
+    def retain(self, ids: Set[str]) -> int:
+        """Remove every article whose ID isn't in ids. Returns how many were removed."""
+        stale = [entry.key for entry in self.entries.values() if entry.id not in ids]
+        for key in stale:
+            self._remove(key)
+        if stale:
+            self._prune_duplicates()
+        return len(stale)
+
+    def _prune_duplicates(self) -> None:
+        self._duplicates = {k: v for k, v in self._duplicates.items() if v in self.entries}
+        self._duplicate_ids = {k: v for k, v in self._duplicate_ids.items() if v in self._duplicates}
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether anything was inserted, replaced or removed since the last drain_changes()."""
+        return bool(self._changed or self._removed)
+
+    def drain_changes(self) -> Tuple[Set[str], Set[str]]:
+        """Return (inserted or updated keys, removed keys) since the last call."""
+        changed, removed = self._changed, self._removed
+        self._changed, self._removed, self._new = set(), set(), set()
+        return changed, removed
+
+    def get(self, key: str) -> Optional[StoredArticle]:
+        """Entry by canonical URL; a syndicated copy resolves to the article it was grouped under."""
+        entry = self.entries.get(key)
+        if entry is None and key in self._duplicates:
+            entry = self.entries.get(self._duplicates[key])
+        return entry
+
+    def get_by_id(self, article_id: str) -> Optional[StoredArticle]:
+        """Entry by public ID, including the ID a syndicated copy would have had."""
+        entry = self.by_id.get(article_id)
+        if entry is None and article_id in self._duplicate_ids:
+            entry = self.get(self._duplicate_ids[article_id])
+        return entry
@@ -1,34 +1,158 @@
-from datetime import datetime, timedelta
-from typing import Any, Optional
+import asyncio
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from utils.cache_backends import CacheBackend, make_backend
+
+def approx_size(value: Any, _depth: int = 0) -> int:
+    """Rough deep size of a JSON-like value in bytes."""
+    size = sys.getsizeof(value)
+    if _depth >= 6:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += approx_size(k, _depth + 1) + approx_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += approx_size(item, _depth + 1)
+    return size
 
 class Cache:
-    def __init__(self, ttl_minutes: int = 12):
-        self.cache: dict[str, tuple[Any, datetime]] = {}
-        self.ttl = timedelta(minutes=ttl_minutes)
-    
+    """LRU cache for one namespace, bounded by entry count and an approximate byte budget.
+
+    Entries live in a pluggable backend (see utils/cache_backends.py): per process in
+    memory, or shared between workers. Single-flight computation is per process.
+    """
+
+    def __init__(self, name: str = "default", ttl_minutes: int = 12, stale_minutes: int = 12,
+                 max_entries: int = 1000, max_bytes: int = 16 * 1024 * 1024,
+                 backend: Optional[CacheBackend] = None):
+        self.name = name
+        # Not `backend or ...`: an empty backend has len() 0 and would be replaced
+        self.backend = backend if backend is not None else make_backend(name, approx_size)
+        self.ttl = ttl_minutes * 60
+        # How long an expired value may still be served while it is being refreshed
+        self.stale_ttl = stale_minutes * 60
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.metrics = {
+            "hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0,
+            "refreshes": 0, "errors": 0, "evictions": 0, "expired": 0,
+        }
+
     def get(self, key: str) -> Optional[Any]:
-        if key not in self.cache:
+        entry = self.backend.get(key)
+        if entry is None:
+            self.metrics["misses"] += 1
             return None
-        
-        value, expiry = self.cache[key]
-        if datetime.now() > expiry:
-            del self.cache[key]
+
+        value, expiry = entry
+        now = time.time()
+        if now > expiry:
+            # Keep it around for stale-while-revalidate until the grace period ends
+            if now > expiry + self.stale_ttl:
+                self.backend.delete(key)
+                self.metrics["expired"] += 1
+            self.metrics["misses"] += 1
             return None
-        
+
+        self.backend.touch(key)
+        self.metrics["hits"] += 1
         return value
-    
+
     def set(self, key: str, value: Any) -> None:
-        expiry = datetime.now() + self.ttl
-        self.cache[key] = (value, expiry)
-    
+        self.metrics["evictions"] += self.backend.set(key, value, time.time() + self.ttl, self.max_entries, self.max_bytes)
+
+    async def get_or_compute(self, key: str, coro_factory: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        """Return the cached value or compute it once, however many callers miss at the same time.
+
+        Expired values inside the stale window are returned immediately while a single
+        background refresh runs. A computed value of None is returned but not cached.
+        """
+        entry = self.backend.get(key)
+        if entry is not None:
+            value, expiry = entry
+            now = time.time()
+            if now <= expiry:
+                self.backend.touch(key)
+                self.metrics["hits"] += 1
+                return value
+            if now <= expiry + self.stale_ttl:
+                self.metrics["stale_hits"] += 1
+                if key not in self._inflight:
+                    self.metrics["refreshes"] += 1
+                    self._compute(key, coro_factory)
+                return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.metrics["coalesced"] += 1
+        else:
+            self.metrics["misses"] += 1
+            inflight = self._compute(key, coro_factory)
+        # Shield so a cancelled caller doesn't cancel the computation shared with the others
+        return await asyncio.shield(inflight)
+
+    def _compute(self, key: str, coro_factory: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        async def run():
+            try:
+                value = await coro_factory()
+                if value is not None:
+                    self.set(key, value)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.ensure_future(run())
+        task.add_done_callback(self._on_done)
+        self._inflight[key] = task
+        return task
+
+    def _on_done(self, task: asyncio.Future) -> None:
+        # Retrieve the exception so background refresh failures are counted, not warned about
+        if not task.cancelled() and task.exception() is not None:
+            self.metrics["errors"] += 1
+            print(f"Error computing {self.name} cache value: {task.exception()}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "bytes": self.backend.size_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "inflight": len(self._inflight),
+        }
+
     def clear(self) -> None:
-        self.cache.clear()
-    
-    def cleanup_expired(self) -> None:
-        now = datetime.now()
-        expired_keys = [k for k, (_, expiry) in self.cache.items() if now > expiry]
-        for key in expired_keys:
-            del self.cache[key]
-
-# Global cache instance
-cache = Cache(ttl_minutes=12)
+        self.backend.clear()
+
+    def cleanup_expired(self) -> int:
+        expired = self.backend.purge(time.time() - self.stale_ttl)
+        self.metrics["expired"] += expired
+        return expired
+
+# Cache namespaces
+# Pages of the news lists, one entry per (snapshot, query) pair
+news_cache = Cache("news", ttl_minutes=12, max_entries=512, max_bytes=16 * 1024 * 1024)
+search_cache = Cache("search", ttl_minutes=12, max_entries=2000, max_bytes=32 * 1024 * 1024)
+# In-memory front for the content pipeline, whose durable copy outlives this TTL
+content_cache = Cache("content", ttl_minutes=24 * 60, max_entries=500, max_bytes=64 * 1024 * 1024)
+videos_cache = Cache("videos", ttl_minutes=12, max_entries=64, max_bytes=8 * 1024 * 1024)
+
+CACHES: Dict[str, Cache] = {c.name: c for c in (news_cache, search_cache, content_cache, videos_cache)}
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: c.stats() for name, c in CACHES.items()}
+
+async def sweep_expired(interval_seconds: float = 60.0) -> None:
+    """Periodically drop entries past their stale window in every namespace."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        for c in CACHES.values():
+            try:
+                c.cleanup_expired()
+            except Exception as e:
+                print(f"Error sweeping {c.name} cache: {e}")
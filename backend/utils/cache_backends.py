@@ -0,0 +1,232 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# "memory" keeps entries per process; "sqlite" shares them between uvicorn workers
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", str(Path(__file__).resolve().parent.parent / "data" / "cache.db"))
+
+class CacheBackend:
+    """Storage behind a Cache namespace. Expiry times are epoch seconds."""
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, expiry) or None."""
+        raise NotImplementedError
+
+    def touch(self, key: str) -> None:
+        """Mark a key as recently used."""
+
+    def set(self, key: str, value: Any, expiry: float, max_entries: int, max_bytes: int) -> int:
+        """Store a value, then evict least recently used entries over the limits. Returns evictions."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def purge(self, before: float) -> int:
+        """Drop entries that expired before the given time. Returns how many."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def size_bytes(self) -> int:
+        raise NotImplementedError
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU: an OrderedDict of key -> (value, expiry, approximate size)."""
+
+    def __init__(self, sizer):
+        self.sizer = sizer
+        self.entries: OrderedDict[str, Tuple[Any, float, int]] = OrderedDict()
+        self._size = 0
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        entry = self.entries.get(key)
+        return None if entry is None else (entry[0], entry[1])
+
+    def touch(self, key: str) -> None:
+        if key in self.entries:
+            self.entries.move_to_end(key)
+
+    def set(self, key: str, value: Any, expiry: float, max_entries: int, max_bytes: int) -> int:
+        size = self.sizer(value)
+        if size > max_bytes:
+            # Never let a single value flush the whole namespace
+            return 0
+        self.delete(key)
+        self.entries[key] = (value, expiry, size)
+        self._size += size
+
+        evicted = 0
+        while len(self.entries) > max_entries or self._size > max_bytes:
+            self.delete(next(iter(self.entries)))
+            evicted += 1
+        return evicted
+
+    def delete(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[2]
+
+    def purge(self, before: float) -> int:
+        expired = [k for k, (_, expiry, _) in self.entries.items() if expiry < before]
+        for key in expired:
+            self.delete(key)
+        return len(expired)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+_connections: Dict[str, sqlite3.Connection] = {}
+_connections_lock = threading.Lock()
+
+def _shared_connection(path: str) -> sqlite3.Connection:
+    # One connection per process and file, shared by every namespace
+    with _connections_lock:
+        conn = _connections.get(path)
+        if conn is None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    expiry REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    used REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_entries_used ON cache_entries (namespace, used)")
+            _connections[path] = conn
+        return conn
+
+class SQLiteBackend(CacheBackend):
+    """Cross-process backend: a WAL-mode SQLite table every worker on the host reads and writes.
+
+    Values are pickled. Recency is refreshed on reads at most once per touch_interval
+    per key, so hot keys don't turn every read into a write.
+    """
+
+    def __init__(self, namespace: str, path: str = CACHE_DB_PATH, touch_interval: float = 30.0):
+        self.namespace = namespace
+        self.path = path
+        self.touch_interval = touch_interval
+        self._touched: Dict[str, float] = {}
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return _shared_connection(self.path)
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        try:
+            row = self.conn.execute(
+                "SELECT value, expiry FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+            return pickle.loads(row[0]), row[1]
+        except Exception as e:
+            # A busy database or a value pickled by an older deploy is just a miss
+            print(f"Error reading {self.namespace} cache entry: {e}")
+            return None
+
+    def touch(self, key: str) -> None:
+        now = time.time()
+        if now - self._touched.get(key, 0.0) < self.touch_interval:
+            return
+        if len(self._touched) > 10_000:
+            self._touched.clear()
+        self._touched[key] = now
+        try:
+            self.conn.execute("UPDATE cache_entries SET used = ? WHERE namespace = ? AND key = ?",
+                              (now, self.namespace, key))
+        except sqlite3.Error as e:
+            print(f"Error touching {self.namespace} cache entry: {e}")
+
+    def set(self, key: str, value: Any, expiry: float, max_entries: int, max_bytes: int) -> int:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > max_bytes:
+            return 0
+        conn = self.conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            print(f"Error writing {self.namespace} cache entry: {e}")
+            return 0
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expiry, size, used) VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, blob, expiry, len(blob), time.time()),
+            )
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()
+            evict = []
+            if count > max_entries or total > max_bytes:
+                for old_key, size in conn.execute(
+                    "SELECT key, size FROM cache_entries WHERE namespace = ? ORDER BY used", (self.namespace,)
+                ):
+                    if count <= max_entries and total <= max_bytes:
+                        break
+                    evict.append((self.namespace, old_key))
+                    count -= 1
+                    total -= size
+                conn.executemany("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", evict)
+            conn.execute("COMMIT")
+        except Exception as e:
+            conn.execute("ROLLBACK")
+            print(f"Error writing {self.namespace} cache entry: {e}")
+            return 0
+        return len(evict)
+
+    def delete(self, key: str) -> None:
+        self.conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, key))
+
+    def purge(self, before: float) -> int:
+        return self.conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expiry < ?", (self.namespace, before)
+        ).rowcount
+
+    def clear(self) -> None:
+        self.conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+    def __len__(self) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+
+    @property
+    def size_bytes(self) -> int:
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+
+def make_backend(namespace: str, sizer, kind: str = CACHE_BACKEND) -> CacheBackend:
+    if kind == "sqlite":
+        return SQLiteBackend(namespace)
+    if kind != "memory":
+        print(f"Unknown CACHE_BACKEND {kind!r}, using memory")
+    return MemoryBackend(sizer)
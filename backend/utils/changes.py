@@ -0,0 +1,116 @@
+import asyncio
+import os
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
+from utils.responses import dumps
+
+# Snapshots with article changes kept for resuming clients
+CHANGELOG_VERSIONS = int(os.getenv("CHANGELOG_VERSIONS", "256"))
+# Idle stream subscribers are woken this often to send a keep-alive
+HEARTBEAT_SECONDS = 15.0
+# Serialized events kept for reuse; subscribers that saw the same version share one
+FRAME_CACHE_SIZE = 64
+
+class Change(NamedTuple):
+    """Articles added or updated, and IDs removed, between prev_version and version."""
+    prev_version: int
+    version: int
+    upserts: Tuple[Dict[str, Any], ...]
+    removed: Tuple[str, ...]
+
+class ChangeLog:
+    """Bounded ring buffer of per-snapshot article changes, with wake-ups for subscribers.
+
+    Snapshot versions are the sequence numbers: a client that has seen version N asks for
+    everything after N. Snapshots that changed no article only advance the latest version,
+    so they don't use up the buffer.
+    """
+
+    def __init__(self, max_versions: int = CHANGELOG_VERSIONS):
+        self.entries: Deque[Change] = deque(maxlen=max_versions)
+        self.latest = 0
+        self._frames: OrderedDict[Tuple[int, int], bytes] = OrderedDict()
+        self._wakeup: Optional[asyncio.Event] = None
+        self.subscribers = 0
+
+    def reset(self, version: int) -> None:
+        """Start over from a snapshot whose history isn't known, e.g. one restored from disk."""
+        self.entries.clear()
+        self._frames.clear()
+        self.latest = version
+
+    def record(self, version: int, upserts: List[Dict[str, Any]], removed: List[str]) -> None:
+        if version <= self.latest:
+            return
+        if upserts or removed:
+            self.entries.append(Change(self.latest, version, tuple(upserts), tuple(removed)))
+        self.latest = version
+        self._wake()
+
+    @property
+    def floor(self) -> int:
+        """Oldest version a client can catch up from."""
+        return self.entries[0].prev_version if self.entries else self.latest
+
+    def since(self, version: int) -> Optional[Change]:
+        """Changes after version merged into one, or None when they can't be reconstructed.
+
+        A version ahead of the log is treated like one too old: it comes from before a
+        restart without persistence, or from a worker that is ahead of this one.
+        """
+        if version < self.floor or version > self.latest:
+            return None
+        upserts: Dict[str, Dict[str, Any]] = {}
+        removed: Dict[str, None] = {}
+        for change in self.entries:
+            if change.version <= version:
+                continue
+            for article_id in change.removed:
+                upserts.pop(article_id, None)
+                removed[article_id] = None
+            for article in change.upserts:
+                removed.pop(article["id"], None)
+                upserts[article["id"]] = article
+        return Change(version, self.latest, tuple(upserts.values()), tuple(removed))
+
+    def event(self, version: int) -> Optional[bytes]:
+        """Server-sent event with the changes after version; None if there are none or too old.
+
+        Events are cached by (from, to) version, so a change is serialized once for all the
+        subscribers that were up to date when it happened.
+        """
+        key = (version, self.latest)
+        frame = self._frames.get(key)
+        if frame is not None:
+            self._frames.move_to_end(key)
+            return frame
+        change = self.since(version)
+        if change is None or not (change.upserts or change.removed):
+            return None
+        data = dumps({"version": change.version, "upserts": change.upserts, "removed": change.removed})
+        frame = b"id: %d\nevent: changes\ndata: %s\n\n" % (change.version, data)
+        self._frames[key] = frame
+        if len(self._frames) > FRAME_CACHE_SIZE:
+            self._frames.popitem(last=False)
+        return frame
+
+    async def wait(self) -> None:
+        """Return on the next recorded snapshot or heartbeat."""
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        await self._wakeup.wait()
+
+    def _wake(self) -> None:
+        # Swap in a fresh event so every current waiter is released exactly once
+        if self._wakeup is not None:
+            wakeup, self._wakeup = self._wakeup, asyncio.Event()
+            wakeup.set()
+
+    async def heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            self._wake()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"latest": self.latest, "floor": self.floor, "entries": len(self.entries),
+                "subscribers": self.subscribers}
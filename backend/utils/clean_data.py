@@ -1,7 +1,52 @@
-from datetime import datetime
-from typing import List, Dict, Any
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Any, Tuple
 import re
+import zlib
 from collections import Counter
+from dateutil import parser as date_parser
+from utils.dedup import cluster_titles, DEDUP_THRESHOLD
+
+# Articles published within this many hours count as trending
+TRENDING_WINDOW_HOURS = 24
+
+VIRAL_KEYWORDS = ["breaking", "exclusive", "major", "huge", "revolutionary", "new", "latest", "update", "announcement"]
+
+IMPORTANT_KEYWORDS = [
+    "model release", "agi", "breakthrough", "announcement", 
+    "research", "ai bill", "safety", "gpt-", "claude", "gemini"
+]
+
+MAJOR_LABS = ["openai", "deepmind", "anthropic", "google research"]
+
+# AI/tech themed Unsplash images for articles that come without one
+PLACEHOLDER_IMAGES = [
+    "https://images.unsplash.com/photo-1677442136019-21780ecad995?w=800&h=600&fit=crop",  # AI brain
+    "https://images.unsplash.com/photo-1485827404703-89b55fcc595e?w=800&h=600&fit=crop",  # Neural network
+    "https://images.unsplash.com/photo-1555255707-c07966088b7b?w=800&h=600&fit=crop",  # AI robot
+    "https://images.unsplash.com/photo-1488590528505-98d2b5aba04b?w=800&h=600&fit=crop",  # Tech circuit
+    "https://images.unsplash.com/photo-1518770660439-4636190af475?w=800&h=600&fit=crop",  # AI chip
+    "https://images.unsplash.com/photo-1504639725590-34d0984388bd?w=800&h=600&fit=crop",  # Code/AI
+    "https://images.unsplash.com/photo-1451187580459-43490279c0fa?w=800&h=600&fit=crop",  # Digital world
+    "https://images.unsplash.com/photo-1558494949-ef010cbdcc31?w=800&h=600&fit=crop",  # AI visualization
+    "https://images.unsplash.com/photo-1635070041078-e363dbe005cb?w=800&h=600&fit=crop",  # Machine learning
+    "https://images.unsplash.com/photo-1550751827-4bd374c3f58b?w=800&h=600&fit=crop",  # Tech innovation
+    "https://images.unsplash.com/photo-1555949963-aa79dcee981c?w=800&h=600&fit=crop",  # AI data
+    "https://images.unsplash.com/photo-1551288049-bebda4e38f71?w=800&h=600&fit=crop",  # Analytics
+    "https://images.unsplash.com/photo-1558494949-ef010cbdcc31?w=800&h=600&fit=crop",  # AI network
+    "https://images.unsplash.com/photo-1550751827-4bd374c3f58b?w=800&h=600&fit=crop",  # Innovation
+    "https://images.unsplash.com/photo-1551288049-bebda4e38f71?w=800&h=600&fit=crop",  # Data science
+]
+
+def _keyword_pattern(keywords: List[str]) -> "re.Pattern[str]":
+    # One alternation matches if any keyword occurs anywhere, same as any(kw in text)
+    return re.compile("|".join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)))
+
+VIRAL_PATTERN = _keyword_pattern(VIRAL_KEYWORDS)
+IMPORTANT_PATTERN = _keyword_pattern(IMPORTANT_KEYWORDS)
+MAJOR_LABS_PATTERN = _keyword_pattern(MAJOR_LABS)
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
 
 def clean_text(text: str) -> str:
     """Clean and normalize text content."""
@@ -13,72 +58,63 @@ def clean_text(text: str) -> str:
     text = re.sub(r'\s+', ' ', text)
     return text.strip()
 
+def _as_utc(parsed: datetime) -> datetime:
+    # Feeds that omit the offset are taken to be UTC
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed
+
 def parse_date(date_str: str) -> datetime:
-    """Parse various date formats to datetime."""
+    """Parse various date formats to a timezone-aware datetime.
+    
+    ISO-8601 and RFC-822 go through fast paths; anything else is left to dateutil.
+    """
     if not date_str:
-        return datetime.now()
+        return datetime.now(timezone.utc)
     
     # Handle datetime objects
     if isinstance(date_str, datetime):
-        return date_str
+        return _as_utc(date_str)
+    
+    text = str(date_str).strip()
     
-    # Handle already parsed ISO strings
-    if isinstance(date_str, str) and 'T' in date_str:
+    # ISO-8601 (NewsAPI, Bing, YouTube, and our own output)
+    if len(text) >= 10 and text[4] == "-" and text[:4].isdigit():
         try:
-            # Try parsing ISO format directly
-            from dateutil import parser
-            return parser.parse(date_str)
-        except:
+            return _as_utc(datetime.fromisoformat(text[:-1] + "+00:00" if text.endswith("Z") else text))
+        except ValueError:
             pass
     
-    # Common RSS date formats
-    formats = [
-        "%a, %d %b %Y %H:%M:%S %z",
-        "%a, %d %b %Y %H:%M:%S %Z",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d",
-    ]
-    
-    for fmt in formats:
-        try:
-            parsed = datetime.strptime(str(date_str), fmt)
-            return parsed
-        except:
-            continue
+    # RFC-822 (RSS pubDate)
+    try:
+        return _as_utc(parsedate_to_datetime(text))
+    except (TypeError, ValueError, IndexError):
+        pass
     
     # Fallback: try dateutil parser
     try:
-        from dateutil import parser
-        return parser.parse(str(date_str))
-    except:
+        return _as_utc(date_parser.parse(text))
+    except (ValueError, OverflowError):
         pass
     
-    return datetime.now()
+    return datetime.now(timezone.utc)
 
-def deduplicate_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Remove duplicate articles based on title similarity."""
-    seen_titles = set()
-    unique_articles = []
+def placeholder_image(title: str) -> str:
+    """Placeholder picked from the title, so an article keeps its image across polls and workers."""
+    # crc32 rather than hash(), which is salted per process
+    return PLACEHOLDER_IMAGES[zlib.crc32(str(title).encode("utf-8")) % len(PLACEHOLDER_IMAGES)]
+
+def normalize_title(title: str) -> str:
+    """Lowercase a title and strip punctuation for comparison."""
+    return re.sub(r'[^\w\s]', '', str(title).lower().strip())
+
+def deduplicate_articles(articles: List[Dict[str, Any]], threshold: float = DEDUP_THRESHOLD) -> List[Dict[str, Any]]:
+    """Keep the first article of each near-duplicate cluster, tagged with its cluster ID and size."""
+    clusters = cluster_titles([article.get("title", "") for article in articles], threshold)
+    sizes = Counter(clusters)
     
-    for article in articles:
-        title = article.get("title", "").lower().strip()
-        # Normalize title for comparison
-        title_normalized = re.sub(r'[^\w\s]', '', title)
-        
-        # Check if similar title exists
-        is_duplicate = False
-        for seen_title in seen_titles:
-            # Simple similarity check
-            if title_normalized in seen_title or seen_title in title_normalized:
-                if len(title_normalized) > 20 and len(seen_title) > 20:
-                    is_duplicate = True
-                    break
-        
-        if not is_duplicate:
-            seen_titles.add(title_normalized)
-            unique_articles.append(article)
+    unique_articles = []
+    for i, (article, cluster_id) in enumerate(zip(articles, clusters)):
+        if cluster_id == i:
+            unique_articles.append({**article, "cluster_id": cluster_id, "cluster_size": sizes[cluster_id]})
     
     return unique_articles
 
@@ -102,13 +138,28 @@ def extract_keywords(text: str) -> List[str]:
     
     return keywords
 
-def categorize_article(article: Dict[str, Any], all_articles: List[Dict[str, Any]]) -> Dict[str, bool]:
-    """Categorize article as trending or important."""
+def keyword_flags(article: Dict[str, Any]) -> Tuple[bool, bool]:
+    """Content-only part of categorization. Returns (has viral keyword, is important)."""
+    title = str(article.get("title", "")).lower()
+    description = str(article.get("description", "")).lower()
+    content = f"{title} {description}"
+    
+    # Viral keywords
+    is_viral = VIRAL_PATTERN.search(content) is not None
+    
+    # Check if important, or from a major lab
+    is_important = (
+        IMPORTANT_PATTERN.search(content) is not None
+        or MAJOR_LABS_PATTERN.search(str(article.get("source", "")).lower()) is not None
+    )
+    
+    return is_viral, is_important
+
+def _title_key(article: Dict[str, Any]) -> str:
+    return _PUNCTUATION.sub('', str(article.get("title", "")).lower())
+
+def _categorize(article: Dict[str, Any], source_count: int) -> Dict[str, bool]:
     try:
-        title = str(article.get("title", "")).lower()
-        description = str(article.get("description", "")).lower()
-        content = f"{title} {description}"
-        
         publish_date = article.get("published_at")
         if isinstance(publish_date, str):
             try:
@@ -124,46 +175,25 @@ def categorize_article(article: Dict[str, Any], all_articles: List[Dict[str, Any
             try:
                 # Handle timezone-aware datetimes
                 if publish_date.tzinfo is not None:
-                    from datetime import timezone
                     now = datetime.now(timezone.utc)
                     hours_ago = (now - publish_date).total_seconds() / 3600
                 else:
                     hours_ago = (datetime.now() - publish_date).total_seconds() / 3600
                 # More lenient: last 24 hours instead of 12
-                if hours_ago <= 24:
+                if hours_ago <= TRENDING_WINDOW_HOURS:
                     is_trending = True
             except Exception as e:
                 print(f"Error calculating hours ago: {e}")
                 pass
-    
+        
         # Check if appears in multiple sources
-        title_normalized = re.sub(r'[^\w\s]', '', title)
-        source_count = sum(1 for a in all_articles 
-                          if re.sub(r'[^\w\s]', '', str(a.get("title", "")).lower()) == title_normalized)
         if source_count > 1:
             is_trending = True
         
-        # Viral keywords
-        viral_keywords = ["breaking", "exclusive", "major", "huge", "revolutionary", "new", "latest", "update", "announcement"]
-        if any(kw in content for kw in viral_keywords):
+        is_viral, is_important = keyword_flags(article)
+        if is_viral:
             is_trending = True
         
-        # Check if important
-        is_important = False
-        important_keywords = [
-            "model release", "agi", "breakthrough", "announcement", 
-            "research", "ai bill", "safety", "gpt-", "claude", "gemini"
-        ]
-        
-        if any(kw in content for kw in important_keywords):
-            is_important = True
-        
-        # Check if from major labs
-        source = str(article.get("source", "")).lower()
-        major_labs = ["openai", "deepmind", "anthropic", "google research"]
-        if any(lab in source for lab in major_labs):
-            is_important = True
-        
         return {
             "trending": is_trending,
             "important": is_important
@@ -175,3 +205,14 @@ def categorize_article(article: Dict[str, Any], all_articles: List[Dict[str, Any
             "important": False
         }
 
+def categorize_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, bool]]:
+    """Categorize every article as trending or important in one pass over the list."""
+    title_keys = [_title_key(article) for article in articles]
+    source_counts = Counter(title_keys)
+    return [_categorize(article, source_counts[key]) for article, key in zip(articles, title_keys)]
+
+def categorize_article(article: Dict[str, Any], all_articles: List[Dict[str, Any]]) -> Dict[str, bool]:
+    """Categorize a single article as trending or important. Use categorize_articles() for lists."""
+    title_key = _title_key(article)
+    source_count = sum(1 for a in all_articles if _title_key(a) == title_key)
+    return _categorize(article, source_count)
@@ -0,0 +1,185 @@
+import asyncio
+import os
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+from utils.extract import extraction_stats
+from utils.fetch_article_content import fetch_article_content
+from utils.persistence import SnapshotDB, snapshot_db
+
+# Extracted content is kept on disk this long; articles rarely change after publication
+CONTENT_MAX_AGE = 7 * 24 * 3600
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "4"))
+PREFETCH_QUEUE_SIZE = int(os.getenv("PREFETCH_QUEUE_SIZE", "500"))
+# Concurrent page fetches per site, and the minimum gap between prefetches to one site
+DOMAIN_CONCURRENCY = int(os.getenv("PREFETCH_DOMAIN_CONCURRENCY", "1"))
+DOMAIN_INTERVAL = float(os.getenv("PREFETCH_DOMAIN_INTERVAL", "2.0"))
+# Pages that couldn't be extracted aren't retried before this
+FAILURE_RETRY_SECONDS = 6 * 3600
+# Stored content older than CONTENT_MAX_AGE is deleted this often
+PRUNE_INTERVAL = 3600
+# Pacing entries kept before those already in the past are dropped
+MAX_PACED_DOMAINS = 1000
+
+def domain_of(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+class DomainLimiter:
+    """Per-site concurrency cap plus a minimum interval between paced requests."""
+
+    def __init__(self, concurrency: int = DOMAIN_CONCURRENCY, interval: float = DOMAIN_INTERVAL):
+        self.concurrency = concurrency
+        self.interval = interval
+        # Held only while a request is waiting or running, so idle sites drop out on their own
+        self._slots: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = weakref.WeakValueDictionary()
+        self._next_at: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, domain: str, paced: bool = True):
+        semaphore = self._slots.get(domain)
+        if semaphore is None:
+            semaphore = self._slots[domain] = asyncio.Semaphore(self.concurrency)
+        async with semaphore:
+            if paced:
+                now = time.monotonic()
+                if len(self._next_at) > MAX_PACED_DOMAINS:
+                    # A time already passed paces nothing, so forgetting it changes nothing
+                    self._next_at = {d: t for d, t in self._next_at.items() if t > now}
+                wait = self._next_at.get(domain, 0.0) - now
+                self._next_at[domain] = max(now, self._next_at.get(domain, 0.0)) + self.interval
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            yield
+
+class ContentPipeline:
+    """Fetches, extracts and durably stores article text, ahead of time where possible.
+
+    New trending and important articles are queued for background prefetch. On-demand
+    requests check the database first and join a prefetch already in flight, so each
+    article page is fetched from its site once per CONTENT_MAX_AGE.
+    """
+
+    def __init__(self, db: SnapshotDB = snapshot_db, workers: int = PREFETCH_WORKERS,
+                 queue_size: int = PREFETCH_QUEUE_SIZE):
+        self.db = db
+        self.workers = workers
+        self.queue_size = queue_size
+        self.limiter = DomainLimiter()
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: set = set()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._failed: Dict[str, float] = {}
+        self._tasks: List[asyncio.Task] = []
+        self.metrics = {"queued": 0, "dropped": 0, "prefetched": 0, "already_stored": 0,
+                        "failed": 0, "on_demand": 0, "joined": 0}
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        for i in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"content-prefetch-{i}"))
+        self._tasks.append(asyncio.create_task(self._prune(), name="content-prune"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._queued.clear()
+
+    def enqueue(self, urls: Iterable[str]) -> None:
+        """Queue pages for prefetch, in the given order. Drops them when the queue is full."""
+        if self._queue is None:
+            return
+        for url in urls:
+            if not url or url in self._queued or url in self._inflight or self._recently_failed(url):
+                continue
+            try:
+                self._queue.put_nowait(url)
+            except asyncio.QueueFull:
+                self.metrics["dropped"] += 1
+                continue
+            self._queued.add(url)
+            self.metrics["queued"] += 1
+
+    async def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Content for a detail page: stored copy, a prefetch in flight, or a fetch right now."""
+        stored = self.db.load_content(url, CONTENT_MAX_AGE)
+        if stored is not None:
+            return stored
+        inflight = self._inflight.get(url)
+        if inflight is not None:
+            self.metrics["joined"] += 1
+            return await asyncio.shield(inflight)
+        if self._recently_failed(url):
+            return None
+        self.metrics["on_demand"] += 1
+        # Someone is waiting, so skip the pacing but still respect the site's concurrency cap
+        return await self._fetch(url, paced=False)
+
+    async def _worker(self) -> None:
+        while True:
+            url = await self._queue.get()
+            self._queued.discard(url)
+            try:
+                if self.db.load_content(url, CONTENT_MAX_AGE) is not None:
+                    self.metrics["already_stored"] += 1
+                    continue
+                if url in self._inflight:
+                    continue
+                if await self._fetch(url, paced=True):
+                    self.metrics["prefetched"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error prefetching content for {url}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _prune(self) -> None:
+        while True:
+            self.db.prune_content(CONTENT_MAX_AGE)
+            await asyncio.sleep(PRUNE_INTERVAL)
+
+    async def _fetch(self, url: str, paced: bool) -> Optional[Dict[str, Any]]:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
+        content = None
+        try:
+            async with self.limiter.slot(domain_of(url), paced=paced):
+                content = await fetch_article_content(url)
+            if content and content.get("content"):
+                self.db.save_content(url, content)
+            else:
+                self._mark_failed(url)
+            return content
+        finally:
+            self._inflight.pop(url, None)
+            future.set_result(content)
+
+    def _recently_failed(self, url: str) -> bool:
+        failed_at = self._failed.get(url)
+        return failed_at is not None and time.time() - failed_at < FAILURE_RETRY_SECONDS
+
+    def _mark_failed(self, url: str) -> None:
+        self.metrics["failed"] += 1
+        if len(self._failed) > 10_000:
+            self._failed.clear()
+        self._failed[url] = time.time()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "inflight": len(self._inflight),
+            "domains": len(self.limiter._slots),
+            "extraction": extraction_stats.stats(),
+        }
+
+# Global content pipeline instance
+content_pipeline = ContentPipeline()
@@ -0,0 +1,159 @@
+import os
+import re
+from array import array
+from typing import Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+# Minimum shingle Jaccard similarity for two titles to be the same story
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.7"))
+
+# Larger than any bin value produced from a 64-bit hash
+_EMPTY = 1 << 64
+
+_DIGIT = re.compile(r'\d')
+# Trailing " - Publisher" / " | Publisher" that aggregators append to syndicated titles
+_PUBLISHER_SUFFIX = re.compile(r'\s+[-|\u2013\u2014]\s+[^-|\u2013\u2014]{1,40}$')
+
+def _normalize(title: str) -> str:
+    title = _PUBLISHER_SUFFIX.sub('', str(title))
+    title = re.sub(r'[^\w\s]', '', title.lower())
+    return re.sub(r'\s+', ' ', title).strip()
+
+def _lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick (bands, rows) whose S-curve midpoint (1/b)^(1/r) is just below the threshold."""
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        midpoint = (1 / bands) ** (1 / rows)
+        # Prefer recall: candidates are verified exactly afterwards
+        error = abs(midpoint - threshold * 0.85)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+# (shingle hashes, MinHash signature, tokens containing a digit)
+Prepared = Tuple[FrozenSet[int], array, FrozenSet[str]]
+# What the index keeps per title: the same, with the shingles packed into an array
+Indexed = Tuple[array, array, FrozenSet[str]]
+
+class DuplicateIndex:
+    """MinHash/LSH index over word shingles of titles.
+
+    Each title is hashed once into a one-permutation MinHash signature and bucketed by
+    band, so adding or querying a title costs O(title length) instead of a scan over
+    every title already seen. Bucket collisions are verified with exact Jaccard, and
+    titles only match if they carry the same numbers ("Llama 3" is not "Llama 4").
+    """
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, num_perm: int = 32, shingle_size: int = 3):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        # Words plus runs of up to this many words, so word order and neighbours count
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _lsh_params(threshold, num_perm)
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(self.bands)]
+        # Packed 64-bit arrays take a tenth of the memory of sets and tuples of int objects
+        self._items: Dict[Hashable, Indexed] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def shingles(self, title: str) -> FrozenSet[int]:
+        """Hashes of the title's words and word n-grams (kept as ints, which are smaller than the strings)."""
+        words = _normalize(title).split()
+        grams = set(words)
+        for k in range(2, self.shingle_size + 1):
+            grams.update(" ".join(words[i:i + k]) for i in range(len(words) - k + 1))
+        return frozenset(map(hash, grams))
+
+    def signature(self, shingles: FrozenSet[int]) -> array:
+        """One-permutation MinHash: each hash lands in one bin, keeping the bin minimum."""
+        n = self.num_perm
+        sig = [_EMPTY] * n
+        for h in shingles:
+            b = h % n
+            v = h // n
+            if v < sig[b]:
+                sig[b] = v
+        # Densify: fill empty bins from the next non-empty bin so short titles still band
+        if _EMPTY in sig and len(sig) > sig.count(_EMPTY):
+            for i in range(n):
+                if sig[i] == _EMPTY:
+                    step = 1
+                    while sig[(i + step) % n] == _EMPTY:
+                        step += 1
+                    sig[i] = sig[(i + step) % n] + step
+        return array("q", sig) if shingles else array("q")
+
+    def _bands(self, sig: array):
+        r = self.rows
+        for band in range(self.bands):
+            yield band, sig[band * r:(band + 1) * r].tobytes()
+
+    def prepare(self, title: str) -> Prepared:
+        """Shingles, signature and numbers of a title, reusable across match() and add()."""
+        shingles = self.shingles(title)
+        numbers = frozenset(word for word in _normalize(title).split() if _DIGIT.search(word))
+        return shingles, self.signature(shingles), numbers
+
+    def _similarity(self, a: FrozenSet[int], b: array) -> float:
+        if not a or not b:
+            return 0.0
+        inter = len(a.intersection(b))
+        return inter / (len(a) + len(b) - inter)
+
+    def match(self, title: str, prepared: Optional[Prepared] = None) -> Optional[Hashable]:
+        """Return the key of the most similar indexed title at or above the threshold."""
+        shingles, sig, numbers = prepared or self.prepare(title)
+        if not shingles:
+            return None
+        best_key, best_score = None, self.threshold
+        checked = set()
+        for band, values in self._bands(sig):
+            for key in self._buckets[band].get(values, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                other = self._items[key]
+                # Versions, model numbers and figures have to agree exactly
+                if other[2] != numbers:
+                    continue
+                score = self._similarity(shingles, other[0])
+                if score >= best_score:
+                    best_key, best_score = key, score
+        return best_key
+
+    def add(self, key: Hashable, title: str, prepared: Optional[Prepared] = None) -> None:
+        prepared = prepared or self.prepare(title)
+        shingles, sig, _ = prepared
+        if not shingles or key in self._items:
+            return
+        self._items[key] = (array("q", shingles), sig, prepared[2])
+        for band, values in self._bands(sig):
+            self._buckets[band].setdefault(values, []).append(key)
+
+    def remove(self, key: Hashable) -> None:
+        item = self._items.pop(key, None)
+        if item is None:
+            return
+        for band, values in self._bands(item[1]):
+            bucket = self._buckets[band].get(values)
+            if bucket is not None:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band][values]
+
+def cluster_titles(titles: List[str], threshold: float = DEDUP_THRESHOLD) -> List[int]:
+    """Assign each title a cluster ID: the index of the first title of the same story."""
+    index = DuplicateIndex(threshold=threshold)
+    clusters = []
+    for i, title in enumerate(titles):
+        prepared = index.prepare(title)
+        match = index.match(title, prepared)
+        if match is None:
+            index.add(i, title, prepared)
+            clusters.append(i)
+        else:
+            clusters.append(clusters[match])
+    return clusters
@@ -0,0 +1,163 @@
+import re
+import time
+from typing import Any, Dict, Optional, Tuple
+from lxml import etree, html as lxml_html
+
+# Subtrees that never hold article text
+DROP_TAGS = ("script", "style", "noscript", "nav", "aside", "footer", "header", "iframe", "form",
+             "svg", "button", "select", "template")
+# Elements whose text counts towards their ancestors' scores
+SCORED_TAGS = {"p", "pre", "td", "blockquote", "li"}
+POSITIVE = re.compile(r"article|body|content|entry|main|page|post|story|text|blog", re.I)
+NEGATIVE = re.compile(r"comment|meta|footer|foot|sidebar|nav|menu|promo|related|share|social|"
+                      r"sponsor|advert|\bad\b|ad-|banner|subscribe|newsletter|popup|cookie|widget", re.I)
+MIN_PARAGRAPH_CHARS = 25
+MIN_CONTENT_CHARS = 200
+# Siblings of the best block scoring at least this fraction of it are kept as well
+SIBLING_RATIO = 0.2
+# Unscored sibling paragraphs (e.g. a lead paragraph next to the first section) are kept below this
+SIBLING_MAX_LINK_DENSITY = 0.25
+META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.I)
+
+class ExtractionStats:
+    """Running per-stage timings and byte counts, recorded on the event loop side."""
+
+    def __init__(self):
+        self.count = 0
+        self.truncated = 0
+        self.bytes = 0
+        self.stage_ms: Dict[str, float] = {}
+
+    def record(self, timings: Dict[str, float], size: int, truncated: bool) -> None:
+        self.count += 1
+        self.bytes += size
+        self.truncated += truncated
+        for stage, ms in timings.items():
+            self.stage_ms[stage] = self.stage_ms.get(stage, 0.0) + ms
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pages": self.count,
+            "truncated": self.truncated,
+            "avg_kb": round(self.bytes / self.count / 1024, 1) if self.count else 0.0,
+            "avg_stage_ms": {stage: round(ms / self.count, 2) for stage, ms in self.stage_ms.items()},
+        }
+
+def _decode(raw: bytes, encoding: Optional[str]) -> Any:
+    """Parse bytes with the declared, meta or UTF-8 encoding; fall back to a lossy decode."""
+    if encoding is None:
+        match = META_CHARSET.search(raw[:4096])
+        encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        parser = lxml_html.HTMLParser(encoding=encoding, remove_comments=True)
+        return lxml_html.document_fromstring(raw, parser=parser)
+    except (LookupError, ValueError, etree.ParserError):
+        text = raw.decode("utf-8", errors="replace")
+        return lxml_html.document_fromstring(text, parser=lxml_html.HTMLParser(remove_comments=True))
+
+def _class_weight(element) -> int:
+    weight = 0
+    for attr in (element.get("class"), element.get("id")):
+        if attr:
+            if NEGATIVE.search(attr):
+                weight -= 25
+            if POSITIVE.search(attr):
+                weight += 25
+    return weight
+
+def _link_density(element) -> float:
+    text_length = len(element.text_content())
+    if not text_length:
+        return 1.0
+    link_length = sum(len(a.text_content()) for a in element.iter("a"))
+    return link_length / text_length
+
+def _text(element) -> str:
+    return "\n\n".join(t.strip() for t in element.itertext() if t.strip())
+
+def _score(body) -> Tuple[Optional[Any], Dict[Any, float]]:
+    """One pass over the paragraphs: each adds to its parent and, halved, its grandparent."""
+    scores: Dict[Any, float] = {}
+    for element in body.iter(*SCORED_TAGS):
+        text = element.text_content().strip()
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+        points = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = element.getparent()
+        if parent is None:
+            continue
+        for ancestor, share in ((parent, 1.0), (parent.getparent(), 0.5)):
+            if ancestor is None:
+                continue
+            if ancestor not in scores:
+                scores[ancestor] = _class_weight(ancestor) + (5 if ancestor.tag in ("article", "main") else 0)
+            scores[ancestor] += points * share
+
+    best, best_score = None, 0.0
+    for element, score in scores.items():
+        score *= 1 - _link_density(element)
+        scores[element] = score
+        if score > best_score:
+            best, best_score = element, score
+    return best, scores
+
+def _is_paragraph(element) -> bool:
+    # Paragraphs score their parent, never themselves, so siblings of the best block need this check
+    return (element.tag in SCORED_TAGS and len(element.text_content().strip()) >= MIN_PARAGRAPH_CHARS
+            and _link_density(element) < SIBLING_MAX_LINK_DENSITY)
+
+def _collect(best, scores: Dict[Any, float]) -> str:
+    parent = best.getparent()
+    if parent is None:
+        return _text(best)
+    threshold = max(10.0, scores[best] * SIBLING_RATIO)
+    parts = []
+    for sibling in parent:
+        if sibling is best or scores.get(sibling, 0.0) >= threshold or _is_paragraph(sibling):
+            text = _text(sibling)
+            if text:
+                parts.append(text)
+    return "\n\n".join(parts)
+
+def _title(doc) -> Optional[str]:
+    for path in ("//h1", "//title", "//meta[@property='og:title']/@content"):
+        for found in doc.xpath(path):
+            title = (found if isinstance(found, str) else found.text_content()).strip()
+            if title:
+                return title
+    return None
+
+def extract_article(raw: bytes, url: str, encoding: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """Extract the main text and title from an article page with lxml.
+
+    Returns the result and per-stage timings in milliseconds. Runs on the parse pool.
+    """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    def lap(stage: str) -> None:
+        nonlocal started
+        now = time.perf_counter()
+        timings[stage] = (now - started) * 1000
+        started = now
+
+    doc = _decode(raw, encoding)
+    lap("parse")
+    title = _title(doc)
+    etree.strip_elements(doc, *DROP_TAGS, with_tail=False)
+    body = doc.find("body")
+    if body is None:
+        body = doc
+    lap("clean")
+    best, scores = _score(body)
+    lap("score")
+    content = _collect(best, scores) if best is not None else ""
+    if len(content) < MIN_CONTENT_CHARS:
+        content = _text(body)
+    content = re.sub(r"\n{3,}", "\n\n", content)
+    content = re.sub(r" {2,}", " ", content).strip()
+    lap("text")
+    return {"content": content or None, "title": title, "url": url}, timings
+
+# Global extraction stats instance
+extraction_stats = ExtractionStats()
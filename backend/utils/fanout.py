@@ -0,0 +1,214 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, NamedTuple, Optional
+
+# Latency samples kept per upstream for its percentiles
+LATENCY_WINDOW = 50
+# Samples needed before timeouts and hedging adapt to measured latency
+MIN_SAMPLES = 5
+MIN_TIMEOUT = 2.0
+DEFAULT_TIMEOUT = 10.0
+# A second attempt is started once the first takes longer than this percentile
+HEDGE_PERCENTILE = 95
+MIN_HEDGE_DELAY = 0.5
+# Consecutive failures that open a breaker, and how long it stays open at first
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 60.0
+BREAKER_MAX_COOLDOWN = 30 * 60.0
+
+class Job(NamedTuple):
+    """One upstream call in a fan-out."""
+    name: str
+    fn: Callable[[], Awaitable[Any]]
+    # Quota-metered APIs shouldn't be called twice for one result
+    hedge: bool = True
+    max_timeout: float = DEFAULT_TIMEOUT
+
+class CircuitBreaker:
+    """Stops calling an upstream after repeated failures, retrying one call after a cooldown.
+
+    Each failed trial doubles the cooldown, up to BREAKER_MAX_COOLDOWN.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial:
+            self.trial = True
+            return True
+        return False
+
+    def success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self.cooldown = self.base_cooldown
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.trial:
+            self.cooldown = min(self.cooldown * 2, BREAKER_MAX_COOLDOWN)
+            self.opened_at = time.monotonic()
+        elif self.opened_at is None and self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+        self.trial = False
+
+class UpstreamHealth:
+    """Latency samples, breaker and counters for one upstream."""
+
+    def __init__(self):
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.breaker = CircuitBreaker()
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.skipped = 0
+
+    def percentile(self, p: float) -> Optional[float]:
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def timeout(self, max_timeout: float) -> float:
+        """Twice the p99 latency, within [MIN_TIMEOUT, max_timeout]."""
+        p99 = self.percentile(99)
+        if p99 is None:
+            return max_timeout
+        return min(max_timeout, max(MIN_TIMEOUT, p99 * 2))
+
+    def hedge_delay(self) -> Optional[float]:
+        p = self.percentile(HEDGE_PERCENTILE)
+        return None if p is None else max(MIN_HEDGE_DELAY, p)
+
+    def stats(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return {
+            "breaker": self.breaker.state,
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "skipped": self.skipped,
+            "p50_ms": round(p50 * 1000) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000) if p95 is not None else None,
+            "timeout_s": round(self.timeout(DEFAULT_TIMEOUT), 2),
+        }
+
+class FanOut:
+    """Runs upstream calls concurrently so the slowest one doesn't set the pace.
+
+    Each upstream gets a timeout adapted to its own latency, a hedged second attempt when
+    it is slower than usual, and a circuit breaker that skips it while it keeps failing.
+    Results are handed to on_result as they arrive.
+    """
+
+    def __init__(self):
+        self.upstreams: Dict[str, UpstreamHealth] = {}
+
+    def health(self, name: str) -> UpstreamHealth:
+        health = self.upstreams.get(name)
+        if health is None:
+            health = self.upstreams[name] = UpstreamHealth()
+        return health
+
+    async def gather(self, jobs: List[Job], on_result: Optional[Callable[[str, Any], None]] = None) -> List[Any]:
+        """Results in job order; None for jobs that failed, timed out or were skipped."""
+        async def run(job: Job) -> Any:
+            result = await self.call(job)
+            if result is not None and on_result is not None:
+                on_result(job.name, result)
+            return result
+        return list(await asyncio.gather(*(run(job) for job in jobs)))
+
+    async def call(self, job: Job) -> Any:
+        health = self.health(job.name)
+        if not health.breaker.allow():
+            health.skipped += 1
+            return None
+        health.calls += 1
+        timeout = health.timeout(job.max_timeout)
+        started = time.monotonic()
+        try:
+            result = await self._hedged(job, health, timeout)
+        except asyncio.TimeoutError:
+            health.timeouts += 1
+            # Counted as a sample so a source that got slower earns a longer timeout
+            health.latencies.append(timeout)
+            self._failed(job.name, health, f"timed out after {timeout:.1f}s")
+            return None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The fetchers log their own errors
+            health.errors += 1
+            self._failed(job.name, health, str(e), log=False)
+            return None
+        health.latencies.append(time.monotonic() - started)
+        health.breaker.success()
+        return result
+
+    def _failed(self, name: str, health: UpstreamHealth, reason: str, log: bool = True) -> None:
+        was_open = health.breaker.opened_at is not None
+        health.breaker.failure()
+        if health.breaker.opened_at is not None and not was_open:
+            print(f"Circuit opened for {name} after {health.breaker.failures} failures: {reason}")
+        elif log:
+            print(f"Error fetching {name}: {reason}")
+
+    async def _hedged(self, job: Job, health: UpstreamHealth, timeout: float) -> Any:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        first = asyncio.ensure_future(job.fn())
+        tasks = [first]
+        hedge_delay = health.hedge_delay() if job.hedge else None
+        try:
+            if hedge_delay is not None and hedge_delay < timeout:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done:
+                    health.hedges += 1
+                    tasks.append(asyncio.ensure_future(job.fn()))
+            error: Optional[BaseException] = None
+            while tasks:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                done, _ = await asyncio.wait(tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise asyncio.TimeoutError()
+                for task in done:
+                    tasks.remove(task)
+                    if task.exception() is None:
+                        if task is not first:
+                            health.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: health.stats() for name, health in self.upstreams.items()}
+
+# Global fan-out executor instance
+fanout = FanOut()
@@ -1,15 +1,31 @@
 import os
-import httpx
-from typing import List, Dict, Any
-from datetime import datetime
-from utils.clean_data import parse_date
+import time
+from functools import partial
+from utils.http_client import http
+from typing import List, Dict, Any, Iterable, Optional
+from datetime import datetime, timezone
+from utils.models import Video
+from utils.persistence import SnapshotDB, snapshot_db
+from utils.fanout import Job, fanout
+
+try:
+    from zoneinfo import ZoneInfo
+    # YouTube quota days start at midnight Pacific time
+    QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+except Exception:
+    QUOTA_TZ = timezone.utc
 
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "")
+# Units this app may spend per quota day, out of the project's 10k default
+YOUTUBE_DAILY_BUDGET = int(os.getenv("YOUTUBE_DAILY_BUDGET", "1000"))
+API_URL = "https://www.googleapis.com/youtube/v3"
+# Quota units per call: list endpoints cost 1, search costs 100
+QUOTA_COST = {"playlistItems": 1, "videos": 1, "search": 100}
 
 YOUTUBE_CHANNELS = [
     {"id": "UCr0ail1RdXdusqeqco44loA", "name": "OpenAI"},
     {"id": "UC0e3QhIYukixgh5VVpKHH9Q", "name": "Google Research"},
-    {"id": "UC0e3QhIYukixgh5VVpKHH9Q", "name": "DeepMind"},
+    {"id": "UCP7jMXSY2xbc3KCAE0MHQ-A", "name": "DeepMind"},
     {"id": "UCqk7Cd8Lv1sqG3Jpq3BnsGw", "name": "Anthropic"},
 ]
 
@@ -23,101 +39,234 @@ YOUTUBE_SEARCH_QUERIES = [
     "AGI research"
 ]
 
-async def fetch_youtube_videos(channel_id: str = None, query: str = None, max_results: int = 10) -> List[Dict[str, Any]]:
-    """Fetch videos from YouTube API."""
-    if not YOUTUBE_API_KEY:
-        # Return mock data if no API key
-        return get_mock_videos()
-    
-    try:
-        url = "https://www.googleapis.com/youtube/v3/search"
-        params = {
-            "part": "snippet",
+UPLOADS_PER_CHANNEL = 10
+VIDEOS_BATCH = 50
+# One search query, in rotation, at most this often
+SEARCH_INTERVAL = 6 * 3600
+# Search only while the budget still covers this many playlist refreshes afterwards
+SEARCH_RESERVE_REFRESHES = 12
+MIN_INTERVAL = 10 * 60
+MAX_INTERVAL = 3 * 3600
+VIDEO_CACHE_MAX_AGE = 30 * 24 * 3600
+MAX_VIDEOS = 50
+
+def unique_channel_ids(channels: Iterable[Dict[str, str]]) -> List[str]:
+    return list(dict.fromkeys(channel["id"] for channel in channels))
+
+def uploads_playlist(channel_id: str) -> str:
+    """A channel's uploads playlist shares its ID with the UC prefix swapped for UU."""
+    return "UU" + channel_id[2:] if channel_id.startswith("UC") else channel_id
+
+class QuotaBudget:
+    """YouTube API units spent in the current quota day, persisted across restarts."""
+
+    def __init__(self, daily_budget: int = YOUTUBE_DAILY_BUDGET, db: SnapshotDB = snapshot_db):
+        self.daily_budget = daily_budget
+        self.db = db
+        self.day: Optional[str] = None
+        self.used = 0
+        self.calls: Dict[str, int] = {}
+
+    def _today(self) -> str:
+        return datetime.now(QUOTA_TZ).date().isoformat()
+
+    def _roll(self) -> None:
+        today = self._today()
+        if self.day == today:
+            return
+        saved = self.db.load_meta("youtube_quota") if self.day is None else None
+        if saved and saved.get("day") == today:
+            self.used, self.calls = saved.get("used", 0), saved.get("calls", {})
+        else:
+            self.used, self.calls = 0, {}
+        self.day = today
+
+    @property
+    def remaining(self) -> int:
+        self._roll()
+        return max(0, self.daily_budget - self.used)
+
+    def can_spend(self, units: int) -> bool:
+        return self.remaining >= units
+
+    def spend(self, endpoint: str, calls: int = 1) -> None:
+        self._roll()
+        self.used += QUOTA_COST[endpoint] * calls
+        self.calls[endpoint] = self.calls.get(endpoint, 0) + calls
+        self.db.save_meta("youtube_quota", {"day": self.day, "used": self.used, "calls": self.calls})
+
+    def seconds_left_today(self) -> float:
+        now = datetime.now(QUOTA_TZ)
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp() + 24 * 3600
+        return max(60.0, midnight - now.timestamp())
+
+    def stats(self) -> Dict[str, Any]:
+        self._roll()
+        return {"day": self.day, "used": self.used, "budget": self.daily_budget, "calls": dict(self.calls)}
+
+class YouTubeIngest:
+    """Polls channel uploads playlists and keeps video metadata, spending quota to a daily budget.
+
+    A refresh lists each channel's uploads playlist (1 unit per channel) and looks up only
+    videos not seen before, 50 per videos.list call. Search, at 100 units a call, runs one
+    query at a time in rotation when the budget allows. The poll interval spreads what is
+    left of the day's budget over what is left of the day.
+    """
+
+    def __init__(self, channel_ids: List[str], queries: List[str], budget: QuotaBudget,
+                 db: SnapshotDB = snapshot_db):
+        self.channel_ids = channel_ids
+        self.queries = queries
+        self.budget = budget
+        self.db = db
+        self.videos: Optional[Dict[str, Video]] = None
+        self.last_search = 0.0
+        self._next_query = 0
+        self.last_cost = 0
+        # Private or deleted uploads, so they aren't looked up again on every refresh
+        self.unavailable: set = set()
+
+    def refresh_cost(self) -> int:
+        """Units a refresh without search costs: the playlists plus one videos.list call."""
+        return len(self.channel_ids) * QUOTA_COST["playlistItems"] + QUOTA_COST["videos"]
+
+    def interval(self) -> float:
+        affordable = self.budget.remaining / max(1, self.refresh_cost())
+        if affordable < 1:
+            return MAX_INTERVAL
+        return min(MAX_INTERVAL, max(MIN_INTERVAL, self.budget.seconds_left_today() / affordable))
+
+    async def _call(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.budget.spend(endpoint)
+        self.last_cost += QUOTA_COST[endpoint]
+        response = await http.get(f"{API_URL}/{endpoint}", params={**params, "key": YOUTUBE_API_KEY})
+        response.raise_for_status()
+        return response.json()
+
+    async def _playlist_video_ids(self, channel_id: str) -> List[str]:
+        try:
+            data = await self._call("playlistItems", {
+                "part": "contentDetails",
+                "playlistId": uploads_playlist(channel_id),
+                "maxResults": UPLOADS_PER_CHANNEL,
+            })
+        except Exception as e:
+            print(f"Error fetching YouTube uploads for {channel_id}: {e}")
+            raise
+        return [item["contentDetails"]["videoId"] for item in data.get("items", [])
+                if item.get("contentDetails", {}).get("videoId")]
+
+    async def _search_video_ids(self) -> List[str]:
+        query = self.queries[self._next_query % len(self.queries)]
+        self._next_query += 1
+        data = await self._call("search", {
+            "part": "id",
             "type": "video",
-            "maxResults": max_results,
+            "q": query,
             "order": "date",
-            "key": YOUTUBE_API_KEY
-        }
-        
-        if channel_id:
-            params["channelId"] = channel_id
-        if query:
-            params["q"] = query
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            videos = []
+            "maxResults": 5,
+        })
+        return [item["id"]["videoId"] for item in data.get("items", []) if item.get("id", {}).get("videoId")]
+
+    async def _lookup(self, video_ids: List[str]) -> List[Video]:
+        """Fetch metadata for new videos, 50 IDs per call. Private and deleted videos are skipped."""
+        videos = []
+        for start in range(0, len(video_ids), VIDEOS_BATCH):
+            if not self.budget.can_spend(QUOTA_COST["videos"]):
+                break
+            batch = video_ids[start:start + VIDEOS_BATCH]
+            data = await self._call("videos", {"part": "snippet", "id": ",".join(batch)})
+            returned = set()
             for item in data.get("items", []):
-                snippet = item.get("snippet", {})
-                video = {
-                    "id": item.get("id", {}).get("videoId", ""),
-                    "title": snippet.get("title", ""),
-                    "description": snippet.get("description", ""),
-                    "thumbnail": snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
-                    "channel": snippet.get("channelTitle", ""),
-                    "published_at": snippet.get("publishedAt", ""),
-                    "channel_id": snippet.get("channelId", "")
-                }
-                
-                if video["published_at"]:
-                    video["published_at"] = parse_date(video["published_at"]).isoformat()
-                else:
-                    video["published_at"] = datetime.now().isoformat()
-                
-                if video["id"] and video["title"]:
+                returned.add(item.get("id", ""))
+                video = video_from_snippet(item.get("id", ""), item.get("snippet", {}))
+                if video:
                     videos.append(video)
-            
-            return videos
+            self.unavailable.update(set(batch) - returned)
+        return videos
+
+    async def refresh(self) -> List[Dict[str, Any]]:
+        if self.videos is None:
+            self.videos = self.db.load_video_meta(VIDEO_CACHE_MAX_AGE)
+        self.last_cost = 0
+
+        candidates: List[str] = []
+        if self.budget.can_spend(len(self.channel_ids)):
+            # Every call spends quota, so slow channels are waited out rather than hedged
+            results = await fanout.gather([
+                Job(f"youtube:{channel_id}", partial(self._playlist_video_ids, channel_id), hedge=False)
+                for channel_id in self.channel_ids
+            ])
+            for result in results:
+                candidates.extend(result or [])
+
+        search_cost = QUOTA_COST["search"] + QUOTA_COST["videos"]
+        if (self.queries and time.time() - self.last_search >= SEARCH_INTERVAL
+                and self.budget.remaining - search_cost >= self.refresh_cost() * SEARCH_RESERVE_REFRESHES):
+            self.last_search = time.time()
+            try:
+                candidates.extend(await self._search_video_ids())
+            except Exception as e:
+                print(f"Error searching YouTube: {e}")
+
+        new_ids = [video_id for video_id in dict.fromkeys(candidates)
+                   if video_id not in self.videos and video_id not in self.unavailable]
+        if new_ids:
+            found = await self._lookup(new_ids)
+            self.videos.update((video["id"], video) for video in found)
+            self.db.save_video_meta(found)
+
+        newest = sorted(self.videos.values(), key=lambda v: v.published, reverse=True)
+        return newest[:MAX_VIDEOS]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "quota": self.budget.stats(),
+            "cached_videos": len(self.videos or {}),
+            "last_refresh_units": self.last_cost,
+            "interval_s": round(self.interval()),
+        }
+
+def video_from_snippet(video_id: str, snippet: Dict[str, Any]) -> Optional[Video]:
+    video = Video.from_dict({
+        "id": video_id,
+        "title": snippet.get("title", ""),
+        "description": snippet.get("description", ""),
+        "thumbnail": snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
+        "channel": snippet.get("channelTitle", ""),
+        "published_at": snippet.get("publishedAt", ""),
+        "channel_id": snippet.get("channelId", "")
+    })
+    return video if video.id and video.title else None
+
+# Global YouTube ingestion instance
+youtube = YouTubeIngest(unique_channel_ids(YOUTUBE_CHANNELS), YOUTUBE_SEARCH_QUERIES, QuotaBudget())
+
+async def fetch_all_youtube_videos() -> List[Video]:
+    """Latest videos from the configured channels and searches, within the quota budget."""
+    if not YOUTUBE_API_KEY:
+        # Return mock data if no API key
+        return get_mock_videos()
+    try:
+        videos = await youtube.refresh()
     except Exception as e:
         print(f"Error fetching YouTube: {e}")
-        return get_mock_videos()
+        videos = []
+    return videos or get_mock_videos()
+
+def get_mock_videos() -> List[Video]:
+    """Return mock video data when API key is not available.
 
-async def fetch_all_youtube_videos() -> List[Dict[str, Any]]:
-    """Fetch videos from multiple sources."""
-    import asyncio
-    
-    tasks = []
-    
-    # Fetch from channels
-    for channel in YOUTUBE_CHANNELS[:3]:  # Limit to avoid rate limits
-        tasks.append(fetch_youtube_videos(channel_id=channel["id"], max_results=5))
-    
-    # Fetch from search queries
-    for query in YOUTUBE_SEARCH_QUERIES[:3]:
-        tasks.append(fetch_youtube_videos(query=query, max_results=5))
-    
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    all_videos = []
-    seen_ids = set()
-    
-    for result in results:
-        if isinstance(result, list):
-            for video in result:
-                if video["id"] not in seen_ids:
-                    seen_ids.add(video["id"])
-                    all_videos.append(video)
-        elif isinstance(result, Exception):
-            print(f"Error in YouTube fetch: {result}")
-    
-    # Sort by date
-    all_videos.sort(key=lambda x: x.get("published_at", ""), reverse=True)
-    
-    return all_videos[:50]  # Limit to 50 videos
-
-def get_mock_videos() -> List[Dict[str, Any]]:
-    """Return mock video data when API key is not available."""
-    return [
+    Dates are fixed so a refresh doesn't count the same mock videos as changed.
+    """
+    return [Video.from_dict(video) for video in [
         {
             "id": "dQw4w9WgXcQ",
             "title": "AI Research Breakthrough: Understanding Large Language Models",
             "description": "Exploring the latest advances in AI research and LLM capabilities.",
             "thumbnail": "https://img.youtube.com/vi/dQw4w9WgXcQ/maxresdefault.jpg",
             "channel": "OpenAI",
-            "published_at": datetime.now().isoformat(),
+            "published_at": "2024-10-15T16:00:00+00:00",
             "channel_id": "UCr0ail1RdXdusqeqco44loA"
         },
         {
@@ -126,8 +275,8 @@ def get_mock_videos() -> List[Dict[str, Any]]:
             "description": "DeepMind researchers discuss AI safety and alignment.",
             "thumbnail": "https://img.youtube.com/vi/jNQXAC9IVRw/maxresdefault.jpg",
             "channel": "DeepMind",
-            "published_at": datetime.now().isoformat(),
+            "published_at": "2024-10-11T19:45:00+00:00",
             "channel_id": "UC0e3QhIYukixgh5VVpKHH9Q"
         }
-    ]
+    ]]
 
@@ -0,0 +1,121 @@
+import asyncio
+import random
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import httpx
+
+# Statuses worth retrying: rate limiting and transient upstream failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class HostPolicy:
+    """Connection limit, timeout and retry policy for one upstream host."""
+
+    def __init__(self, max_connections: int = 6, timeout: float = 10.0, retries: int = 2, backoff: float = 0.5):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+DEFAULT_POLICY = HostPolicy()
+
+HOST_POLICIES: Dict[str, HostPolicy] = {
+    "news.google.com": HostPolicy(max_connections=4),
+    "techcrunch.com": HostPolicy(max_connections=4),
+    # Paid/quota-limited APIs: don't spend quota on aggressive retries
+    "newsapi.org": HostPolicy(max_connections=2, retries=1),
+    "api.bing.microsoft.com": HostPolicy(max_connections=2, retries=1),
+    # Every YouTube attempt costs quota that QuotaBudget charges once per call, so none are retried
+    "www.googleapis.com": HostPolicy(max_connections=4, retries=0),
+}
+
+# Article pages come from arbitrary hosts and are fetched on demand
+CONTENT_POLICY = HostPolicy(max_connections=2, timeout=15.0, retries=1)
+
+class HTTPClientManager:
+    """One app-scoped HTTP/2 keep-alive client shared by every fetcher."""
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        # Held only while a request is waiting or running, so hosts seen once don't accumulate
+        self._host_limits: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = weakref.WeakValueDictionary()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily so fetchers also work outside the app lifespan (scripts, shell)
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                follow_redirects=True,
+                timeout=DEFAULT_POLICY.timeout,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=90.0),
+            )
+        return self._client
+
+    def policy_for(self, host: str) -> HostPolicy:
+        return HOST_POLICIES.get(host, DEFAULT_POLICY)
+
+    def _host_limit(self, host: str, policy: HostPolicy) -> asyncio.Semaphore:
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(policy.max_connections)
+        return limit
+
+    async def get(self, url: str, policy: Optional[HostPolicy] = None, **kwargs) -> httpx.Response:
+        """GET with the host's connection limit, timeout and retry policy applied.
+
+        The last response is returned even if its status is an error, so callers
+        keep using raise_for_status() as before.
+        """
+        return await self._with_policy(url, policy, lambda: self.client.get(url, **kwargs), kwargs)
+
+    async def get_capped(self, url: str, max_bytes: int, policy: Optional[HostPolicy] = None,
+                         **kwargs) -> Tuple[httpx.Response, bytes, bool]:
+        """Stream a GET, keeping at most max_bytes of the body.
+
+        Returns (response, body, truncated). The connection is dropped once the cap is
+        reached, and error responses are returned without reading their body.
+        """
+        async def send() -> Tuple[httpx.Response, bytes, bool]:
+            async with self.client.stream("GET", url, **kwargs) as response:
+                chunks: List[bytes] = []
+                size = 0
+                truncated = False
+                if response.is_success:
+                    async for chunk in response.aiter_bytes():
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= max_bytes:
+                            truncated = size > max_bytes
+                            break
+                return response, b"".join(chunks)[:max_bytes], truncated
+
+        return await self._with_policy(url, policy, send, kwargs, status=lambda result: result[0].status_code)
+
+    async def _with_policy(self, url: str, policy: Optional[HostPolicy], send: Callable[[], Awaitable[Any]],
+                           kwargs: Dict[str, Any], status: Callable[[Any], int] = lambda r: r.status_code) -> Any:
+        host = urlsplit(url).hostname or ""
+        policy = policy or self.policy_for(host)
+        # send() closes over the caller's kwargs, so the default timeout reaches it
+        kwargs.setdefault("timeout", policy.timeout)
+
+        attempt = 0
+        while True:
+            try:
+                async with self._host_limit(host, policy):
+                    result = await send()
+                if status(result) not in RETRY_STATUSES or attempt >= policy.retries:
+                    return result
+            except httpx.TransportError:
+                if attempt >= policy.retries:
+                    raise
+            attempt += 1
+            await asyncio.sleep(policy.backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+# Global HTTP client manager
+http = HTTPClientManager()
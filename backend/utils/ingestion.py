@@ -0,0 +1,437 @@
+import asyncio
+import random
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Awaitable, NamedTuple, Optional, Tuple
+from utils.fetch_rss import rss_feed_stats
+from utils.fetch_youtube import fetch_all_youtube_videos, youtube
+from utils.article_store import ArticleStore, short_hash
+from utils.models import Article, Video
+from utils.search_index import SearchIndex
+from utils.related import RelatedIndex
+from utils.persistence import SnapshotDB, snapshot_db
+from utils.leader import LeaderLock
+from utils.changes import ChangeLog
+from utils.fanout import fanout
+from utils.sources import SourceConfig, SourceScheduler, load_sources
+from utils.content_pipeline import ContentPipeline, content_pipeline
+from utils.responses import PreparedBody, prepare_json
+from utils.paging import SortedView, EMPTY_VIEW
+
+
+class Snapshot(NamedTuple):
+    """Immutable result of one ingestion cycle. Routers only ever read from this."""
+    version: int
+    built_at: Optional[datetime]
+    # Views share the store's Article objects rather than copies
+    articles: Tuple[Article, ...]
+    trending: Tuple[Article, ...]
+    important: Tuple[Article, ...]
+    videos: Tuple[Video, ...]
+    # Response bodies for the unfiltered list endpoints, serialized once per snapshot
+    bodies: Dict[str, PreparedBody]
+    # The same lists with their sort keys, for cursor paging
+    views: Dict[str, SortedView]
+    # Article ID -> IDs of its most related articles, best first
+    related: Dict[str, Tuple[str, ...]]
+
+
+def prepare_bodies(articles: Tuple, trending: Tuple, important: Tuple, videos: Tuple) -> Dict[str, PreparedBody]:
+    # Trending and important share the article objects of the full list, so each is rendered once
+    rendered = {id(article): article.to_dict() for article in articles}
+    def render(view: Tuple) -> List[Dict[str, Any]]:
+        return [rendered.get(id(article)) or article.to_dict() for article in view]
+    return {
+        "news_all": prepare_json({"articles": render(articles), "count": len(articles)}),
+        "news_trending": prepare_json({"articles": render(trending), "count": len(trending)}),
+        "news_important": prepare_json({"articles": render(important), "count": len(important)}),
+        "videos": prepare_json({"videos": videos, "count": len(videos)}),
+    }
+
+
+EMPTY_SNAPSHOT = Snapshot(version=0, built_at=None, articles=(), trending=(), important=(), videos=(),
+                          bodies=prepare_bodies((), (), (), ()),
+                          views={name: EMPTY_VIEW for name in ("news_all", "news_trending", "news_important", "videos")},
+                          related={})
+
+
+def video_view(videos: List[Video]) -> SortedView:
+    """Videos newest first, keyed like articles so they page the same way."""
+    return SortedView.build(((-video.published, video.id), video) for video in videos)
+
+
+# Articles restored into the store per event-loop turn at startup
+RESTORE_CHUNK = 200
+# Partial fetch results arriving within this many seconds are published together
+PARTIAL_PUBLISH_DELAY = 0.25
+# How often a follower worker checks for a newer persisted snapshot and a vacant leader lock
+FOLLOWER_POLL_SECONDS = 5.0
+
+
+class Source:
+    """A periodically refreshed upstream with its own interval, jitter and backoff."""
+
+    def __init__(self, name: str, fetch: Callable[[], Awaitable[List[Dict[str, Any]]]],
+                 interval: float, kind: str = "articles", jitter: float = 0.1, max_backoff: float = 3600.0,
+                 schedule: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.fetch = fetch
+        self.kind = kind
+        self.interval = interval
+        # Optional callback returning the current interval, for sources paced by an API budget
+        self.schedule = schedule
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.items: List[Dict[str, Any]] = []
+        self.failures = 0
+        self.last_success: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_duration: Optional[float] = None
+
+    def current_interval(self) -> float:
+        return self.schedule() if self.schedule is not None else self.interval
+
+    def next_delay(self) -> float:
+        """Seconds until the next poll: the interval on success, exponential backoff on failure."""
+        interval = self.current_interval()
+        if self.failures:
+            delay = min(interval * (2 ** (self.failures - 1)), self.max_backoff)
+        else:
+            delay = interval
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "items": len(self.items),
+            "failures": self.failures,
+            "last_success": datetime.fromtimestamp(self.last_success).isoformat() if self.last_success else None,
+            "last_error": self.last_error,
+            "last_duration_ms": round(self.last_duration * 1000, 1) if self.last_duration is not None else None,
+        }
+
+
+class Ingestor:
+    """Refreshes every source in the background and publishes immutable snapshots."""
+
+    def __init__(self, db: SnapshotDB = snapshot_db, leader: Optional[LeaderLock] = None,
+                 content: ContentPipeline = content_pipeline):
+        self.db = db
+        self.content = content
+        # Only the worker holding the lock polls upstreams; the others follow the database
+        self.leader = leader or LeaderLock()
+        self.following = False
+        self._synced_version: Optional[int] = None
+        self.snapshot: Snapshot = EMPTY_SNAPSHOT
+        self.store = ArticleStore()
+        # Article feeds and APIs come from sources.json and are polled by the scheduler
+        self.scheduler = SourceScheduler(*load_sources(), on_result=self._merge_partial, db=db)
+        self.sources: Dict[str, Source] = {
+            # Paced so the day's YouTube quota spend stays within YOUTUBE_DAILY_BUDGET
+            "youtube": Source("youtube", fetch_all_youtube_videos, interval=90 * 60, kind="videos",
+                              schedule=youtube.interval),
+        }
+        self.last_upsert: Dict[str, Dict[str, int]] = {}
+        # Search indexes are updated alongside each snapshot with only what changed
+        self.news_index = SearchIndex({"title": 3.0, "source": 1.5, "description": 1.0})
+        self.video_index = SearchIndex({"title": 3.0, "channel": 1.5, "description": 1.0})
+        self.videos_by_id: Dict[str, Video] = {}
+        # Related-articles graph, keyed by article ID and updated within a CPU budget per publish
+        self.related = RelatedIndex()
+        self._related_retry: Optional[asyncio.TimerHandle] = None
+        self._partial_publish: Optional[asyncio.TimerHandle] = None
+        # Per-snapshot article changes, for clients that follow the feed instead of re-polling it
+        self.changes = ChangeLog()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        articles = self.load_persisted()
+        self._tasks.append(asyncio.create_task(self.changes.heartbeat(), name="changes-heartbeat"))
+        if not self.db.enabled or self.leader.try_acquire():
+            self._tasks.append(asyncio.create_task(self._boot(articles), name="ingest-boot"))
+        else:
+            self.following = True
+            self._tasks.append(asyncio.create_task(self._follow(), name="ingest-follow"))
+
+    def load_persisted(self) -> List[Tuple[float, Article]]:
+        """Publish the last persisted snapshot as is, so requests are served right after boot."""
+        started = time.perf_counter()
+        rows = self.db.load_articles()
+        videos = self.db.load_videos()
+        self._load_source_state(videos)
+        if not rows and not videos:
+            return []
+
+        articles = SortedView.build(((-a.published, a.id), a) for _, a in rows)
+        trending = articles.filter(lambda a: a.is_trending)
+        important = articles.filter(lambda a: a.is_important)
+        video_items = video_view(videos)
+        meta = self.db.load_meta("snapshot", {})
+        self.snapshot = Snapshot(
+            version=meta.get("version", 0),
+            built_at=datetime.fromisoformat(meta["built_at"]) if meta.get("built_at") else datetime.now(),
+            articles=articles.items,
+            trending=trending.items,
+            important=important.items,
+            videos=video_items.items,
+            bodies=prepare_bodies(articles.items, trending.items, important.items, video_items.items),
+            views={"news_all": articles, "news_trending": trending, "news_important": important, "videos": video_items},
+            related={k: tuple(v) for k, v in meta.get("related", {}).items()},
+        )
+        self.changes.reset(self.snapshot.version)
+        print(f"Loaded {len(rows)} articles and {len(videos)} videos from {self.db.path} "
+              f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return rows
+
+    def _load_source_state(self, videos: List[Video]) -> None:
+        for source in self.sources.values():
+            state = self.db.load_meta(f"source_{source.name}", {})
+            source.last_success = state.get("last_success")
+            if source.kind == "videos":
+                source.items = videos
+
+    async def _boot(self, rows: List[Tuple[float, Article]]) -> None:
+        """Rebuild the store and indexes from persisted articles, then start polling."""
+        if rows:
+            # Chunks keep the event loop responsive while thousands of articles are re-indexed
+            articles = [article for _, article in rows]
+            for i in range(0, len(articles), RESTORE_CHUNK):
+                self.store.upsert(articles[i:i + RESTORE_CHUNK])
+                await asyncio.sleep(0)
+            self.publish()
+        self._start_sources()
+
+    def _start_sources(self) -> None:
+        self.scheduler.load_state()
+        self._tasks.append(asyncio.create_task(self.scheduler.run(), name="ingest-scheduler"))
+        for source in self.sources.values():
+            self._tasks.append(asyncio.create_task(self._run(source, self._initial_delay(source)),
+                                                   name=f"ingest-{source.name}"))
+
+    async def _follow(self) -> None:
+        """Mirror the leader's persisted snapshots until the leader lock becomes free."""
+        while True:
+            try:
+                await self._sync_from_db()
+            except Exception as e:
+                print(f"Error syncing snapshot from {self.db.path}: {e}")
+            await asyncio.sleep(FOLLOWER_POLL_SECONDS)
+            if self.leader.try_acquire():
+                print("Ingestion leader lock acquired, taking over polling")
+                await self._sync_from_db()
+                self.following = False
+                # The follower didn't maintain the related graph; seed it from the store
+                for entry in self.store.entries.values():
+                    article = entry.article
+                    self.related.add(article["id"], article.get("title", ""), article.get("description", ""))
+                self._start_sources()
+                return
+
+    async def _sync_from_db(self) -> None:
+        meta = self.db.load_meta("snapshot", {})
+        version = meta.get("version")
+        if version is None or version == self._synced_version:
+            return
+        rows = self.db.load_articles()
+        articles = [article for _, article in rows]
+        # The leader's rows are served as they are, so every worker publishes the same bodies
+        for i in range(0, len(articles), RESTORE_CHUNK):
+            self.store.restore(articles[i:i + RESTORE_CHUNK])
+            await asyncio.sleep(0)
+        self.store.retain({article.id for article in articles})
+        self._load_source_state(self.db.load_videos())
+        self.publish(version=version, related={k: tuple(v) for k, v in meta.get("related", {}).items()})
+        self._synced_version = version
+
+    def _initial_delay(self, source: Source) -> float:
+        # Don't re-poll a source that was refreshed just before the restart
+        if source.last_success is None:
+            return 0.0
+        if source.kind == "videos" and not source.items:
+            return 0.0
+        return max(0.0, source.last_success + source.current_interval() - time.time())
+
+    async def stop(self) -> None:
+        self._cancel_partial_publish()
+        if self._related_retry is not None:
+            self._related_retry.cancel()
+            self._related_retry = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.leader.release()
+
+    async def _run(self, source: Source, initial_delay: float = 0.0) -> None:
+        if initial_delay:
+            await asyncio.sleep(initial_delay)
+        while True:
+            await self.refresh(source)
+            await asyncio.sleep(source.next_delay())
+
+    async def refresh(self, source: Source) -> None:
+        """Poll one source and republish. Failures keep the previous items."""
+        started = time.monotonic()
+        try:
+            items = await source.fetch()
+            if not items:
+                raise RuntimeError("no items returned")
+            source.items = items
+            if source.kind == "articles":
+                self.last_upsert[source.name] = self.store.upsert(items)
+            source.failures = 0
+            source.last_success = time.time()
+            source.last_error = None
+            self.db.save_meta(f"source_{source.name}", {"last_success": source.last_success})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            source.failures += 1
+            source.last_error = str(e)
+            print(f"Error refreshing source {source.name}: {e}")
+            return
+        finally:
+            source.last_duration = time.monotonic() - started
+
+        self._cancel_partial_publish()
+        self.publish()
+
+    def _merge_partial(self, source: SourceConfig, batch: List[Dict[str, Any]]) -> None:
+        self.last_upsert[source.name] = self.store.upsert(batch)
+        # Publishing costs the same whatever changed, so unchanged polls don't schedule one.
+        # Results landing together go out in one snapshot.
+        if self.store.has_changes and self._partial_publish is None:
+            def publish() -> None:
+                self._partial_publish = None
+                self.publish()
+            self._partial_publish = asyncio.get_running_loop().call_later(PARTIAL_PUBLISH_DELAY, publish)
+
+    def _cancel_partial_publish(self) -> None:
+        if self._partial_publish is not None:
+            self._partial_publish.cancel()
+            self._partial_publish = None
+
+    def publish(self, version: Optional[int] = None,
+                related: Optional[Dict[str, Tuple[str, ...]]] = None) -> None:
+        """Build a new snapshot from the article store and the latest videos.
+
+        Followers pass the leader's version and related graph and don't write anything back.
+        """
+        try:
+            # Followers don't re-flag trending articles themselves; the leader's next snapshot does
+            articles, trending, important = self.store.views(advance_window=not self.following)
+            videos = video_view([v for s in self.sources.values() if s.kind == "videos" for v in s.items])
+            saved, removed_ids, videos_changed = self._update_indexes(videos.items)
+            if version is None and not (saved or removed_ids or videos_changed or self.related.pending):
+                # e.g. a poll that only returned unchanged items: keep the current snapshot, bodies and caches
+                return
+            if related is None:
+                self._update_related()
+                related = self.related.graph()
+            self.snapshot = Snapshot(
+                version=self.snapshot.version + 1 if version is None else version,
+                built_at=datetime.now(),
+                articles=articles.items,
+                trending=trending.items,
+                important=important.items,
+                videos=videos.items,
+                bodies=prepare_bodies(articles.items, trending.items, important.items, videos.items),
+                views={"news_all": articles, "news_trending": trending, "news_important": important, "videos": videos},
+                related=related,
+            )
+            self.changes.record(self.snapshot.version, [article for _, _, article in saved], removed_ids)
+            if not self.following:
+                self.db.save_snapshot(saved, removed_ids, videos.items if videos_changed else None, {
+                    "version": self.snapshot.version,
+                    "built_at": self.snapshot.built_at.isoformat(),
+                    "related": related,
+                })
+                self._prefetch_content(saved)
+        except Exception as e:
+            print(f"Error publishing snapshot: {e}")
+            import traceback
+            traceback.print_exc()
+
+    def _update_indexes(self, videos: Tuple[Video, ...]) -> Tuple[List, List[str], bool]:
+        """Apply the store's and the videos' changes to the indexes.
+
+        Returns (changed articles as (id, published_ts, article), removed IDs, videos changed).
+        """
+        changed, removed = self.store.drain_changes()
+        removed_ids = [short_hash(key) for key in removed]
+        for key, article_id in zip(removed, removed_ids):
+            self.news_index.remove(key)
+            if not self.following:
+                self.related.remove(article_id)
+        saved = []
+        for key in changed:
+            entry = self.store.entries[key]
+            article = entry.article
+            self.news_index.add(key, article)
+            if not self.following:
+                self.related.add(article["id"], article.get("title", ""), article.get("description", ""))
+            saved.append((entry.id, entry.published_ts, article))
+
+        videos_by_id = {v["id"]: v for v in videos}
+        videos_changed = videos_by_id.keys() != self.videos_by_id.keys()
+        for video_id in self.videos_by_id.keys() - videos_by_id.keys():
+            self.video_index.remove(video_id)
+        for video_id, video in videos_by_id.items():
+            if self.videos_by_id.get(video_id) != video:
+                self.video_index.add(video_id, video)
+                videos_changed = True
+        self.videos_by_id = videos_by_id
+        return saved, removed_ids, videos_changed
+
+    def _prefetch_content(self, saved: List[Tuple[str, int, Article]]) -> None:
+        # Full text of new trending and important articles is fetched before anyone opens them
+        wanted = [(ts, article["link"]) for _, ts, article in saved
+                  if article.get("link") and (article.get("is_trending") or article.get("is_important"))]
+        wanted.sort(reverse=True)
+        self.content.enqueue(link for _, link in wanted)
+
+    def _update_related(self) -> None:
+        self.related.update()
+        # Work left over from a large refresh is finished in later publishes, one budget at a time
+        if self.related.pending and self._tasks and self._related_retry is None:
+            def retry() -> None:
+                self._related_retry = None
+                self.publish()
+            self._related_retry = asyncio.get_running_loop().call_later(1.0, retry)
+
+    def search(self, query: str, limit: int, offset: int) -> Dict[str, Any]:
+        """Search the latest articles and videos through the inverted indexes."""
+        news_total, news_keys = self.news_index.search(query, limit, offset)
+        videos_total, video_ids = self.video_index.search(query, limit, offset)
+        # The index catches up with the store at the next publish; skip articles evicted in between
+        entries = self.store.entries
+        return {
+            "news": [entries[key].article for key in news_keys if key in entries],
+            "videos": [self.videos_by_id[video_id] for video_id in video_ids],
+            "news_count": news_total,
+            "videos_count": videos_total,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        snapshot = self.snapshot
+        return {
+            "role": "follower" if self.following else "leader",
+            "snapshot_version": snapshot.version,
+            "snapshot_built_at": snapshot.built_at.isoformat() if snapshot.built_at else None,
+            "articles": len(snapshot.articles),
+            "last_upsert": self.last_upsert,
+            "videos": len(snapshot.videos),
+            "related": {"articles": len(self.related), "pending": self.related.pending},
+            "changes": self.changes.stats(),
+            "sources": [s.status() for s in self.sources.values()],
+            "scheduler": self.scheduler.summary(),
+            "rss_feeds": rss_feed_stats(),
+            "youtube": youtube.stats(),
+            "upstreams": fanout.stats(),
+        }
+
+
+# Global ingestor instance
+ingestor = Ingestor()
@@ -0,0 +1,59 @@
+import os
+from pathlib import Path
+from typing import Optional
+
+# Workers that share this lock file elect one ingestion leader among themselves
+LOCK_PATH = os.getenv("INGEST_LOCK_PATH", str(Path(__file__).resolve().parent.parent / "data" / "ingest.lock"))
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+class LeaderLock:
+    """Non-blocking exclusive lock on a file, held for as long as the process lives.
+
+    The OS releases the lock when the holder exits or crashes, so another worker can
+    take over on its next attempt.
+    """
+
+    def __init__(self, path: str = LOCK_PATH):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        # Record the holder for humans looking at the file
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,178 @@
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from utils.clean_data import PLACEHOLDER_IMAGES, parse_date
+
+# Placeholder URL -> the one shared copy, without adding them to the interpreter's intern table
+_PLACEHOLDERS = {url: url for url in PLACEHOLDER_IMAGES}
+
+def intern(value: Any) -> Any:
+    """Share one copy of strings that repeat across items, such as source and channel names.
+
+    Only for values from a small set: interned strings are never freed on Python 3.12+.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+def to_epoch(value: Any) -> int:
+    """Whole epoch seconds from an ISO/RFC date string; now if it can't be parsed."""
+    if isinstance(value, int):
+        return value
+    try:
+        return int(parse_date(value).timestamp())
+    except Exception:
+        return int(time.time())
+
+def to_iso(ts: int) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+class Model:
+    """Slotted record that reads like the dict it replaces.
+
+    item["title"], item.get("title"), "title" in item and {**item} work as before, and JSON
+    output (see utils.responses.dumps) has the same keys in the same order.
+    """
+    __slots__ = ()
+    # Public keys in JSON order; computed ones are properties
+    KEYS: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.KEYS else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.KEYS
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.KEYS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.KEYS}
+
+    def replace(self, **changes: Any) -> "Model":
+        """Copy with some slots changed. Published items are never mutated in place."""
+        copy = object.__new__(type(self))
+        for slot in self.__slots__:
+            object.__setattr__(copy, slot, changes[slot] if slot in changes else getattr(self, slot))
+        return copy
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class Article(Model):
+    """A published article. The date is kept as epoch seconds and rendered on output.
+
+    copies holds (link, source) of the syndicated copies grouped under this article.
+    """
+    __slots__ = ("id", "title", "description", "link", "published", "source", "author", "image",
+                 "is_trending", "is_important", "cluster_size", "copies")
+    KEYS = ("title", "description", "link", "published_at", "source", "author", "image",
+            "id", "is_trending", "is_important", "cluster_id", "cluster_size", "duplicates")
+
+    def __init__(self, id: str, title: str, description: str, link: str, published: int, source: str,
+                 author: Optional[str], image: Optional[str], is_trending: bool = False,
+                 is_important: bool = False, cluster_size: int = 1,
+                 copies: Tuple[Tuple[str, str], ...] = ()):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.link = link
+        self.published = published
+        self.source = intern(source)
+        self.author = author
+        self.image = _PLACEHOLDERS.get(image, image)
+        self.is_trending = is_trending
+        self.is_important = is_important
+        self.cluster_size = cluster_size
+        self.copies = copies
+
+    @property
+    def published_at(self) -> str:
+        return to_iso(self.published)
+
+    @property
+    def cluster_id(self) -> str:
+        # Syndicated copies are grouped under the article that was seen first
+        return self.id
+
+    @property
+    def duplicates(self) -> List[Dict[str, str]]:
+        return [{"link": link, "source": source} for link, source in self.copies]
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Spelled out: this runs for every article in every serialized list
+        return {
+            "title": self.title,
+            "description": self.description,
+            "link": self.link,
+            "published_at": to_iso(self.published),
+            "source": self.source,
+            "author": self.author,
+            "image": self.image,
+            "id": self.id,
+            "is_trending": self.is_trending,
+            "is_important": self.is_important,
+            "cluster_id": self.id,
+            "cluster_size": self.cluster_size,
+            "duplicates": [{"link": link, "source": source} for link, source in self.copies],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Article":
+        """Rebuild a published article, e.g. one loaded from the database."""
+        return cls(
+            id=data["id"],
+            title=data.get("title", ""),
+            description=data.get("description", ""),
+            link=data.get("link", ""),
+            published=to_epoch(data.get("published_at", "")),
+            source=data.get("source", ""),
+            author=data.get("author", ""),
+            image=data.get("image"),
+            is_trending=bool(data.get("is_trending")),
+            is_important=bool(data.get("is_important")),
+            cluster_size=data.get("cluster_size", 1),
+            copies=tuple((d.get("link", ""), intern(d.get("source", ""))) for d in data.get("duplicates", ())),
+        )
+
+class Video(Model):
+    """A YouTube video, with its date kept as epoch seconds."""
+    __slots__ = ("id", "title", "description", "thumbnail", "channel", "published", "channel_id")
+    KEYS = ("id", "title", "description", "thumbnail", "channel", "published_at", "channel_id")
+
+    def __init__(self, id: str, title: str, description: str, thumbnail: str, channel: str,
+                 published: int, channel_id: str):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.thumbnail = thumbnail
+        self.channel = intern(channel)
+        self.published = published
+        self.channel_id = intern(channel_id)
+
+    @property
+    def published_at(self) -> str:
+        return to_iso(self.published)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Video":
+        return cls(
+            id=data.get("id", ""),
+            title=data.get("title", ""),
+            description=data.get("description", ""),
+            thumbnail=data.get("thumbnail", ""),
+            channel=data.get("channel", ""),
+            published=to_epoch(data.get("published_at", "")),
+            channel_id=data.get("channel_id", ""),
+        )
@@ -0,0 +1,59 @@
+import bisect
+import math
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# (-published timestamp, id): sorts newest first, ties broken by ID so the order is total
+SortKey = Tuple[float, str]
+
+# Sorts after any ID, used as an upper bound when bisecting
+MAX_ID = "\U0010ffff"
+
+def encode_cursor(key: SortKey) -> str:
+    # repr() round-trips the float exactly, so the cursor lands on the same position
+    return f"{repr(-key[0])}_{key[1]}"
+
+def decode_cursor(cursor: str) -> SortKey:
+    """Parse a cursor from encode_cursor(). Raises ValueError if it is malformed."""
+    ts, sep, item_id = cursor.partition("_")
+    if not sep or not item_id:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    value = float(ts)
+    # float() also accepts "nan" and "inf", which don't sort and would page arbitrarily
+    if not math.isfinite(value):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return (-value, item_id)
+
+def project(item: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    return {field: item[field] for field in fields if field in item}
+
+class SortedView(NamedTuple):
+    """Items of one snapshot view with their sort keys, for O(log n + k) paging."""
+    items: Tuple[Dict[str, Any], ...]
+    keys: Tuple[SortKey, ...]
+
+    @classmethod
+    def build(cls, pairs: Iterable[Tuple[SortKey, Dict[str, Any]]]) -> "SortedView":
+        pairs = sorted(pairs, key=lambda pair: pair[0])
+        return cls(tuple(item for _, item in pairs), tuple(key for key, _ in pairs))
+
+    def filter(self, predicate) -> "SortedView":
+        """Subset of this view; the order, and so the keys, are kept."""
+        kept = [(key, item) for key, item in zip(self.keys, self.items) if predicate(item)]
+        return SortedView(tuple(item for _, item in kept), tuple(key for key, _ in kept))
+
+    def page(self, limit: Optional[int] = None, cursor: Optional[str] = None,
+             since: Optional[float] = None) -> Tuple[Tuple[Dict[str, Any], ...], int, Optional[str]]:
+        """Return (items, total matching, next cursor) for items after cursor and newer than since."""
+        end = len(self.keys)
+        if since is not None:
+            # Items published strictly after `since` sort before (-since, "")
+            end = bisect.bisect_left(self.keys, (-since, ""))
+        start = 0
+        if cursor:
+            start = bisect.bisect_right(self.keys, decode_cursor(cursor))
+        stop = end if limit is None else min(end, start + limit)
+        items = self.items[start:stop]
+        next_cursor = encode_cursor(self.keys[stop - 1]) if items and stop < end else None
+        return items, end, next_cursor
+
+EMPTY_VIEW = SortedView(items=(), keys=())
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# "thread" is enough when the parsers release the GIL (lxml); "process" isolates pure-Python ones
+PARSE_EXECUTOR = os.getenv("PARSE_EXECUTOR", "thread")
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "2"))
+# Jobs allowed to wait for a worker before submitters are held back
+PARSE_QUEUE_SIZE = int(os.getenv("PARSE_QUEUE_SIZE", "32"))
+# Seconds a single job may run before the caller gives up on it
+PARSE_TIMEOUT = float(os.getenv("PARSE_TIMEOUT", "20"))
+
+class TaskTimings:
+    """Running counters for one kind of parse job."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.wait_ms = 0.0
+
+    def record(self, run_ms: float, wait_ms: float) -> None:
+        self.count += 1
+        self.total_ms += run_ms
+        self.max_ms = max(self.max_ms, run_ms)
+        self.wait_ms += wait_ms
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "avg_wait_ms": round(self.wait_ms / self.count, 2) if self.count else 0.0,
+        }
+
+class ParseExecutor:
+    """Bounded worker pool for CPU-bound parsing, kept off the event loop.
+
+    At most workers + queue_size jobs are in flight; further submitters wait for a
+    slot, so a burst of large feeds can't pile up unbounded work in the pool.
+    """
+
+    def __init__(self, kind: str = PARSE_EXECUTOR, workers: int = PARSE_WORKERS,
+                 queue_size: int = PARSE_QUEUE_SIZE, timeout: float = PARSE_TIMEOUT):
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.timeout = timeout
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.timings: Dict[str, TaskTimings] = {}
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="parse")
+        return self._executor
+
+    def _slot(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers + self.queue_size)
+        return self._slots
+
+    async def run(self, name: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on the pool and return its result. fn must be picklable for processes."""
+        timings = self.timings.setdefault(name, TaskTimings())
+        slots = self._slot()
+        queued = time.perf_counter()
+        await slots.acquire()
+        self.in_flight += 1
+        started = [0.0]
+
+        def job() -> Any:
+            started[0] = time.perf_counter()
+            return fn(*args)
+
+        def release(_future) -> None:
+            # The slot is held until the job really finishes, even if the caller timed out
+            self.in_flight -= 1
+            slots.release()
+
+        loop = asyncio.get_running_loop()
+        if self.kind == "process":
+            # Closures don't pickle; queue wait is measured up to submission instead
+            future = loop.run_in_executor(self.executor, fn, *args)
+            started[0] = time.perf_counter()
+        else:
+            future = loop.run_in_executor(self.executor, job)
+        future.add_done_callback(release)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            timings.timeouts += 1
+            raise
+        except Exception:
+            timings.errors += 1
+            raise
+        finished = time.perf_counter()
+        timings.record((finished - started[0]) * 1000, (started[0] - queued) * 1000)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "tasks": {name: t.stats() for name, t in self.timings.items()},
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._slots = None
+
+# Global parse executor instance
+parse_pool = ParseExecutor()
@@ -0,0 +1,160 @@
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from utils.models import Article, Video
+from utils.responses import dumps, loads
+
+# Set NEWS_DB_PATH to an empty string to run without persistence
+DB_PATH = os.getenv("NEWS_DB_PATH", str(Path(__file__).resolve().parent.parent / "data" / "news.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    published_ts REAL NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS videos (
+    id TEXT PRIMARY KEY,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS content (
+    url TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS video_meta (
+    id TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL
+);
+"""
+
+class SnapshotDB:
+    """SQLite copy of the ingestion results so a restart or a new worker starts warm.
+
+    Articles are written incrementally as the store changes; videos, extracted article
+    content, YouTube video metadata and small bits of state (snapshot version, per-source
+    last success, API quota use) are kept alongside. Errors are logged and never interrupt ingestion.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            # WAL lets other workers read while the ingesting one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _write(self, statements: Iterable[Tuple[str, Iterable[Tuple]]]) -> None:
+        if not self.enabled:
+            return
+        try:
+            conn = self.conn
+            conn.execute("BEGIN")
+            try:
+                for sql, rows in statements:
+                    conn.executemany(sql, rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except Exception as e:
+            print(f"Error writing to {self.path}: {e}")
+
+    def _read(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        if not self.enabled:
+            return []
+        try:
+            return self.conn.execute(sql, params).fetchall()
+        except Exception as e:
+            print(f"Error reading from {self.path}: {e}")
+            return []
+
+    def save_snapshot(self, changed: List[Tuple[str, float, Dict[str, Any]]], removed: List[str],
+                      videos: Optional[Iterable[Dict[str, Any]]], meta: Dict[str, Any]) -> None:
+        """Write one published snapshot in a single transaction, so readers never see half of it.
+
+        changed holds (id, published_ts, article) upserts; videos is None when unchanged.
+        """
+        statements = [
+            ("DELETE FROM articles WHERE id = ?", [(article_id,) for article_id in removed]),
+            ("INSERT OR REPLACE INTO articles (id, published_ts, body) VALUES (?, ?, ?)",
+             [(article_id, ts, dumps(article)) for article_id, ts, article in changed]),
+        ]
+        if videos is not None:
+            statements += [
+                ("DELETE FROM videos", [()]),
+                ("INSERT OR REPLACE INTO videos (id, body) VALUES (?, ?)",
+                 [(str(video.get("id", "")), dumps(video)) for video in videos]),
+            ]
+        statements.append(("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [("snapshot", dumps(meta))]))
+        self._write(statements)
+
+    def load_articles(self) -> List[Tuple[float, Article]]:
+        """Return (published_ts, article), newest first."""
+        rows = self._read("SELECT published_ts, body FROM articles ORDER BY published_ts DESC, id")
+        return [(ts, Article.from_dict(loads(body))) for ts, body in rows]
+
+    def load_videos(self) -> List[Video]:
+        return [Video.from_dict(loads(body)) for (body,) in self._read("SELECT body FROM videos")]
+
+    def save_content(self, url: str, content: Dict[str, Any]) -> None:
+        self._write([
+            ("INSERT OR REPLACE INTO content (url, fetched_at, body) VALUES (?, ?, ?)",
+             [(url, time.time(), dumps(content))]),
+        ])
+
+    def load_content(self, url: str, max_age_seconds: float) -> Optional[Dict[str, Any]]:
+        rows = self._read("SELECT fetched_at, body FROM content WHERE url = ?", (url,))
+        if not rows or time.time() - rows[0][0] > max_age_seconds:
+            return None
+        return loads(rows[0][1])
+
+    def prune_content(self, max_age_seconds: float) -> None:
+        self._write([("DELETE FROM content WHERE fetched_at < ?", [(time.time() - max_age_seconds,)])])
+
+    def save_video_meta(self, videos: Iterable[Dict[str, Any]]) -> None:
+        now = time.time()
+        self._write([
+            ("INSERT OR REPLACE INTO video_meta (id, fetched_at, body) VALUES (?, ?, ?)",
+             [(str(video["id"]), now, dumps(video)) for video in videos]),
+        ])
+
+    def load_video_meta(self, max_age_seconds: float) -> Dict[str, Video]:
+        """Cached YouTube video metadata by video ID; older entries are dropped."""
+        self._write([("DELETE FROM video_meta WHERE fetched_at < ?", [(time.time() - max_age_seconds,)])])
+        return {video_id: Video.from_dict(loads(body)) for video_id, body in self._read("SELECT id, body FROM video_meta")}
+
+    def save_meta(self, key: str, value: Any) -> None:
+        self._write([("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [(key, dumps(value))])])
+
+    def load_meta(self, key: str, default: Any = None) -> Any:
+        rows = self._read("SELECT value FROM meta WHERE key = ?", (key,))
+        return loads(rows[0][0]) if rows else default
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+# Global snapshot database instance
+snapshot_db = SnapshotDB()
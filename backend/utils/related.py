@@ -0,0 +1,149 @@
+import heapq
+import math
+import time
+from typing import Dict, FrozenSet, Hashable, List, Set, Tuple
+from utils.search_index import tokenize
+
+# Words too common in headlines to say two stories are related
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have how in into is it its new of on or says than that the
+their this to was what when why will with after about over more you your can could
+""".split())
+
+class RelatedIndex:
+    """Incrementally maintained top-K related-articles graph.
+
+    Articles are sets of title/description tokens. Candidates come from an inverted
+    index in which terms found in more than max_df documents are skipped, so scoring a
+    new article touches at most max_df postings per term, however large the corpus grows,
+    instead of every other article. Scores are IDF-weighted cosine similarity. Adding an article also
+    offers it to its candidates' neighbour lists, so existing lists stay current
+    without being recomputed.
+    """
+
+    def __init__(self, k: int = 5, max_df: int = 50, min_score: float = 0.15, budget_ms: float = 250.0):
+        self.k = k
+        # An absolute cap: one relative to the corpus size lets each posting read grow with it
+        self.max_df = max_df
+        self.min_score = min_score
+        self.budget_ms = budget_ms
+        self.terms: Dict[Hashable, FrozenSet[str]] = {}
+        self.postings: Dict[str, Set[Hashable]] = {}
+        # doc -> [(score, neighbour)], best first, at most k long
+        self.neighbors: Dict[Hashable, List[Tuple[float, Hashable]]] = {}
+        # IDF norm of each doc as of its last computation; drifts slightly as df changes
+        self.norms: Dict[Hashable, float] = {}
+        # doc -> docs whose neighbour lists contain it
+        self.referrers: Dict[Hashable, Set[Hashable]] = {}
+        # Docs waiting for their neighbour lists to be (re)computed, in arrival order
+        self._pending: Dict[Hashable, None] = {}
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, doc_id: Hashable, title: str, description: str = "") -> None:
+        terms = frozenset(
+            token for token in tokenize(f"{title} {description}")
+            if len(token) > 2 and token not in STOPWORDS
+        )
+        if self.terms.get(doc_id) == terms:
+            return
+        self.remove(doc_id)
+        self.terms[doc_id] = terms
+        for term in terms:
+            self.postings.setdefault(term, set()).add(doc_id)
+        self.neighbors[doc_id] = []
+        self._pending[doc_id] = None
+
+    def remove(self, doc_id: Hashable) -> None:
+        terms = self.terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self.postings[term]
+            posting.discard(doc_id)
+            if not posting:
+                del self.postings[term]
+        self._pending.pop(doc_id, None)
+        self.norms.pop(doc_id, None)
+        for _, other in self.neighbors.pop(doc_id, ()):
+            self.referrers.get(other, set()).discard(doc_id)
+        # Lists that pointed here have a free slot now; refill them
+        for other in self.referrers.pop(doc_id, ()):
+            self.neighbors[other] = [(s, n) for s, n in self.neighbors[other] if n != doc_id]
+            self._pending[other] = None
+
+    def update(self) -> int:
+        """Compute pending neighbour lists until the CPU budget is spent. Returns how many."""
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        done = 0
+        while self._pending and time.perf_counter() < deadline:
+            doc_id = next(iter(self._pending))
+            del self._pending[doc_id]
+            self._compute(doc_id)
+            done += 1
+        return done
+
+    def related(self, doc_id: Hashable) -> List[Hashable]:
+        return [other for _, other in self.neighbors.get(doc_id, ())]
+
+    def graph(self) -> Dict[Hashable, Tuple[Hashable, ...]]:
+        return {doc_id: tuple(other for _, other in items) for doc_id, items in self.neighbors.items() if items}
+
+    def _compute(self, doc_id: Hashable) -> None:
+        n = len(self.terms)
+        cap = self.max_df
+        idf: Dict[str, float] = {}
+        for term in self.terms[doc_id]:
+            df = len(self.postings[term])
+            if 1 < df <= cap:
+                idf[term] = math.log(1 + n / df)
+        norm = self.norms[doc_id] = math.sqrt(sum(w * w for w in idf.values()))
+        if not idf:
+            self._set_neighbors(doc_id, [])
+            return
+
+        overlap: Dict[Hashable, float] = {}
+        for term, weight in idf.items():
+            for other in self.postings[term]:
+                if other != doc_id:
+                    overlap[other] = overlap.get(other, 0.0) + weight * weight
+
+        scored = []
+        for other, dot in overlap.items():
+            other_norm = self.norms.get(other)
+            if other_norm is None:
+                other_norm = self.norms[other] = self._norm(other, n, cap)
+            score = dot / (norm * other_norm) if other_norm else 0.0
+            if score >= self.min_score:
+                scored.append((score, other))
+                self._offer(other, doc_id, score)
+        self._set_neighbors(doc_id, heapq.nlargest(self.k, scored))
+
+    def _norm(self, doc_id: Hashable, n: int, cap: int) -> float:
+        total = 0.0
+        for term in self.terms[doc_id]:
+            df = len(self.postings[term])
+            if 1 < df <= cap:
+                total += math.log(1 + n / df) ** 2
+        return math.sqrt(total)
+
+    def _set_neighbors(self, doc_id: Hashable, items: List[Tuple[float, Hashable]]) -> None:
+        for _, other in self.neighbors.get(doc_id, ()):
+            self.referrers.get(other, set()).discard(doc_id)
+        self.neighbors[doc_id] = items
+        for _, other in items:
+            self.referrers.setdefault(other, set()).add(doc_id)
+
+    def _offer(self, doc_id: Hashable, candidate: Hashable, score: float) -> None:
+        """Put candidate into doc_id's list if it scores among the top k."""
+        items = [(s, n) for s, n in self.neighbors.get(doc_id, ()) if n != candidate]
+        if len(items) >= self.k and score <= items[-1][0]:
+            return
+        items.append((score, candidate))
+        items.sort(reverse=True)
+        self._set_neighbors(doc_id, items[:self.k])
@@ -0,0 +1,182 @@
+import gzip
+import hashlib
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from fastapi import HTTPException, Query, Request, Response
+from utils.cache import Cache
+from utils.paging import SortedView, project
+
+def _default(value: Any) -> Any:
+    # Article and Video models serialize as the dicts they replaced
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if to_dict is not None else str(value)
+
+try:
+    import orjson
+
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=_default)
+
+    loads = orjson.loads
+except ImportError:
+    import json
+
+    def dumps(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=_default).encode("utf-8")
+
+    loads = json.loads
+
+# Brotli is optional; without it clients get gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this aren't worth compressing
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+class PreparedBody:
+    """A JSON body serialized and compressed once, with a strong ETag over its content."""
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self.digest = hashlib.blake2b(raw, digest_size=12).hexdigest()
+        self.encoded: Dict[str, bytes] = {"identity": raw}
+        if len(raw) >= MIN_COMPRESS_BYTES:
+            self.encoded["gzip"] = gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+            if brotli is not None:
+                self.encoded["br"] = brotli.compress(raw, quality=BROTLI_QUALITY)
+
+    def __sizeof__(self) -> int:
+        # Lets the caches' byte budgets see the encoded bodies
+        return object.__sizeof__(self) + sum(len(body) for body in self.encoded.values())
+
+    def etag(self, encoding: str) -> str:
+        # Each encoding is a different representation, so it gets its own strong ETag
+        return f'"{self.digest}"' if encoding == "identity" else f'"{self.digest}-{encoding}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            # If-None-Match uses weak comparison; a proxy may have weakened our tag
+            tag = tag[2:] if tag.startswith("W/") else tag
+            tag = tag.strip('"')
+            if tag.split("-", 1)[0] == self.digest:
+                return True
+        return False
+
+def prepare_json(payload: Any) -> PreparedBody:
+    return PreparedBody(dumps(payload))
+
+def extend_json(body: PreparedBody, **fields: Any) -> PreparedBody:
+    """A prepared JSON object with fields put in front, reusing its serialized bytes."""
+    if not fields:
+        return body
+    # Both bodies are compact objects: drop the head's "}" and the body's "{"
+    return PreparedBody(dumps(fields)[:-1] + b"," + body.raw[1:])
+
+def _accepted_encodings(header: Optional[str]) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+def pick_encoding(body: PreparedBody, accept_encoding: Optional[str]) -> str:
+    accepted = _accepted_encodings(accept_encoding)
+    for encoding in ("br", "gzip"):
+        if encoding in body.encoded and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return "identity"
+
+def prepared_response(request: Request, body: PreparedBody) -> Response:
+    """Serve a prepared body: 304 if the client's copy is current, else the best encoding."""
+    encoding = pick_encoding(body, request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": body.etag(encoding),
+        "Vary": "Accept-Encoding",
+        # Clients may keep the body but must revalidate it, which is a cheap 304
+        "Cache-Control": "no-cache",
+    }
+    if body.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body.encoded[encoding], media_type="application/json", headers=headers)
+
+def parse_since(since: str) -> float:
+    """Timestamp from an ISO-8601 datetime or epoch seconds."""
+    try:
+        value = float(since)
+    except ValueError:
+        pass
+    else:
+        # float() also accepts "nan" and "inf", which would silently match nothing
+        if not math.isfinite(value):
+            raise HTTPException(status_code=400, detail=f"Invalid since: {since!r}")
+        return value
+    try:
+        parsed = datetime.fromisoformat(since[:-1] + "+00:00" if since.endswith("Z") else since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid since: {since!r}")
+    return (parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed).timestamp()
+
+class PageParams:
+    """Query parameters shared by the paged list endpoints."""
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=500, description="Maximum number of items"),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        since: Optional[str] = Query(None, description="Only items published after this ISO-8601 time or epoch"),
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,link"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.since = since
+        self.fields = fields
+
+    @property
+    def is_default(self) -> bool:
+        return self.limit is None and not self.cursor and not self.since and not self.fields
+
+    def cache_key(self, prefix: str) -> str:
+        return f"{prefix}_{self.limit}_{self.cursor}_{self.since}_{self.fields}"
+
+def paged_response(request: Request, cache: Cache, cache_prefix: str, view: SortedView, list_key: str,
+                   params: PageParams) -> Response:
+    """Serve one page of a snapshot view, optionally projected to some fields.
+
+    Pages are prepared like full bodies and cached per snapshot (cache_prefix must include
+    the snapshot version), so repeated page views get the same ETag/304 and compression.
+    """
+    cache_key = params.cache_key(cache_prefix)
+    body = cache.get(cache_key)
+    if body is None:
+        try:
+            since = parse_since(params.since) if params.since else None
+            items, total, next_cursor = view.page(params.limit, params.cursor, since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {params.cursor!r}")
+        if params.fields:
+            wanted = [field.strip() for field in params.fields.split(",") if field.strip()]
+            items = [project(item, wanted) for item in items]
+        body = prepare_json({list_key: items, "count": len(items), "total": total, "next_cursor": next_cursor})
+        cache.set(cache_key, body)
+    return prepared_response(request, body)
@@ -0,0 +1,226 @@
+import bisect
+import heapq
+import math
+import re
+from typing import Dict, Hashable, List, Set, Tuple
+
+TOKEN_RE = re.compile(r"\w+")
+# Quoted phrases, the OR operator, or single words
+QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+# Keeps positions of different fields apart so a phrase can't span two fields
+FIELD_GAP = 100_000
+# Upper bound on vocabulary terms a type-ahead prefix expands to
+MAX_PREFIX_EXPANSIONS = 50
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(str(text).lower())
+
+class Clause:
+    """One query term: a word (optionally a prefix) or a quoted phrase."""
+
+    def __init__(self, tokens: List[str], prefix: bool = False):
+        self.tokens = tokens
+        self.prefix = prefix
+
+def parse_query(query: str) -> List[List[Clause]]:
+    """Parse into AND-ed groups of OR-ed clauses.
+
+    `a b OR c "d e"` means a AND (b OR c) AND the phrase "d e". The last bare word is
+    matched as a prefix unless the query ends in whitespace, for type-ahead.
+    """
+    groups: List[List[Clause]] = []
+    pending_or = False
+    matches = list(QUERY_RE.finditer(query))
+    for i, m in enumerate(matches):
+        phrase, word = m.group(1), m.group(2)
+        if word == "OR":
+            pending_or = bool(groups)
+            continue
+        tokens = tokenize(phrase if phrase is not None else word)
+        if not tokens:
+            continue
+        is_last = i == len(matches) - 1
+        if phrase is None and len(tokens) > 1:
+            # Words like "gpt-4" tokenize to several tokens; treat them as a phrase
+            clause = Clause(tokens)
+        else:
+            clause = Clause(tokens, prefix=phrase is None and is_last and not query[-1:].isspace())
+        if pending_or:
+            groups[-1].append(clause)
+        else:
+            groups.append([clause])
+        pending_or = False
+    return groups
+
+class SearchIndex:
+    """Incremental in-memory inverted index with BM25 ranking over weighted fields."""
+
+    def __init__(self, fields: Dict[str, float], k1: float = 1.2, b: float = 0.75):
+        self.fields = fields
+        self.k1 = k1
+        self.b = b
+        # term -> doc_id -> (field-weighted term frequency, positions)
+        self.postings: Dict[str, Dict[Hashable, Tuple[float, Tuple[int, ...]]]] = {}
+        self.doc_terms: Dict[Hashable, Set[str]] = {}
+        self.doc_len: Dict[Hashable, float] = {}
+        self.total_len = 0.0
+        # Sorted vocabulary for prefix lookups
+        self.vocab: List[str] = []
+        # Per-term BM25 scores and rankings, valid until the next add/remove. The index
+        # changes once per refresh while it is queried many times in between.
+        self._scores: Dict[str, Dict[Hashable, float]] = {}
+        self._prefix_scores: Dict[str, Dict[Hashable, float]] = {}
+        self._ranked: Dict[Tuple[str, bool], List[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self.doc_len)
+
+    def add(self, doc_id: Hashable, doc: Dict[str, str]) -> None:
+        """Index a document, replacing any previous version with the same ID."""
+        if doc_id in self.doc_len:
+            self.remove(doc_id)
+        self._invalidate()
+
+        weighted: Dict[str, float] = {}
+        positions: Dict[str, List[int]] = {}
+        length = 0.0
+        for field_index, (field, weight) in enumerate(self.fields.items()):
+            base = field_index * FIELD_GAP
+            tokens = tokenize(doc.get(field) or "")
+            length += weight * len(tokens)
+            for pos, token in enumerate(tokens):
+                weighted[token] = weighted.get(token, 0.0) + weight
+                positions.setdefault(token, []).append(base + pos)
+
+        for token, tf in weighted.items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = {}
+                bisect.insort(self.vocab, token)
+            postings[doc_id] = (tf, tuple(positions[token]))
+
+        self.doc_terms[doc_id] = set(weighted)
+        self.doc_len[doc_id] = length
+        self.total_len += length
+
+    def remove(self, doc_id: Hashable) -> None:
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._invalidate()
+        self.total_len -= self.doc_len.pop(doc_id)
+        for token in terms:
+            postings = self.postings[token]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.postings[token]
+                index = bisect.bisect_left(self.vocab, token)
+                if index < len(self.vocab) and self.vocab[index] == token:
+                    del self.vocab[index]
+
+    def _invalidate(self) -> None:
+        # Always clear _ranked: it also holds the empty rankings of terms that had no scores to cache
+        self._scores = {}
+        self._prefix_scores = {}
+        self._ranked = {}
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self.vocab, prefix)
+        terms = []
+        for term in self.vocab[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _term_scores(self, term: str) -> Dict[Hashable, float]:
+        cached = self._scores.get(term)
+        if cached is not None:
+            return cached
+        postings = self.postings.get(term)
+        if not postings:
+            return {}
+        n = len(self.doc_len)
+        avgdl = (self.total_len / n if n else 1.0) or 1.0
+        idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+        k1, b = self.k1, self.b
+        doc_len = self.doc_len
+        scores = self._scores[term] = {
+            doc_id: idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_len[doc_id] / avgdl))
+            for doc_id, (tf, _) in postings.items()
+        }
+        return scores
+
+    def _clause_scores(self, clause: Clause) -> Dict[Hashable, float]:
+        if len(clause.tokens) == 1:
+            token = clause.tokens[0]
+            if not clause.prefix:
+                return self._term_scores(token)
+            scores = self._prefix_scores.get(token)
+            if scores is None:
+                scores = self._prefix_scores[token] = {}
+                for term in self.expand_prefix(token):
+                    for doc_id, score in self._term_scores(term).items():
+                        # Exact matches rank above completions of the prefix
+                        scores[doc_id] = scores.get(doc_id, 0.0) + (score if term == token else score * 0.5)
+            return scores
+        return self._phrase_scores(clause.tokens)
+
+    def _phrase_scores(self, tokens: List[str]) -> Dict[Hashable, float]:
+        postings = [self.postings.get(token) for token in tokens]
+        if not all(postings):
+            return {}
+        rarest = min(postings, key=len)
+        candidates = [doc_id for doc_id in rarest if all(doc_id in p for p in postings)]
+        matched = []
+        for doc_id in candidates:
+            first = postings[0][doc_id][1]
+            rest = [set(p[doc_id][1]) for p in postings[1:]]
+            if any(all(start + i + 1 in positions for i, positions in enumerate(rest)) for start in first):
+                matched.append(doc_id)
+        if not matched:
+            return {}
+        token_scores = [self._term_scores(token) for token in tokens]
+        return {doc_id: sum(s[doc_id] for s in token_scores) for doc_id in matched}
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[int, List[Hashable]]:
+        """Return (total matches, doc IDs of the requested page by descending score)."""
+        groups = parse_query(query)
+        if not groups:
+            return 0, []
+
+        # Single word (the common type-ahead case): page straight out of a cached ranking
+        if len(groups) == 1 and len(groups[0]) == 1 and len(groups[0][0].tokens) == 1:
+            clause = groups[0][0]
+            cache_key = (clause.tokens[0], clause.prefix)
+            ranked = self._ranked.get(cache_key)
+            if ranked is None:
+                scores = self._clause_scores(clause)
+                ranked = self._ranked[cache_key] = sorted(scores, key=scores.__getitem__, reverse=True)
+            return len(ranked), ranked[offset:offset + limit]
+
+        # Evaluate each OR group, then intersect starting from the smallest
+        group_scores: List[Dict[Hashable, float]] = []
+        for group in groups:
+            if len(group) == 1:
+                # Read-only from here on, so the (possibly cached) dict is used as is
+                scores = self._clause_scores(group[0])
+            else:
+                scores = {}
+                for clause in group:
+                    for doc_id, score in self._clause_scores(clause).items():
+                        scores[doc_id] = scores.get(doc_id, 0.0) + score
+            if not scores:
+                return 0, []
+            group_scores.append(scores)
+        group_scores.sort(key=len)
+
+        combined = group_scores[0]
+        for scores in group_scores[1:]:
+            combined = {doc_id: score + scores[doc_id] for doc_id, score in combined.items() if doc_id in scores}
+            if not combined:
+                return 0, []
+
+        top = heapq.nlargest(offset + limit, combined.items(), key=lambda item: item[1])
+        return len(combined), [doc_id for doc_id, _ in top[offset:]]
@@ -0,0 +1,242 @@
+import asyncio
+import heapq
+import json
+import os
+import random
+import time
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+from utils.fanout import DEFAULT_TIMEOUT, FanOut, Job, fanout
+from utils.fetch_newsapi import fetch_bing_news, fetch_newsapi
+from utils.fetch_rss import fetch_rss_feed
+from utils.persistence import SnapshotDB, snapshot_db
+
+SOURCES_PATH = os.getenv("SOURCES_PATH", str(Path(__file__).resolve().parent.parent / "sources.json"))
+# Sources never polled before are started this many seconds apart, within STARTUP_SPREAD at most
+STARTUP_STAGGER = 0.5
+STARTUP_SPREAD = 30.0
+MAX_BACKOFF = 3600.0
+
+class SourceConfig(NamedTuple):
+    """One article source from sources.json."""
+    name: str
+    kind: str
+    url: str
+    interval: float
+    priority: int
+    concurrency_class: str
+    hedge: bool
+    timeout: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind}:{self.name}"
+
+# Source kind -> function building the fetch call for a configured source
+FETCHERS: Dict[str, Callable[[SourceConfig], Callable[[], Awaitable[List[Dict[str, Any]]]]]] = {
+    "rss": lambda config: partial(fetch_rss_feed, config.url, config.name),
+    "newsapi": lambda config: fetch_newsapi,
+    "bing": lambda config: fetch_bing_news,
+}
+
+def load_sources(path: str = SOURCES_PATH) -> Tuple[List[SourceConfig], Dict[str, int], int]:
+    """Read (sources, concurrency per class, overall concurrency) from a JSON registry.
+
+    Entries with an unknown kind, a missing URL or a duplicate name are skipped with a message.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except Exception as e:
+        print(f"Error loading sources from {path}: {e}")
+        return [], {}, 1
+
+    defaults = raw.get("defaults", {})
+    classes = {name: int(spec.get("concurrency", 1)) for name, spec in raw.get("classes", {}).items()}
+    sources: List[SourceConfig] = []
+    seen = set()
+    for entry in raw.get("sources", []):
+        entry = {**defaults, **entry}
+        name, kind = entry.get("name"), entry.get("kind")
+        if entry.get("enabled", True) is False:
+            continue
+        if not name or name in seen or kind not in FETCHERS or (kind == "rss" and not entry.get("url")):
+            print(f"Skipping invalid source entry: {entry}")
+            continue
+        seen.add(name)
+        concurrency_class = entry.get("class", "default")
+        classes.setdefault(concurrency_class, 1)
+        sources.append(SourceConfig(
+            name=name,
+            kind=kind,
+            url=entry.get("url", ""),
+            interval=float(entry.get("interval", 300)),
+            priority=int(entry.get("priority", 0)),
+            concurrency_class=concurrency_class,
+            hedge=bool(entry.get("hedge", True)),
+            timeout=float(entry.get("timeout", DEFAULT_TIMEOUT)),
+        ))
+    return sources, classes, int(raw.get("max_concurrency", sum(classes.values()) or 1))
+
+class SourceState:
+    """Schedule and last results of one configured source."""
+
+    def __init__(self, config: SourceConfig):
+        self.config = config
+        self.next_due = 0.0
+        self.running = False
+        self.failures = 0
+        self.errors = 0
+        self.last_fetch: Optional[float] = None
+        self.last_success: Optional[float] = None
+        self.last_items = 0
+        self.last_latency: Optional[float] = None
+
+    def reschedule(self, now: float) -> None:
+        interval = self.config.interval
+        if self.failures:
+            interval = min(interval * (2 ** self.failures), MAX_BACKOFF)
+        self.next_due = now + interval * random.uniform(0.9, 1.1)
+
+class SourceScheduler:
+    """Polls every configured source on its own interval with bounded concurrency.
+
+    Polls run through the fan-out executor (adaptive timeouts, hedging, breakers) while
+    holding a slot of the source's concurrency class and of the overall limit. Sources
+    that fall due together start in priority order; results go to on_result as they land.
+    """
+
+    def __init__(self, sources: List[SourceConfig], classes: Dict[str, int], max_concurrency: int,
+                 on_result: Callable[[SourceConfig, List[Dict[str, Any]]], None],
+                 db: SnapshotDB = snapshot_db, executor: FanOut = fanout):
+        self.states: Dict[str, SourceState] = {s.name: SourceState(s) for s in sources}
+        self.class_limits = classes
+        self.max_concurrency = max_concurrency
+        self.on_result = on_result
+        self.db = db
+        self.executor = executor
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._class_slots: Dict[str, asyncio.Semaphore] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        # (next_due, -priority, name) of every source that isn't being polled
+        self._due: List[Tuple[float, int, str]] = []
+
+    def load_state(self) -> None:
+        """Resume each source's schedule from its last success, spreading never-polled ones."""
+        now = time.time()
+        fresh = []
+        for state in self.states.values():
+            saved = self.db.load_meta(f"feed_{state.config.name}", {})
+            state.last_success = saved.get("last_success")
+            if state.last_success is not None:
+                state.next_due = state.last_success + state.config.interval
+            else:
+                fresh.append(state)
+        fresh.sort(key=lambda s: -s.config.priority)
+        spread = min(STARTUP_SPREAD, STARTUP_STAGGER * len(fresh),
+                     min((s.config.interval for s in fresh), default=STARTUP_SPREAD))
+        for i, state in enumerate(fresh):
+            state.next_due = now + spread * i / len(fresh)
+        self._due = [(s.next_due, -s.config.priority, s.config.name) for s in self.states.values()]
+        heapq.heapify(self._due)
+
+    async def run(self) -> None:
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._class_slots = {name: asyncio.Semaphore(limit) for name, limit in self.class_limits.items()}
+        self._wakeup = asyncio.Event()
+        tasks = set()
+        try:
+            while True:
+                # Only due sources are looked at, so a wake-up costs the same with many sources
+                now = time.time()
+                due = []
+                while self._due and self._due[0][0] <= now:
+                    due.append(self.states[heapq.heappop(self._due)[2]])
+                # Semaphores are first come first served, so higher priorities are started first
+                for state in sorted(due, key=lambda s: -s.config.priority):
+                    state.running = True
+                    task = asyncio.create_task(self._poll(state), name=f"poll-{state.config.name}")
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                delay = max(0.0, self._due[0][0] - time.time()) if self._due else None
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _poll(self, state: SourceState) -> None:
+        config = state.config
+        try:
+            # The class slot is taken first so a saturated class doesn't hold overall slots
+            async with self._class_slots[config.concurrency_class], self._slots:
+                started = time.monotonic()
+                state.last_fetch = time.time()
+                job = Job(config.key, FETCHERS[config.kind](config), hedge=config.hedge, max_timeout=config.timeout)
+                items = await self.executor.call(job)
+                state.last_latency = time.monotonic() - started
+            if items is None:
+                state.failures += 1
+                state.errors += 1
+                return
+            state.failures = 0
+            state.last_success = time.time()
+            state.last_items = len(items)
+            self.db.save_meta(f"feed_{config.name}", {"last_success": state.last_success})
+            if items:
+                self.on_result(config, items)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            state.failures += 1
+            state.errors += 1
+            print(f"Error polling source {config.name}: {e}")
+        finally:
+            state.running = False
+            state.reschedule(time.time())
+            heapq.heappush(self._due, (state.next_due, -config.priority, config.name))
+            # The loop only needs waking if this poll is now the next one due
+            if self._wakeup is not None and self._due[0][2] == config.name:
+                self._wakeup.set()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-source schedule, last poll and upstream health."""
+        def iso(ts: Optional[float]) -> Optional[str]:
+            return datetime.fromtimestamp(ts).isoformat() if ts else None
+        result = []
+        for state in self.states.values():
+            config = state.config
+            upstream = self.executor.upstreams.get(config.key)
+            result.append({
+                "name": config.name,
+                "kind": config.kind,
+                "url": config.url or None,
+                "interval": config.interval,
+                "priority": config.priority,
+                "class": config.concurrency_class,
+                "running": state.running,
+                "last_fetch": iso(state.last_fetch),
+                "last_success": iso(state.last_success),
+                "next_poll": iso(state.next_due),
+                "last_latency_ms": round(state.last_latency * 1000, 1) if state.last_latency is not None else None,
+                "last_items": state.last_items,
+                "errors": state.errors,
+                "consecutive_failures": state.failures,
+                "upstream": upstream.stats() if upstream is not None else None,
+            })
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "configured": len(self.states),
+            "running": sum(s.running for s in self.states.values()),
+            "failing": sum(bool(s.failures) for s in self.states.values()),
+            "max_concurrency": self.max_concurrency,
+            "classes": self.class_limits,
+        }